@@ -18,6 +18,8 @@ from coala_quickstart.generation.Project import (
     valid_path,
     )
 from coala_quickstart.generation.FileGlobs import get_project_files
+from coala_quickstart.generation.ProjectIndex import scan_project
+from coala_quickstart.generation.Utilities import LanguageClassifier
 from coala_quickstart.Strings import PROJECT_DIR_HELP
 from coala_quickstart.generation.Bears import (
     filter_relevant_bears,
@@ -82,6 +84,28 @@ coala-quickstart automatically creates a .coafile for use by coala.
         help='Maximum number of values to optional settings allowed to be'
              ' checked by green_mode for each bear.')
 
+    arg_parser.add_argument(
+        '-j', '--jobs', type=int,
+        help='Number of processes used by green_mode to test the bears.'
+             ' Defaults to one less than the number of CPUs.')
+
+    arg_parser.add_argument(
+        '--min-coverage', type=float, default=0,
+        help='Minimum fraction of the files of a language, between 0 and 1,'
+             ' for which setting values have to be green to be considered'
+             ' by green_mode. Values are dropped as soon as they fail on too'
+             ' many files.')
+
+    arg_parser.add_argument(
+        '--max-file-memory', type=int,
+        help='Maximum size in MB of the file contents green_mode keeps in'
+             ' memory in each process. Files are read again when needed.')
+
+    arg_parser.add_argument(
+        '--seed', type=int,
+        help='Seed to break ties between bears with conflicting capabilities'
+             ' randomly with. Ties are broken by bear name if not given.')
+
     return arg_parser
 
 
@@ -110,6 +134,15 @@ def main():
                         'only with --green-mode. The arguments will '
                         'be ignored.')
 
+    if not 0 <= args.min_coverage <= 1:
+        arg_parser.error('--min-coverage has to be between 0 and 1.')
+
+    if not args.green_mode and (args.jobs or args.min_coverage or
+                                args.max_file_memory):
+        logging.warning(' --jobs, --min-coverage and --max-file-memory can '
+                        'be used only with --green-mode. The arguments will '
+                        'be ignored.')
+
     if not args.non_interactive and not args.green_mode:
         fpc = FilePathCompleter()
         fpc.activate()
@@ -121,18 +154,24 @@ def main():
             typecast=valid_path)
         fpc.deactivate()
 
+    project_index = scan_project(project_dir)
+
     project_files, ignore_globs = get_project_files(
         None,
         printer,
         project_dir,
         fpc,
-        args.non_interactive)
+        args.non_interactive,
+        project_index)
 
-    used_languages = list(get_used_languages(project_files))
+    # The languages of the project files are looked up by several steps.
+    classifier = LanguageClassifier()
+    used_languages = list(get_used_languages(project_files, classifier))
     used_languages = ask_to_select_languages(used_languages, printer,
                                              args.non_interactive)
 
-    extracted_information = collect_info(project_dir)
+    extracted_information = collect_info(
+        project_dir, project_index=project_index)
 
     relevant_bears = filter_relevant_bears(
         used_languages, printer, arg_parser, extracted_information)
@@ -145,6 +184,12 @@ def main():
             MAX_VALUES_GREEN_MODE,
             project_files,
             printer,
+            project_index,
+            args.jobs,
+            args.min_coverage,
+            args.max_file_memory * 1024 * 1024
+            if args.max_file_memory else None,
+            classifier,
         )
         exit()
 
@@ -161,6 +206,7 @@ def main():
         ignore_globs,
         relevant_bears,
         extracted_information,
-        args.incomplete_sections)
+        args.incomplete_sections,
+        classifier=classifier)
 
     write_coafile(printer, project_dir, settings)
@@ -0,0 +1,356 @@
+import os
+from collections import namedtuple, OrderedDict
+
+import pkg_resources
+
+from coalib.bearlib.abstractions.LinterClass import LinterClass
+from coalib.bears.Bear import Bear
+from coalib.bears.BEAR_KIND import BEAR_KIND
+from coalib.collecting.Collectors import collect_bears
+from coalib.misc.CachingUtilities import pickle_dump, pickle_load
+from coalib.parsing.Globbing import glob_escape, iglob
+from coalib.settings.ConfigurationGathering import load_configuration
+
+BEAR_KINDS = [BEAR_KIND.LOCAL, BEAR_KIND.GLOBAL]
+
+# The identifier of the file in the user data directory of coala, which
+# the metadata of the installed bears is cached in.
+BEAR_METADATA_CACHE = 'coala_quickstart_bear_metadata'
+
+BearMetadata = namedtuple('BearMetadata', [
+    'name',
+    'file',
+    'kind',
+    'languages',
+    'can_detect',
+    'can_fix',
+    'requirements',
+    'non_optional_settings',
+    'optional_settings',
+    'deps',
+    'executable',
+    'default_prerequisite_check',
+])
+
+RequirementMetadata = namedtuple('RequirementMetadata',
+                                 ['type', 'package', 'version'])
+
+
+def get_linter_executable(bear):
+    """
+    :param bear:
+        A bear class or ``LazyBear``.
+    :return:
+        The executable the bear wraps if it is a linter bear, else None.
+    """
+    if isinstance(bear, LazyBear):
+        return bear.metadata.executable
+    if issubclass(bear, LinterClass):
+        return bear.get_executable()
+    return None
+
+
+def uses_default_prerequisite_check(bear):
+    """
+    :param bear:
+        A bear class or ``LazyBear``.
+    :return:
+        True if the bear doesn't override ``Bear.check_prerequisites()``,
+        i.e. its prerequisites are its requirements only.
+    """
+    if isinstance(bear, LazyBear):
+        return bear.metadata.default_prerequisite_check
+    return (getattr(bear.check_prerequisites, '__func__', None) is
+            Bear.check_prerequisites.__func__)
+
+
+def _get_non_optional_settings_metadata(bear):
+    settings = bear.get_non_optional_settings()
+    # Only the built-in types are kept, other annotations could need the
+    # bear module to be imported when the metadata is unpickled.
+    if not all(annotation is None or
+               getattr(annotation, '__module__', None) == 'builtins'
+               for _, annotation in settings.values()):
+        return None
+    return tuple((name, description, annotation)
+                 for name, (description, annotation) in settings.items())
+
+
+def get_bear_metadata(bear):
+    """
+    Reads the metadata quickstart needs to select a bear from its class.
+
+    :param bear:
+        The bear class.
+    :return:
+        The ``BearMetadata`` of the bear. The requirements are
+        ``RequirementMetadata`` tuples. The non-optional settings are tuples
+        of the name, description and type of each setting, or None if a
+        type isn't a built-in one. The optional settings and the
+        dependencies are names.
+    """
+    return BearMetadata(
+        name=bear.name,
+        file=bear.source_location,
+        kind=bear.kind(),
+        languages=tuple(bear.LANGUAGES),
+        can_detect=frozenset(bear.CAN_DETECT),
+        can_fix=frozenset(bear.CAN_FIX),
+        requirements=tuple(
+            RequirementMetadata(req.type, req.package, req.version)
+            for req in bear.REQUIREMENTS),
+        non_optional_settings=_get_non_optional_settings_metadata(bear),
+        optional_settings=tuple(bear.get_metadata().optional_params),
+        deps=tuple(dep.name for dep in bear.BEAR_DEPS),
+        executable=get_linter_executable(bear),
+        default_prerequisite_check=uses_default_prerequisite_check(bear))
+
+
+def get_bear_dir_globs(log_printer=None, arg_parser=None):
+    """
+    Finds the bear directories coala collects bears from, without
+    importing any bear.
+
+    :param log_printer:
+        The log_printer to handle logging.
+    :param arg_parser:
+        An ``ArgParser`` object.
+    :return:
+        The list of globs of the bear directories of all the sections.
+    """
+    sections, _ = load_configuration(arg_list=None,
+                                     log_printer=log_printer,
+                                     arg_parser=arg_parser,
+                                     silent=True)
+    bear_dir_globs = []
+    for section in sections.values():
+        for bear_dir_glob in section.bear_dirs():
+            if bear_dir_glob not in bear_dir_globs:
+                bear_dir_globs.append(bear_dir_glob)
+    return bear_dir_globs
+
+
+def get_bear_cache_key(bear_dir_globs):
+    """
+    Generates the key the bear metadata cache is valid for, from the
+    versions of coala and of the installed bear packages, and the
+    modification times of the bear files.
+
+    :param bear_dir_globs:
+        The globs of the bear directories.
+    :return:
+        A hashable key.
+    """
+    versions = []
+    for dist_name in ['coala', 'coala-bears']:
+        try:
+            versions.append(
+                (dist_name, pkg_resources.get_distribution(dist_name).version))
+        except pkg_resources.DistributionNotFound:
+            versions.append((dist_name, None))
+
+    bear_files = set()
+    for bear_dir_glob in bear_dir_globs:
+        bear_files.update(iglob(bear_dir_glob + '.py'))
+    mtimes = []
+    for bear_file in sorted(bear_files):
+        try:
+            mtimes.append((bear_file, os.stat(bear_file).st_mtime_ns))
+        except OSError:
+            continue
+
+    return tuple(versions), tuple(bear_dir_globs), tuple(mtimes)
+
+
+def import_bears(bears_metadata):
+    """
+    Imports the classes of the bears, only importing the files which
+    define them.
+
+    :param bears_metadata:
+        An iterable of ``BearMetadata``.
+    :return:
+        A dict with the bear names as keys and the bear classes as values.
+    """
+    names_by_file = {}
+    for metadata in bears_metadata:
+        names_by_file.setdefault(metadata.file, set()).add(metadata.name)
+
+    bears = {}
+    for bear_file, names in names_by_file.items():
+        bear_dir, bear_module = os.path.split(bear_file)
+        for kind_bears in collect_bears([glob_escape(bear_dir)],
+                                        [os.path.splitext(bear_module)[0]],
+                                        BEAR_KINDS,
+                                        warn_if_unused_glob=False):
+            bears.update((bear.name, bear) for bear in kind_bears
+                         if bear.name in names)
+    return bears
+
+
+def collect_bears_metadata(log_printer=None, arg_parser=None,
+                           use_cache=True):
+    """
+    Collects the metadata of all the bears. The bears are only imported
+    if the cached metadata is missing or out of date, in which case the
+    cache is rewritten.
+
+    :param log_printer:
+        The log_printer to handle logging.
+    :param arg_parser:
+        An ``ArgParser`` object.
+    :param use_cache:
+        Whether to read and write the cache.
+    :return:
+        A list of ``BearMetadata`` of all the bears, and a dict with the
+        names of the bears imported along the way as keys and their
+        classes as values.
+    """
+    bear_dir_globs = get_bear_dir_globs(log_printer, arg_parser)
+    cache_key = get_bear_cache_key(bear_dir_globs) if use_cache else None
+
+    if use_cache:
+        try:
+            cached = pickle_load(log_printer, BEAR_METADATA_CACHE)
+        except (AttributeError, ImportError, TypeError):
+            # The cache was written by an incompatible version.
+            cached = None
+        if cached is not None and cached.get('key') == cache_key:
+            return cached['bears'], {}
+
+    bears = {}
+    for kind_bears in collect_bears(bear_dir_globs, ['**'], BEAR_KINDS,
+                                    warn_if_unused_glob=False):
+        for bear in kind_bears:
+            bears.setdefault(bear.name, bear)
+    bears_metadata = [get_bear_metadata(bear) for bear in bears.values()]
+
+    if use_cache:
+        pickle_dump(log_printer, BEAR_METADATA_CACHE,
+                    {'key': cache_key, 'bears': bears_metadata})
+    return bears_metadata, bears
+
+
+class LazyBear:
+    """
+    Stands in for a bear class, answering from the ``BearMetadata`` of the
+    bear what quickstart needs to select bears. The bear class is imported
+    the first time anything else is needed from it.
+    """
+
+    def __init__(self, metadata, lazy_bears, bear=None):
+        """
+        :param metadata:
+            The ``BearMetadata`` of the bear.
+        :param lazy_bears:
+            A dict with the names of the bears as keys and their
+            ``LazyBear`` as values, to look up the dependencies in.
+        :param bear:
+            The bear class, if it is imported already.
+        """
+        self.metadata = metadata
+        self._lazy_bears = lazy_bears
+        self._bear = bear
+        # Like a bear class, but without replacing the name of this class.
+        self.__name__ = metadata.name
+
+    @property
+    def name(self):
+        return self.metadata.name
+
+    @property
+    def LANGUAGES(self):
+        return set(self.metadata.languages)
+
+    @property
+    def CAN_DETECT(self):
+        return set(self.metadata.can_detect)
+
+    @property
+    def CAN_FIX(self):
+        return set(self.metadata.can_fix)
+
+    @property
+    def REQUIREMENTS(self):
+        return set(self.metadata.requirements)
+
+    @property
+    def BEAR_DEPS(self):
+        if all(dep in self._lazy_bears for dep in self.metadata.deps):
+            return {self._lazy_bears[dep] for dep in self.metadata.deps}
+        return self.load().BEAR_DEPS
+
+    def get_non_optional_settings(self):
+        if self.metadata.non_optional_settings is None:
+            return self.load().get_non_optional_settings()
+        return OrderedDict(
+            (name, (description, annotation))
+            for name, description, annotation
+            in self.metadata.non_optional_settings)
+
+    def load(self):
+        """
+        Imports the bear class.
+
+        :return:
+            The bear class.
+        """
+        if self._bear is None:
+            self._bear = import_bears([self.metadata])[self.name]
+        return self._bear
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        return '<LazyBear {}>'.format(self.name)
+
+
+def get_lazy_bears(bears_metadata, bears=None):
+    """
+    :param bears_metadata:
+        A list of ``BearMetadata``.
+    :param bears:
+        A dict with the names of the bears which are imported already as
+        keys and their classes as values.
+    :return:
+        A dict with the bear names as keys and ``LazyBear`` objects as
+        values.
+    """
+    bears = {} if bears is None else bears
+    lazy_bears = {}
+    for metadata in bears_metadata:
+        lazy_bears[metadata.name] = LazyBear(
+            metadata, lazy_bears, bears.get(metadata.name))
+    return lazy_bears
+
+
+def load_bears(bears_by_lang):
+    """
+    Replaces the ``LazyBear`` objects by their bear classes, importing all
+    of them at once.
+
+    :param bears_by_lang:
+        A dict with language name as key and bears as value.
+    :return:
+        A dict with language name as key and a set of bear classes as
+        value. Bears which fail to import are left out.
+    """
+    to_import = {bear.metadata for lang_bears in bears_by_lang.values()
+                 for bear in lang_bears
+                 if isinstance(bear, LazyBear) and bear._bear is None}
+    imported = import_bears(to_import)
+
+    result = {}
+    for lang, lang_bears in bears_by_lang.items():
+        result[lang] = set()
+        for bear in lang_bears:
+            if isinstance(bear, LazyBear):
+                if bear._bear is None:
+                    bear._bear = imported.get(bear.name)
+                bear = bear._bear
+            if bear is not None:
+                result[lang].add(bear)
+    return result
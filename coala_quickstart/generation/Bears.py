@@ -7,11 +7,41 @@ from collections import defaultdict
 from coala_quickstart.Constants import (
     IMPORTANT_BEAR_LIST, ALL_CAPABILITIES, DEFAULT_CAPABILTIES)
 from coala_quickstart.Strings import BEAR_HELP
+from coala_quickstart.generation.BearMetadata import (
+    collect_bears_metadata, get_lazy_bears, get_linter_executable, load_bears)
+from coala_quickstart.generation.Requirements import check_bears_prerequisites
 from coala_quickstart.generation.SettingsFilling import is_autofill_possible
 from coala_quickstart.generation.Utilities import concatenate
-from coalib.bearlib.abstractions.LinterClass import LinterClass
-from coalib.settings.ConfigurationGathering import get_filtered_bears
-from coalib.misc.DictUtilities import inverse_dicts
+
+
+def get_bears_by_language(languages, log_printer=None, arg_parser=None):
+    """
+    Collects the bears once and partitions them by the languages they
+    support. Like ``get_filtered_bears()`` every language also gets the
+    bears supporting all languages.
+
+    :param languages:
+        A list of language names.
+    :param log_printer:
+        The log_printer to handle logging.
+    :param arg_parser:
+        An ``ArgParser`` object.
+    :return:
+        A dict with language name as key and a set of ``LazyBear`` objects
+        as value, which import their bear class only when needed.
+    """
+    bears_metadata, bears = collect_bears_metadata(log_printer, arg_parser)
+    lazy_bears = get_lazy_bears(bears_metadata, bears)
+    bear_languages = [
+        (bear, {language.lower() for language in bear.metadata.languages})
+        for bear in lazy_bears.values()]
+
+    bears_by_lang = {}
+    for lang in languages:
+        names = {lang.lower(), 'all'}
+        bears_by_lang[lang] = {bear for bear, lowered in bear_languages
+                               if lowered & names}
+    return bears_by_lang
 
 
 def filter_relevant_bears(used_languages,
@@ -34,18 +64,15 @@ def filter_relevant_bears(used_languages,
     :param extracted_info:
         list of information extracted from ``InfoExtractor`` classes.
     :return:
-        A dict with language name as key and bear classes as value.
+        A dict with language name as key and bear classes as value. Only
+        the classes of these bears are imported if the bear metadata is
+        cached.
     """
     args = arg_parser.parse_args() if arg_parser else None
     used_languages.append(('All', 100))
 
-    bears_by_lang = {
-        lang: set(inverse_dicts(*get_filtered_bears([lang],
-                                                    log_printer,
-                                                    arg_parser,
-                                                    silent=True)).keys())
-        for lang, _ in used_languages
-    }
+    bears_by_lang = get_bears_by_language(
+        [lang for lang, _ in used_languages], log_printer, arg_parser)
 
     # Each language would also have the language independent bears. We remove
     # those and put them in the "All" category.
@@ -92,7 +119,7 @@ def filter_relevant_bears(used_languages,
              bear not in selected_bears[lang]])
 
     if args.green_mode:
-        return selected_bears
+        return load_bears(selected_bears)
 
     if not args.no_filter_by_capabilities:
         # Ask user for capablities
@@ -170,7 +197,7 @@ def filter_relevant_bears(used_languages,
 
         # Remove overlapping capabilty bears
         filtered_bears = remove_bears_with_conflicting_capabilties(
-            filtered_bears)
+            filtered_bears, args.seed)
 
         # Add to the selected_bears
         for lang, lang_bears in filtered_bears.items():
@@ -179,7 +206,7 @@ def filter_relevant_bears(used_languages,
             else:
                 selected_bears[lang].update(lang_bears)
 
-    return selected_bears
+    return load_bears(selected_bears)
 
 
 def get_non_optional_settings(bears):
@@ -343,8 +370,8 @@ def get_matching_linter_bears(bears, lint_tasks_info):
     matched_bears = set()
     for task in lint_tasks_info:
         for bear in bears:
-            if (issubclass(bear, LinterClass) and
-                    bear.get_executable() == task.value):
+            executable = get_linter_executable(bear)
+            if executable is not None and executable == task.value:
                 matched_bears.add(bear)
                 break
             for req in bear.REQUIREMENTS:
@@ -396,6 +423,66 @@ def get_bears_capabilties(bears_by_lang):
     return result
 
 
+class CapabilityIndex:
+    """
+    Index of the capabilities of a set of bears. The bears which can detect
+    or fix a capability are stored as a bitset, with bit ``i`` standing for
+    the ``i``-th bear in the order of the bear names.
+    """
+
+    def __init__(self, bears, capabilities=None):
+        """
+        :param bears:        A collection of bears.
+        :param capabilities: The capabilities to index, all capabilities of
+                             the bears if None.
+        """
+        self.bears = sorted(bears, key=lambda bear: bear.name)
+        self.detect = {}
+        self.fix = {}
+        for position, bear in enumerate(self.bears):
+            bit = 1 << position
+            for cap in bear.CAN_DETECT:
+                if capabilities is None or cap in capabilities:
+                    self.detect[cap] = self.detect.get(cap, 0) | bit
+            for cap in bear.CAN_FIX:
+                if capabilities is None or cap in capabilities:
+                    self.fix[cap] = self.fix.get(cap, 0) | bit
+
+    def get_bears(self, bitset):
+        """
+        :param bitset: A bitset of bears of the index.
+        :return:       The list of bears in the bitset, ordered by name.
+        """
+        return [bear for position, bear in enumerate(self.bears)
+                if bitset >> position & 1]
+
+    def resolve(self, is_installed, rng=None):
+        """
+        Selects the bears for the first capability of the index in sorted
+        order, among the bears which can fix it, or detect it if none can
+        fix it. These are the first bear whose requirements are installed,
+        if any, and one more bear, which is chosen with ``rng`` or else is
+        the first bear by name.
+
+        :param is_installed: A function telling whether the requirements of
+                             a bear are installed.
+        :param rng:          A ``random.Random`` object to choose the
+                             additional bear with.
+        :return:             The set of selected bears.
+        """
+        caps = set(self.detect) | set(self.fix)
+        if not caps:
+            return set()
+        cap = min(caps)
+        candidates = self.get_bears(self.fix.get(cap) or self.detect[cap])
+        selected = {rng.choice(candidates) if rng else candidates[0]}
+        installed = next(
+            (bear for bear in candidates if is_installed(bear)), None)
+        if installed is not None:
+            selected.add(installed)
+        return selected
+
+
 def generate_capabilties_map(bears_by_lang):
     """
     Generates a dictionary of capabilities, languages and the
@@ -418,20 +505,19 @@ def generate_capabilties_map(bears_by_lang):
 
     # collectiong the capabilities meta-data
     for lang, bears in bears_by_lang.items():
-        can_detect_meta = inverse_dicts(
-            *[{bear: list(bear.CAN_DETECT)} for bear in bears])
-        can_fix_meta = inverse_dicts(
-            *[{bear: list(bear.CAN_FIX)} for bear in bears])
+        index = CapabilityIndex(bears)
 
-        for capability, bears in can_detect_meta.items():
-            capabilities_meta[capability][lang]['DETECT'] = bears
+        for capability, bitset in index.detect.items():
+            capabilities_meta[capability][lang]['DETECT'] = index.get_bears(
+                bitset)
 
-        for capability, bears in can_fix_meta.items():
-            capabilities_meta[capability][lang]['FIX'] = bears
+        for capability, bitset in index.fix.items():
+            capabilities_meta[capability][lang]['FIX'] = index.get_bears(
+                bitset)
     return capabilities_meta
 
 
-def remove_bears_with_conflicting_capabilties(bears_by_lang):
+def remove_bears_with_conflicting_capabilties(bears_by_lang, seed=None):
     """
     Eliminate bears having no unique capabilities among the other
     bears present in the list.
@@ -441,36 +527,25 @@ def remove_bears_with_conflicting_capabilties(bears_by_lang):
 
     :param bears_by_lang: dict with language names as keys
                           and the list of bears as values.
+    :param seed:          Seed to break ties between the bears randomly
+                          with, they are broken by bear name if None.
     """
-    result = {}
-    for lang, bears in bears_by_lang.items():
-        lang_result = set()
-        capabilities_map = generate_capabilties_map({lang: bears})
-        for cap in capabilities_map.keys():
-            # bears that can fix the ``cap`` capabilitiy
-            fix_bears = capabilities_map[cap][lang].get('FIX')
-            if fix_bears:
-                for bear in fix_bears:
-                    if bear.check_prerequisites() is True:
-                        # The dependecies for bear are already installed,
-                        # so select it.
-                        lang_result.add(bear)
-                        break
-                # None of the bear has it's dependency installed, select
-                # a random bear.
-                lang_result.add(random.choice(fix_bears))
-                break
-            # There were no bears to fix the capability
-            detect_bears = capabilities_map[cap][lang].get('DETECT')
-            if detect_bears:
-                for bear in detect_bears:
-                    if bear.check_prerequisites() is True:
-                        lang_result.add(bear)
-                        break
-                lang_result.add(random.choice(detect_bears))
-                break
-        result[lang] = lang_result
+    installed = check_bears_prerequisites(
+        bear for bears in bears_by_lang.values() for bear in bears)
 
+    def is_installed(bear):
+        if bear not in installed:
+            installed[bear] = bear.check_prerequisites() is True
+        return installed[bear]
+
+    rng = random.Random(seed) if seed is not None else None
+    result = {}
+    for lang, bears in sorted(bears_by_lang.items()):
+        # Only the first capability is resolved, so only it is indexed.
+        caps = set().union(*(bear.CAN_DETECT | bear.CAN_FIX
+                             for bear in bears))
+        index = CapabilityIndex(bears, {min(caps)} if caps else ())
+        result[lang] = index.resolve(is_installed, rng)
     return result
 
 
@@ -1,17 +1,18 @@
 import os
 
-from coalib.parsing.Globbing import glob_escape
-from coala_quickstart.generation.Utilities import get_gitignore_glob
+from coalib.parsing.Globbing import fnmatch, glob_escape
+from coala_quickstart.generation.ProjectIndex import scan_project
+from coala_quickstart.generation.Gitignore import GitignoreMatcher
 from coala_utils.Question import ask_question
 from coala_quickstart.Strings import GLOB_HELP
-from coalib.collecting.Collectors import collect_files
 
 
 def get_project_files(log_printer,
                       printer,
                       project_dir,
                       file_path_completer,
-                      non_interactive=False):
+                      non_interactive=False,
+                      project_index=None):
     """
     Gets the list of files matching files in the user's project directory
     after prompting for glob expressions.
@@ -24,22 +25,28 @@ def get_project_files(log_printer,
         A ``file_path_completer`` object.
     :param non_interactive
         Whether coala-quickstart is in non-interactive mode
+    :param project_index:
+        The ``ProjectIndex`` of the project directory. The project
+        directory is scanned if it is not given.
     :return:
         A list of file paths matching the files.
     """
     file_globs = ['**']
 
+    if project_index is None:
+        project_index = scan_project(project_dir)
+
     ignore_globs = None
-    gitignore_dir_list = []
-    for dir_name, subdir_name, file_list in os.walk(project_dir):
-        if os.path.isfile(os.path.join(dir_name, '.gitignore')):
-            gitignore_dir_list += [dir_name]
+    has_gitignore = any('.gitignore' in directory.files
+                        for directory in project_index.dirs.values())
 
-    if gitignore_dir_list:
+    if has_gitignore:
         printer.print('The contents of your .gitignore file for the project '
                       'will be automatically loaded as the files to ignore.',
                       color='green')
-        ignore_globs = get_gitignore_glob(project_dir, gitignore_dir_list)
+        file_paths, ignore_globs = get_gitignore_project_files(project_index)
+        printer.print()
+        return file_paths, ignore_globs
 
     if non_interactive and not ignore_globs:
         ignore_globs = []
@@ -56,7 +63,7 @@ def get_project_files(log_printer,
     printer.print()
 
     ignore_globs = list(ignore_globs)
-    escaped_project_dir = glob_escape(project_dir)
+    escaped_project_dir = glob_escape(project_index.project_dir)
     file_path_globs = [os.path.join(
         escaped_project_dir, glob_exp) for glob_exp in file_globs]
     ignore_path_globs = [os.path.join(
@@ -64,9 +71,31 @@ def get_project_files(log_printer,
 
     ignore_path_globs.append(os.path.join(escaped_project_dir, '.git/**'))
 
-    file_paths = collect_files(
-        file_path_globs,
-        log_printer,
-        ignored_file_paths=ignore_path_globs)
+    file_paths = [file_path for file_path in project_index.files
+                  if fnmatch(file_path, file_path_globs) and
+                  not fnmatch(file_path, ignore_path_globs)]
 
     return file_paths, ignore_globs
+
+
+def get_gitignore_project_files(project_index):
+    """
+    Gets the files of the project which aren't ignored by its
+    ``.gitignore`` files.
+
+    :param project_index:
+        The ``ProjectIndex`` of the project directory.
+    :return:
+        A list of file paths which aren't ignored, in the order of the
+        index, and a list of glob expressions covering the ignored ones.
+    """
+    matcher = GitignoreMatcher(project_index)
+    kept_files = set()
+    for dirpath, dirnames, filenames in matcher.walk():
+        if dirpath == project_index.project_dir and '.git' in dirnames:
+            dirnames.remove('.git')
+        kept_files.update(os.path.join(dirpath, name) for name in filenames)
+
+    file_paths = [file_path for file_path in project_index.files
+                  if file_path in kept_files]
+    return file_paths, matcher.get_ignore_globs()
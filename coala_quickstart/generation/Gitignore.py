@@ -0,0 +1,429 @@
+import os
+import re
+from collections import Counter, OrderedDict, namedtuple
+
+from coalib.parsing.Globbing import glob_escape
+
+
+GitignoreRule = namedtuple('GitignoreRule',
+                           ['pattern', 'negated', 'dir_only', 'anchored'])
+
+
+def translate_gitignore_pattern(pattern):
+    """
+    Translates a gitignore pattern into a regular expression matching the
+    paths relative to the directory of the ``.gitignore`` file, with ``/``
+    as separator.
+
+    :param pattern:
+        The pattern, without negation, leading and trailing slashes.
+    :return:
+        The regular expression as a string.
+    """
+    i, n = 0, len(pattern)
+    res = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i) and (i == 0 or
+                                                pattern[i - 1] == '/'):
+                if i + 2 == n:
+                    # A trailing '/**' matches everything inside.
+                    res.append('.*')
+                    i += 2
+                    continue
+                if pattern[i + 2] == '/':
+                    # '**/' matches zero or more directories.
+                    res.append('(?:.*/)?')
+                    i += 3
+                    continue
+            while i + 1 < n and pattern[i + 1] == '*':
+                i += 1
+            res.append('[^/]*')
+        elif c == '?':
+            res.append('[^/]')
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            res.append(re.escape(pattern[i]))
+        elif c == '[':
+            j = i + 1
+            if j < n and pattern[j] in '!^':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 1
+            if j >= n:
+                res.append('\\[')
+            else:
+                stuff = pattern[i + 1:j].replace('\\', '\\\\')
+                if stuff[0] in '!^':
+                    stuff = '^/' + stuff[1:]
+                res.append('[' + stuff + ']')
+                i = j
+        else:
+            res.append(re.escape(c))
+        i += 1
+    return ''.join(res)
+
+
+def translate_gitignore_rule(rule):
+    """
+    Translates a gitignore rule into a coala glob matching the paths
+    relative to the directory of the ``.gitignore`` file which the rule
+    ignores, including the files inside directories it ignores.
+
+    :param rule:
+        The ``GitignoreRule``.
+    :return:
+        The glob expression, with ``os.sep`` as separator.
+    """
+    pattern = rule.pattern
+    i, n = 0, len(pattern)
+    res = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            j = i
+            while j < n and pattern[j] == '*':
+                j += 1
+            if (j - i >= 2 and (i == 0 or pattern[i - 1] == '/') and
+                    (j == n or pattern[j] == '/')):
+                if j == n:
+                    res.append('**')
+                else:
+                    # coala's '**/' doesn't match zero directories.
+                    res.append('(|**/)')
+                    j += 1
+            else:
+                res.append('*')
+            i = j
+            continue
+        if c == '\\' and i + 1 < n:
+            i += 1
+            res.append(glob_escape(pattern[i]))
+        elif c == '[' and pattern.find(']', i + 2) != -1:
+            j = pattern.index(']', i + 2)
+            res.append(pattern[i:j + 1])
+            i = j
+        elif c in '()|[]':
+            res.append(glob_escape(c))
+        else:
+            res.append(c)
+        i += 1
+
+    glob = ''.join(res)
+    if not rule.anchored:
+        glob = '(|**/)' + glob
+    glob += '/**' if rule.dir_only else '(|/**)'
+    return glob.replace('/', os.sep)
+
+
+def compile_gitignore_rule(rule):
+    """
+    Compiles a regular expression matching the same paths as the glob
+    returned by ``translate_gitignore_rule()``, to match many paths with
+    it quickly.
+
+    :param rule:
+        The ``GitignoreRule``.
+    :return:
+        The compiled regular expression, matching paths relative to the
+        directory of the ``.gitignore`` file with ``/`` as separator, and
+        with a trailing ``/`` for directories.
+    """
+    regex = translate_gitignore_pattern(rule.pattern)
+    if not rule.anchored:
+        regex = '(?:.*/)?' + regex
+    regex += '/.*' if rule.dir_only else '(?:/.*)?'
+    return re.compile(regex + r'\Z', re.DOTALL)
+
+
+def parse_gitignore_pattern(line):
+    """
+    Parses a line of a ``.gitignore`` file.
+
+    :param line:
+        A line from a ``.gitignore`` file.
+    :return:
+        The ``GitignoreRule`` of the line, or None if the line is blank or
+        a comment.
+    """
+    line = line.rstrip('\r\n')
+    if not line.strip() or line.startswith('#'):
+        return None
+
+    # Strips spaces from the end if they are not escaped
+    cur = len(line)
+    while (cur > 0 and line[cur - 1] == ' ' and
+           (cur < 2 or line[cur - 2] != '\\')):
+        cur -= 1
+    line = line[:cur]
+
+    negated = line.startswith('!')
+    if negated or line.startswith(('\\!', '\\#')):
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    # Patterns with a slash at the beginning or in the middle are relative
+    # to the directory of the ``.gitignore`` file, others match a name at
+    # any depth below it.
+    anchored = '/' in line
+    return GitignoreRule(line.lstrip('/'), negated, dir_only, anchored)
+
+
+class Gitignore:
+    """
+    The rules of a ``.gitignore`` file, compiled so that a path is matched
+    against all of them at once.
+    """
+
+    def __init__(self, base_dir, lines):
+        """
+        :param base_dir:
+            The directory of the ``.gitignore`` file.
+        :param lines:
+            The lines of the ``.gitignore`` file.
+        """
+        self.base_dir = base_dir
+        self.rules = [rule for rule in map(parse_gitignore_pattern, lines)
+                      if rule is not None]
+
+        # The last rule matching a path decides whether it is ignored. The
+        # rules are grouped into runs of consecutive rules which are either
+        # all negated or all not, the last run first. Each run is matched
+        # with one regex for files and one for directories, with the last
+        # rule first in each, so that the group which matched names it.
+        self._runs = []
+        for index, rule in enumerate(self.rules):
+            regex = translate_gitignore_pattern(rule.pattern)
+            if not rule.anchored:
+                regex = '(?:.*/)?' + regex
+            regex = '(?P<r{}>{})'.format(index, regex)
+            if not self._runs or self._runs[0][0] != rule.negated:
+                self._runs.insert(0, (rule.negated, [], []))
+            _, file_regexes, dir_regexes = self._runs[0]
+            if not rule.dir_only:
+                file_regexes.insert(0, regex)
+            dir_regexes.insert(0, regex)
+        self._runs = [(self._compile(file_regexes), self._compile(dir_regexes))
+                      for _, file_regexes, dir_regexes in self._runs]
+
+    @staticmethod
+    def _compile(regexes):
+        if not regexes:
+            return None
+        return re.compile('(?:' + '|'.join(regexes) + r')\Z', re.DOTALL)
+
+    @classmethod
+    def from_file(cls, base_dir, filename='.gitignore'):
+        """
+        Reads a ``.gitignore`` file.
+
+        :param base_dir:
+            The directory containing the file.
+        :param filename:
+            The name of the file.
+        :return:
+            The ``Gitignore`` of the file.
+        """
+        with open(os.path.join(base_dir, filename)) as file:
+            return cls(base_dir, file.readlines())
+
+    def match(self, path, is_dir=False):
+        """
+        Finds the rule deciding whether a path is ignored.
+
+        :param path:
+            The path relative to the directory of the ``.gitignore`` file,
+            with ``/`` as separator.
+        :param is_dir:
+            Whether the path is a directory.
+        :return:
+            The index of the last rule matching the path, or None if no
+            rule matches it.
+        """
+        for file_regex, dir_regex in self._runs:
+            regex = dir_regex if is_dir else file_regex
+            match = regex.match(path) if regex is not None else None
+            if match is not None:
+                return int(match.lastgroup[1:])
+        return None
+
+    def get_glob(self, rule):
+        """
+        :param rule:
+            A ``GitignoreRule`` of the file.
+        :return:
+            The absolute coala glob covering the files the rule ignores and
+            the files inside the directories it ignores, whether or not such
+            paths exist yet.
+        """
+        return os.path.join(glob_escape(self.base_dir),
+                            translate_gitignore_rule(rule))
+
+
+class GitignoreMatcher:
+    """
+    Applies the ``.gitignore`` files of a project to its ``ProjectIndex``,
+    with the rules of each file scoped to its directory and the rules of
+    deeper files taking precedence.
+    """
+
+    def __init__(self, project_index, filename='.gitignore'):
+        """
+        :param project_index:
+            The ``ProjectIndex`` of the project.
+        :param filename:
+            The name of the gitignore files.
+        """
+        self.project_index = project_index
+        self.filename = filename
+        # The ``Gitignore`` objects of the files found so far by ``walk()``.
+        self.gitignores = []
+        # The paths of the files and directories ``walk()`` left out, with
+        # a trailing separator for directories, and of the files it kept.
+        self.ignored_paths = []
+        self.kept_files = []
+
+    def is_ignored(self, scope, path, is_dir=False):
+        """
+        :param scope:
+            The ``Gitignore`` objects applying to the path, outermost first.
+        :param path:
+            The absolute path.
+        :param is_dir:
+            Whether the path is a directory.
+        :return:
+            True if the path is ignored by the rules. The parent
+            directories are not checked.
+        """
+        for gitignore in reversed(scope):
+            relative_path = path[len(gitignore.base_dir) + 1:]
+            if os.sep != '/':
+                relative_path = relative_path.replace(os.sep, '/')
+            index = gitignore.match(relative_path, is_dir)
+            if index is not None:
+                return not gitignore.rules[index].negated
+        return False
+
+    def walk(self):
+        """
+        Walks the project like ``ProjectIndex.walk()``, leaving out ignored
+        files, and not descending into ignored directories.
+
+        :return:
+            An iterator yielding tuples of the directory path, the list of
+            names of the subdirectories which aren't ignored and the list of
+            names of the files which aren't ignored inside it.
+        """
+        scopes = {}
+        for dirpath, dirnames, filenames in self.project_index.walk():
+            scope = scopes.get(os.path.dirname(dirpath), ())
+            if dirpath == self.project_index.project_dir:
+                scope = ()
+            if self.filename in filenames:
+                gitignore = Gitignore.from_file(dirpath, self.filename)
+                self.gitignores.append(gitignore)
+                scope += (gitignore,)
+            scopes[dirpath] = scope
+
+            ignored_dirs = [
+                name for name in dirnames if self.is_ignored(
+                    scope, os.path.join(dirpath, name), True)]
+            dirnames[:] = [name for name in dirnames
+                           if name not in ignored_dirs]
+            self.ignored_paths += [os.path.join(dirpath, name, '')
+                                   for name in ignored_dirs]
+            kept_files = []
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if self.is_ignored(scope, path):
+                    self.ignored_paths.append(path)
+                else:
+                    kept_files.append(name)
+                    self.kept_files.append(path)
+            yield dirpath, dirnames, kept_files
+
+    def get_ignore_globs(self):
+        """
+        Generates a minimal list of ignore globs for the coafile, from the
+        rules of the ``.gitignore`` files and the paths left out during
+        ``walk()``.
+
+        Each rule which isn't negated gets one glob. Globs matching none of
+        the left out paths are dropped, and so are globs whose left out
+        paths other globs match as well. If the glob of a rule matches a
+        file which is kept, because a negated rule re-included it, the
+        glob is only used inside the subdirectories without such files,
+        and for the paths elsewhere each gets a glob of its own.
+
+        :return:
+            A list of absolute glob expressions.
+        """
+        # The left out paths matched by each glob, in the order of the
+        # rules.
+        candidates = OrderedDict()
+        for gitignore in self.gitignores:
+            prefix = os.path.join(gitignore.base_dir, '')
+            ignored = [(path, path[len(prefix):].replace(os.sep, '/'))
+                       for path in sorted(self.ignored_paths)
+                       if path.startswith(prefix)]
+            kept = [path[len(prefix):].replace(os.sep, '/')
+                    for path in self.kept_files if path.startswith(prefix)]
+            for rule in gitignore.rules:
+                if not rule.negated:
+                    for glob, path in self._get_rule_globs(
+                            gitignore, rule, ignored, kept):
+                        candidates.setdefault(glob, set()).add(path)
+
+        # The number of selected globs matching each left out path. The
+        # globs matching the fewest paths are the first to be dropped if
+        # the others match all their paths.
+        counts = Counter(path for matched in candidates.values()
+                         for path in matched)
+        for glob in sorted(candidates, key=lambda glob: len(candidates[glob])):
+            if all(counts[path] > 1 for path in candidates[glob]):
+                counts.subtract(candidates.pop(glob))
+        return list(candidates)
+
+    @staticmethod
+    def _get_rule_globs(gitignore, rule, ignored, kept):
+        # Yields the globs of a rule together with the left out paths they
+        # match, given as tuples of the absolute and the relative path, with
+        # the kept files given by their relative paths.
+        regex = compile_gitignore_rule(rule)
+        matched = [(path, relative_path) for path, relative_path in ignored
+                   if regex.match(relative_path)]
+        # The directories containing kept files which the rule matches.
+        conflicts = set()
+        for relative_path in kept:
+            if regex.match(relative_path):
+                parts = relative_path.split('/')
+                conflicts.update('/'.join(parts[:i])
+                                 for i in range(len(parts)))
+
+        glob = translate_gitignore_rule(rule)
+        for path, relative_path in matched:
+            if '' not in conflicts:
+                yield gitignore.get_glob(rule), path
+                continue
+            # Rules which aren't anchored match the same paths inside any
+            # subdirectory, so their glob is used in the topmost
+            # subdirectory without conflicts.
+            parts = relative_path.rstrip('/').split('/')
+            subdirs = ['/'.join(parts[:i]) for i in range(1, len(parts))]
+            subdir = next((subdir for subdir in subdirs
+                           if subdir not in conflicts), None)
+            if not rule.anchored and subdir is not None:
+                yield os.path.join(
+                    glob_escape(os.path.join(gitignore.base_dir,
+                                             subdir.replace('/', os.sep))),
+                    glob), path
+            elif path.endswith(os.sep):
+                yield glob_escape(path) + '**', path
+            else:
+                yield glob_escape(path), path
@@ -1,3 +1,8 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 from coala_quickstart.info_extractors.EditorconfigInfoExtractor import (
     EditorconfigInfoExtractor)
 from coala_quickstart.info_extractors.PackageJSONInfoExtractor import (
@@ -7,26 +12,85 @@ from coala_quickstart.info_extractors.GemfileInfoExtractor import (
 from coala_quickstart.info_extractors.GruntfileInfoExtractor import (
     GruntfileInfoExtractor)
 
+# The ``InfoExtractor`` classes run by ``collect_info()``, with the globs of
+# the files they extract information from, in the order their information
+# is aggregated.
+INFO_EXTRACTORS = []
+
+EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+def register_info_extractor(extractor_class, target_globs):
+    """
+    Registers an ``InfoExtractor`` class to be run by ``collect_info()``.
 
-def collect_info(project_dir):
+    :param extractor_class: The ``InfoExtractor`` subclass.
+    :param target_globs:    list of file globs to extract information from.
+    """
+    INFO_EXTRACTORS.append((extractor_class, list(target_globs)))
+
+
+register_info_extractor(EditorconfigInfoExtractor, ['.editorconfig'])
+register_info_extractor(PackageJSONInfoExtractor, ['package.json'])
+register_info_extractor(GemfileInfoExtractor, ['Gemfile'])
+register_info_extractor(GruntfileInfoExtractor, ['Gruntfile.js'])
+
+
+def run_info_extractor(extractor_class, target_globs, project_dir,
+                       project_index=None):
+    """
+    Runs an ``InfoExtractor`` on the project.
+
+    :return: The extracted information and the time it took in seconds.
+    """
+    start = time.perf_counter()
+    information = extractor_class(
+        target_globs, project_dir, project_index).extract_information()
+    return information, time.perf_counter() - start
+
+
+def collect_info(project_dir, executor='thread', timings=None,
+                 project_index=None):
     """
     Collects information extracted by various ``InfoExtractor``
     classes and returns them as a dictionary.
+
+    The registered extractors are run concurrently.
+
+    :param project_dir:   Absolute path to the project directory.
+    :param executor:      ``'thread'`` to run the extractors in a thread
+                          pool, ``'process'`` to run them in a process pool.
+    :param timings:       A dict which gets the names of the extractors as
+                          keys and the time they took in seconds as values,
+                          if given.
+    :param project_index: The ``ProjectIndex`` of the project, to look up
+                          the target files of the extractors in.
     """
-    editorconfig_info = EditorconfigInfoExtractor(
-        ['.editorconfig'], project_dir).extract_information()
+    if executor not in EXECUTORS:
+        raise ValueError('Unknown executor {}, choose one of {}'.format(
+            executor, ', '.join(sorted(EXECUTORS))))
 
-    package_json_info = PackageJSONInfoExtractor(
-        ['package.json'], project_dir).extract_information()
+    if not INFO_EXTRACTORS:
+        return {}
 
-    gemfile_info = GemfileInfoExtractor(
-        ['Gemfile'], project_dir).extract_information()
+    max_workers = min(len(INFO_EXTRACTORS), os.cpu_count() or 1)
+    with EXECUTORS[executor](max_workers=max_workers) as pool:
+        futures = [pool.submit(run_info_extractor, extractor_class,
+                               target_globs, project_dir, project_index)
+                   for extractor_class, target_globs in INFO_EXTRACTORS]
+        results = [future.result() for future in futures]
 
-    gruntfile_info = GruntfileInfoExtractor(
-        ['Gruntfile.js'], project_dir).extract_information()
+    for (extractor_class, _), (_, elapsed) in zip(INFO_EXTRACTORS, results):
+        logging.debug('{} took {:.3f}s'.format(
+            extractor_class.__name__, elapsed))
+        if timings is not None:
+            timings[extractor_class.__name__] = elapsed
 
-    extracted_info = aggregate_info([
-        editorconfig_info, package_json_info, gemfile_info, gruntfile_info])
+    extracted_info = aggregate_info(
+        [information for information, _ in results])
 
     return extracted_info
 
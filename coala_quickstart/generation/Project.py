@@ -4,11 +4,12 @@ from collections import defaultdict
 import re
 
 from coala_utils.string_processing.StringConverter import StringConverter
-from coala_utils.Extensions import exts
-from coala_quickstart.generation.Utilities import get_language_from_hashbang
+from coala_quickstart.generation.Utilities import (
+    LanguageClassifier,
+    get_language_names,
+    )
 from coala_quickstart.Constants import (
     ASK_TO_SELECT_LANG,
-    HASHBANG_REGEX,
     )
 
 
@@ -36,52 +37,49 @@ def valid_path(path: StringConverter):
     return path
 
 
-def language_percentage(file_paths):
+def language_percentage(file_paths, classifier=None):
     """
     Computes the percentage composition of each language, with unknown
     extensions tagged with the ``Unknown`` key.
 
     :param file_paths: A list of file paths.
+    :param classifier: The ``LanguageClassifier`` of the run, a new one is
+                       used if not given.
     :return:           A dict with file name as key and the percentage
                        of occurences as the value.
     """
     if file_paths:
         delta = 100 / len(file_paths)
+    if classifier is None:
+        classifier = LanguageClassifier()
 
     results = defaultdict(lambda: 0)
     for file_path in file_paths:
-        ext = os.path.splitext(file_path)[1]
-
-        if ext in exts:
-            for lang in exts[ext]:
-                results[lang] += delta
-
-        elif os.path.exists(file_path):
-            with open(file_path, 'r') as data:
-                hashbang = data.readline()
-                if re.match(HASHBANG_REGEX, hashbang):
-                    language = get_language_from_hashbang(hashbang).lower()
-                    for ext in exts:
-                        for lang in exts[ext]:
-                            if language == lang.lower():
-                                results[lang.lower()] += delta
+        info = classifier.classify(file_path)
+        for lang in info.languages:
+            results[lang] += delta
+        if info.hashbang_language is not None:
+            results[get_language_names()[info.hashbang_language]] += delta
 
     return results
 
 
-def get_used_languages(file_paths):
+def get_used_languages(file_paths, classifier=None):
     """
     Identifies the most used languages in the user's project directory
     from the files matched from the given glob expression.
 
     :param file_paths:
         A list of absolute file paths in the user's project directory.
+    :param classifier:
+        The ``LanguageClassifier`` of the run, a new one is used if not
+        given.
     :return:
         A tuple iterator containing a language name as the first value
         and percentage usage in the project as the second value.
     """
     return sorted(
-        language_percentage(file_paths).items(),
+        language_percentage(file_paths, classifier).items(),
         key=operator.itemgetter(1),
         reverse=True)
 
@@ -0,0 +1,156 @@
+import os
+from collections import namedtuple, OrderedDict
+
+from coala_quickstart.green_mode.project_data import PROJECT_DATA
+
+
+FileEntry = namedtuple('FileEntry', ['path', 'size', 'mtime', 'inode', 'ext'])
+
+
+class DirectoryEntry:
+    """
+    A directory of the project, with the names of the files and the
+    subdirectories present directly inside it.
+    """
+
+    __slots__ = ('path', 'files', 'dirs')
+
+    def __init__(self, path):
+        self.path = path
+        self.files = []
+        self.dirs = []
+
+
+class ProjectIndex:
+    """
+    In-memory index of the files and directories of a project, built by
+    walking the project directory exactly once. Every stage of quickstart
+    reads the project tree from here instead of touching the filesystem.
+    """
+
+    def __init__(self, project_dir):
+        """
+        :param project_dir:
+            The project directory which is indexed.
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        # Both are kept in the order the walk encountered the entries, i.e.
+        # every directory comes before its contents.
+        self.files = OrderedDict()
+        self.dirs = OrderedDict()
+
+    def add_directory(self, path):
+        """
+        Adds a directory to the index and registers it with its parent.
+
+        :param path:
+            The absolute path of the directory.
+        :return:
+            The ``DirectoryEntry`` of the directory.
+        """
+        entry = DirectoryEntry(path)
+        self.dirs[path] = entry
+        parent, name = os.path.split(path)
+        if path != self.project_dir and parent in self.dirs:
+            self.dirs[parent].dirs.append(name)
+        return entry
+
+    def add_file(self, path, size=0, mtime=0, inode=0):
+        """
+        Adds a file to the index and registers it with its directory.
+
+        :param path:
+            The absolute path of the file.
+        :param size:
+            The size of the file in bytes.
+        :param mtime:
+            The modification time of the file in nanoseconds.
+        :param inode:
+            The inode number of the file.
+        :return:
+            The ``FileEntry`` of the file.
+        """
+        parent, name = os.path.split(path)
+        entry = FileEntry(path, size, mtime, inode, os.path.splitext(name)[1])
+        self.files[path] = entry
+        if parent in self.dirs:
+            self.dirs[parent].files.append(name)
+        return entry
+
+    def walk(self, top=None):
+        """
+        Walks the indexed directory tree top-down, similar to ``os.walk``.
+        Removing names from the yielded list of directories prunes them
+        from the walk.
+
+        :param top:
+            The directory to start from, defaults to the project directory.
+        :return:
+            An iterator yielding tuples of the directory path, the list of
+            subdirectory names and the list of file names inside it.
+        """
+        stack = [os.path.abspath(top) if top else self.project_dir]
+        while stack:
+            path = stack.pop()
+            entry = self.dirs.get(path)
+            if entry is None:
+                continue
+            dirnames = list(entry.dirs)
+            yield path, dirnames, list(entry.files)
+            stack.extend(os.path.join(path, name)
+                         for name in reversed(dirnames))
+
+
+def scan_project(project_dir, skip_dirs=('.git',),
+                 skip_files=(PROJECT_DATA,)):
+    """
+    Builds the ``ProjectIndex`` of a project with a single ``os.scandir``
+    based walk of the project directory. Symbolic links to directories are
+    not followed.
+
+    :param project_dir:
+        The project directory to scan.
+    :param skip_dirs:
+        Names of directories which are left out of the index together
+        with their contents.
+    :param skip_files:
+        Names of files directly inside the project directory which are
+        left out of the index, like the files quickstart writes there.
+    :return:
+        The ``ProjectIndex`` of the project.
+    """
+    index = ProjectIndex(project_dir)
+    index.add_directory(index.project_dir)
+    stack = [index.project_dir]
+
+    while stack:
+        path = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                entries = list(entries)
+        except OSError:
+            if path == index.project_dir:
+                raise
+            # The directory vanished or can't be read, leave it empty.
+            continue
+
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dirs:
+                        index.add_directory(entry.path)
+                        subdirs.append(entry.path)
+                elif path == index.project_dir and (
+                        entry.name in skip_files):
+                    continue
+                elif entry.is_file():
+                    stat = entry.stat()
+                    index.add_file(entry.path, stat.st_size,
+                                   stat.st_mtime_ns, stat.st_ino)
+            except OSError:
+                # The entry vanished or can't be read, leave it out.
+                continue
+        stack.extend(reversed(subdirs))
+
+    return index
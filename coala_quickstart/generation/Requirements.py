@@ -0,0 +1,314 @@
+import json
+import operator
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pkg_resources
+
+from coala_quickstart.generation.BearMetadata import (
+    uses_default_prerequisite_check)
+from coalib.misc.CachingUtilities import pickle_dump, pickle_load
+
+# The identifier of the file in the user data directory of coala, which
+# the installed packages are cached in.
+INSTALLED_PACKAGES_CACHE = 'coala_quickstart_installed_packages'
+
+# The number of seconds the installed packages of a package manager are
+# cached for. It is kept short, so that packages installed in between are
+# soon found.
+INSTALLED_PACKAGES_TTL = 600
+
+# The installed packages listed during this run, with the same keys and
+# values as the cache file: the keys returned by ``_get_cache_key()`` and
+# tuples of the time of the listing and the packages.
+_installed_packages = {}
+
+# The comparison operators a version of a requirement can start with,
+# besides the ``^`` and ``~`` ranges of npm.
+VERSION_COMPARISONS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+    '==': operator.eq,
+    '=': operator.eq,
+}
+
+_VERSION_PIN_REGEX = re.compile(
+    r'\s*(>=|<=|==|>|<|=|\^|~)?\s*v?(\d+(?:\.\d+)*)\s*')
+
+
+def normalize_package_name(name):
+    """
+    :param name:
+        The name of a package.
+    :return:
+        The name with the case and the spellings that package managers
+        treat as equal unified.
+    """
+    return name.split('[', 1)[0].strip().lower().replace('_', '-')
+
+
+def parse_version(version):
+    """
+    :param version:
+        A version string, like ``1.2.3`` or ``2.0.0-alpha``.
+    :return:
+        The tuple of the numbers of the release the version belongs to, or
+        None if it doesn't start with a number.
+    """
+    match = re.match(r'\s*v?(\d+(?:\.\d+)*)', version)
+    if match is None:
+        return None
+    return tuple(int(part) for part in match.group(1).split('.'))
+
+
+def parse_version_pin(version):
+    """
+    :param version:
+        The version of a requirement, like ``1.2``, ``>=1.7.3`` or ``^2``.
+    :return:
+        A tuple of the operator, which is None if there is none, and the
+        release tuple of the pinned version, or None if the version can't
+        be parsed. An empty version is parsed to None as well.
+    """
+    match = _VERSION_PIN_REGEX.fullmatch(version)
+    if match is None:
+        return None
+    operator_, release = match.groups()
+    return operator_, parse_version(release)
+
+
+def _pad(release, length):
+    return release + (0,) * (length - len(release))
+
+
+def version_matches(requirement_type, version, pin):
+    """
+    Checks an installed version against the version of a requirement, the
+    way the package manager installing the requirement reads it.
+
+    :param requirement_type:
+        The type of the requirement. A plain version of an npm requirement
+        is a range like ``2`` for ``2.x.x``, while pip and gem install
+        exactly the version given.
+    :param version:
+        The installed version.
+    :param pin:
+        The tuple of the operator and the release of the requirement, as
+        returned by ``parse_version_pin()``.
+    :return:
+        True if the installed version satisfies the requirement.
+    """
+    installed = parse_version(version)
+    if installed is None:
+        return False
+    operator_, pinned = pin
+    length = max(len(installed), len(pinned))
+    padded_installed = _pad(installed, length)
+    padded_pinned = _pad(pinned, length)
+
+    if operator_ == '^':
+        return (installed[0] == pinned[0] and
+                padded_installed >= padded_pinned)
+    if operator_ == '~':
+        prefix = min(len(pinned), 2)
+        return (installed[:prefix] == pinned[:prefix] and
+                padded_installed >= padded_pinned)
+    if operator_ is not None:
+        return VERSION_COMPARISONS[operator_](padded_installed,
+                                              padded_pinned)
+    if requirement_type == 'npm':
+        return installed[:len(pinned)] == pinned
+    return padded_installed == padded_pinned
+
+
+def _run(command):
+    try:
+        return subprocess.run(command,
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL,
+                              universal_newlines=True).stdout
+    except OSError:
+        # The package manager isn't installed.
+        return ''
+
+
+def list_pip_packages():
+    """
+    :return:
+        A dict with the names of the Python distributions installed for the
+        running interpreter as keys and the sets of their versions as
+        values, read from their metadata in one scan.
+    """
+    packages = {}
+    for dist in pkg_resources.WorkingSet():
+        packages.setdefault(normalize_package_name(dist.project_name),
+                            set()).add(dist.version)
+    return packages
+
+
+def list_npm_packages():
+    """
+    :return:
+        A dict with the names of the npm packages installed locally or
+        globally as keys and the sets of their versions as values, read
+        from one ``npm ls`` call each.
+    """
+    packages = {}
+    for command in (['npm', 'ls', '--json'], ['npm', 'ls', '-g', '--json']):
+        try:
+            tree = json.loads(_run(command))
+        except ValueError:
+            continue
+        nodes = [tree]
+        while nodes:
+            node = nodes.pop()
+            for name, dependency in node.get('dependencies', {}).items():
+                versions = packages.setdefault(normalize_package_name(name),
+                                               set())
+                if dependency.get('version'):
+                    versions.add(dependency['version'])
+                nodes.append(dependency)
+    return packages
+
+
+def list_gem_packages():
+    """
+    :return:
+        A dict with the names of the installed gems as keys and the sets of
+        their versions as values, read from one ``gem list`` call.
+    """
+    packages = {}
+    for line in _run(['gem', 'list']).splitlines():
+        match = re.match(r'([^\s(]+)\s*(?:\((.*)\))?', line)
+        if match is None or line.startswith('*'):
+            continue
+        name, versions = match.groups()
+        packages.setdefault(normalize_package_name(name), set()).update(
+            version.replace('default:', '').strip()
+            for version in (versions or '').split(',') if version.strip())
+    return packages
+
+
+# The functions listing the installed packages, by requirement type.
+PACKAGE_LISTERS = {
+    'pip': list_pip_packages,
+    'npm': list_npm_packages,
+    'gem': list_gem_packages,
+}
+
+
+def _get_cache_key(requirement_type):
+    # Local npm packages depend on the directory, pip packages on the
+    # interpreter.
+    if requirement_type == 'npm':
+        return requirement_type, os.getcwd()
+    if requirement_type == 'pip':
+        return requirement_type, sys.executable
+    return requirement_type, None
+
+
+def get_installed_packages(requirement_types, use_cache=True,
+                           ttl=INSTALLED_PACKAGES_TTL):
+    """
+    Lists the installed packages of the package managers, querying each
+    package manager once and all of them concurrently. The results are
+    cached for the run and, if enabled, on disk.
+
+    :param requirement_types:
+        The types of requirements to list the packages of, which have to
+        be keys of ``PACKAGE_LISTERS``.
+    :param use_cache:
+        Whether to read and write the cache on disk.
+    :param ttl:
+        The number of seconds cached results are used for.
+    :return:
+        A dict with the requirement types as keys and dicts with the
+        normalized names of the installed packages as keys and the sets of
+        their versions as values.
+    """
+    now = time.time()
+    cache = {}
+    if use_cache:
+        try:
+            cache = pickle_load(None, INSTALLED_PACKAGES_CACHE, {})
+        except (AttributeError, ImportError, TypeError):
+            # The cache was written by an incompatible version.
+            cache = {}
+
+    installed = {}
+    missing = []
+    for requirement_type in set(requirement_types):
+        key = _get_cache_key(requirement_type)
+        for source in (_installed_packages, cache):
+            timestamp, packages = source.get(key, (None, None))
+            if timestamp is not None and 0 <= now - timestamp < ttl:
+                installed[requirement_type] = packages
+                break
+        else:
+            missing.append(requirement_type)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+            listed = pool.map(lambda requirement_type:
+                              PACKAGE_LISTERS[requirement_type](), missing)
+            for requirement_type, packages in zip(missing, listed):
+                key = _get_cache_key(requirement_type)
+                _installed_packages[key] = cache[key] = (now, packages)
+                installed[requirement_type] = packages
+        if use_cache:
+            pickle_dump(None, INSTALLED_PACKAGES_CACHE, cache)
+
+    return installed
+
+
+def _is_batchable(bear):
+    return uses_default_prerequisite_check(bear) and all(
+        requirement.type in PACKAGE_LISTERS and (
+            not requirement.version or
+            parse_version_pin(requirement.version) is not None)
+        for requirement in bear.REQUIREMENTS)
+
+
+def check_bears_prerequisites(bears):
+    """
+    Checks whether the requirements of the bears are installed, with one
+    query per package manager for all of them.
+
+    Only the bears which keep the default ``check_prerequisites()`` of
+    ``Bear``, and only have requirements of the types of
+    ``PACKAGE_LISTERS`` with versions ``parse_version_pin()`` understands,
+    are checked.
+
+    :param bears:
+        A collection of bear classes or ``LazyBear`` objects.
+    :return:
+        A dict with the checked bears as keys and True as value if their
+        requirements are installed in a matching version, else False. The
+        other bears are left out, their ``check_prerequisites()`` has to be
+        used instead.
+    """
+    bears = [bear for bear in set(bears) if _is_batchable(bear)]
+    installed = get_installed_packages(
+        {requirement.type for bear in bears
+         for requirement in bear.REQUIREMENTS})
+
+    def is_installed(requirement):
+        versions = installed[requirement.type].get(
+            normalize_package_name(requirement.package))
+        if versions is None:
+            return False
+        if not requirement.version:
+            return True
+        pin = parse_version_pin(requirement.version)
+        return any(version_matches(requirement.type, version, pin)
+                   for version in versions)
+
+    return {bear: all(is_installed(requirement)
+                      for requirement in bear.REQUIREMENTS)
+            for bear in bears}
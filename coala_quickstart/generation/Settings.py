@@ -6,7 +6,7 @@ from coalib.settings.SectionFilling import fill_settings
 from coala_quickstart.generation.SettingsFilling import (
     fill_section, acquire_settings)
 from coala_quickstart.generation.Utilities import (
-    split_by_language, get_extensions)
+    LanguageClassifier, split_by_language, get_extensions)
 from coalib.settings.Section import Section
 from coalib.output.ConfWriter import ConfWriter
 
@@ -63,7 +63,8 @@ def generate_settings(project_dir,
                       relevant_bears,
                       extracted_info,
                       incomplete_sections=False,
-                      log_printer=None):
+                      log_printer=None,
+                      classifier=None):
     """
     Generates the settings for the given project.
 
@@ -89,12 +90,17 @@ def generate_settings(project_dir,
         In CI mode, bears with non optional setting are not added in coafile.
         But if incomplete_sections is set to ``True`` in CI mode, then those
         bears are also added in the coafile.
+    :param classifier:
+        The ``LanguageClassifier`` of the run, a new one is used if not
+        given.
     :return:
         A dict with section name as key and a ``Section`` object as value.
     """
+    if classifier is None:
+        classifier = LanguageClassifier()
     lang_map = {lang.lower(): lang for lang in relevant_bears}
-    lang_files = split_by_language(project_files)
-    extset = get_extensions(project_files)
+    lang_files = split_by_language(project_files, classifier)
+    extset = get_extensions(project_files, classifier)
 
     settings = OrderedDict()
 
@@ -1,5 +1,14 @@
+import os
+from functools import lru_cache
+
+from coala_quickstart import __version__
 from coala_quickstart.generation.Utilities import (
     search_for_orig, get_all_args, get_default_args)
+from coalib.misc.CachingUtilities import pickle_dump, pickle_load
+
+# The identifier of the file in the user data directory of coala, which
+# the settings of the bears are cached in, next to the bear metadata.
+BEAR_SETTINGS_CACHE = 'coala_quickstart_bear_settings'
 
 
 def in_annot(func, key):
@@ -16,6 +25,7 @@ def in_annot(func, key):
     return func.__annotations__[key] if key in func.__annotations__ else False
 
 
+@lru_cache(maxsize=None)
 def in_annot_recursive(bear, key):
     """
     Checks if a setting name as key is present in function
@@ -78,13 +88,73 @@ def parse_dep_tree_optional(bear):
         Dict of optional settings of the current bear and recursively
         all the optional settings of its dependencies.
     """
+    return dict(_parse_dep_tree_optional(bear))
+
+
+@lru_cache(maxsize=None)
+def _parse_dep_tree_optional(bear):
+    # Memoized per bear, so shared dependencies are parsed once per run.
     deps = bear.BEAR_DEPS
     optional_settings = get_default_args(bear.run)
     for dep in deps:
-        optional_settings.update(parse_dep_tree_optional(dep))
+        optional_settings.update(_parse_dep_tree_optional(dep))
     return optional_settings
 
 
+@lru_cache(maxsize=None)
+def parse_dep_tree_non_optional_types(bear, key):
+    """
+    Parses the bear's dependency tree looking for the Types of a
+    non-optional setting.
+    :param bear:
+        The bear object.
+    :param key:
+        The setting value as a string.
+    :return:
+        Tuple of the Types the dependencies give the setting, in the
+        order they are found.
+    """
+    types = ()
+    for dep in bear.BEAR_DEPS:
+        present_in_annot = in_annot(dep.run, key)
+        if present_in_annot:
+            types += (present_in_annot,)
+        else:
+            settings = get_all_args(dep.run)
+            for pointer in get_default_args(dep.run):
+                del settings[pointer]
+            if key in settings:
+                types += (settings[key],)
+        types += parse_dep_tree_non_optional_types(dep, key)
+    return types
+
+
+def get_bear_files_key(bear):
+    """
+    :param bear:
+        The bear object.
+    :return:
+        The paths and modification times of the files of the bear and of
+        all its dependencies, which the settings of the bear are parsed
+        from.
+    """
+    files = set()
+    bears = [bear]
+    seen = set()
+    while bears:
+        bear = bears.pop()
+        if bear in seen:
+            continue
+        seen.add(bear)
+        bears.extend(bear.BEAR_DEPS)
+        try:
+            files.add((bear.source_location,
+                       os.stat(bear.source_location).st_mtime_ns))
+        except (OSError, TypeError):
+            files.add((bear.__name__, None))
+    return tuple(sorted(files, key=str))
+
+
 class SettingTypes:
 
     """
@@ -113,6 +183,20 @@ class SettingTypes:
         self.settings_others = []
         self.fillup_settings(functions, settings, bear, trigger)
 
+    @classmethod
+    def from_lists(cls, settings_bool, settings_others):
+        """
+        Creates the object from settings which were categorized before.
+        :param settings_bool:
+            List of the names of the settings of Type bool.
+        :param settings_others:
+            List of the names of the settings of other Types.
+        """
+        setting_types = cls.__new__(cls)
+        setting_types.settings_bool = list(settings_bool)
+        setting_types.settings_others = list(settings_others)
+        return setting_types
+
     def fillup_settings(self, functions, settings, bear, trigger):
         """
         Fill settings_bool and settings_others depending upon whether the
@@ -223,18 +307,8 @@ class SettingTypes:
         :param key:
             The setting value as a string.
         """
-        deps = bear.BEAR_DEPS
-        for dep in deps:
-            present_in_annot = in_annot(dep.run, key)
-            if present_in_annot:
-                self.diff_bool_others(key, present_in_annot)
-            else:
-                settings = get_all_args(dep.run)
-                for pointer in get_default_args(dep.run):
-                    del settings[pointer]
-                if key in settings:
-                    self.diff_bool_others(key, settings[key])
-            self.parse_dep_tree_non_optional(dep, key)
+        for check in parse_dep_tree_non_optional_types(bear, key):
+            self.diff_bool_others(key, check)
 
     def diff_bool_others(self, key, check):
         """
@@ -341,16 +415,84 @@ class BearSettings:
         self.optional_settings = SettingTypes(
             optional_settings, functions, bear, trigger='optional')
 
+    @classmethod
+    def from_setting_names(cls, bear, setting_names):
+        """
+        Creates the object from the settings of the bear which were
+        categorized before.
+        :param bear:
+            A bear class object.
+        :param setting_names:
+            The value of ``get_setting_names()`` for the bear.
+        """
+        bear_settings = cls.__new__(cls)
+        bear_settings.bear = bear
+        bear_settings.non_optional_settings = SettingTypes.from_lists(
+            *setting_names[:2])
+        bear_settings.optional_settings = SettingTypes.from_lists(
+            *setting_names[2:])
+        return bear_settings
+
+    def get_setting_names(self):
+        """
+        :return:
+            A tuple of the names of the non-optional settings of Type bool
+            and other Types, and the optional settings of Type bool and
+            other Types.
+        """
+        return (tuple(self.non_optional_settings.settings_bool),
+                tuple(self.non_optional_settings.settings_others),
+                tuple(self.optional_settings.settings_bool),
+                tuple(self.optional_settings.settings_others))
+
+
+@lru_cache(maxsize=None)
+def get_bear_settings(bear):
+    """
+    :param bear:
+        A bear class object.
+    :return:
+        The BearSettings object of the bear, memoized for the run.
+    """
+    return BearSettings(bear)
+
 
-def collect_bear_settings(bears):
+def collect_bear_settings(bears, use_cache=True):
     """
     :param bears:
         Dict of candidate bears for the project for each language.
+    :param use_cache:
+        Whether to read and write the settings cached from earlier runs.
+        The cached settings of a bear are used as long as quickstart isn't
+        upgraded and the files of the bear and its dependencies are
+        unchanged.
     :return:
         A BearSettings object.
     """
+    cache = {}
+    if use_cache:
+        try:
+            cache = pickle_load(None, BEAR_SETTINGS_CACHE, {})
+        except (AttributeError, ImportError, TypeError):
+            # The cache was written by an incompatible version.
+            cache = {}
+    cache_changed = False
+
     bear_settings_obj = []
     for language in bears:
         for bear in bears[language]:
-            bear_settings_obj.append(BearSettings(bear))
+            files_key = (__version__, get_bear_files_key(bear))
+            cached = cache.get(bear.__name__)
+            if cached is not None and cached[0] == files_key:
+                bear_settings = BearSettings.from_setting_names(
+                    bear, cached[1])
+            else:
+                bear_settings = get_bear_settings(bear)
+                cache[bear.__name__] = (files_key,
+                                        bear_settings.get_setting_names())
+                cache_changed = True
+            bear_settings_obj.append(bear_settings)
+
+    if use_cache and cache_changed:
+        pickle_dump(None, BEAR_SETTINGS_CACHE, cache)
     return bear_settings_obj
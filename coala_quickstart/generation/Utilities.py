@@ -1,131 +1,127 @@
 import inspect
 import itertools
 import os
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from functools import lru_cache
 import re
 import yaml
 
 from coala_utils.Extensions import exts
-from coala_utils.string_processing import unescaped_search_for
 from coala_quickstart.Constants import HASHBANG_REGEX
 
+_HASHBANG_REGEX = re.compile(HASHBANG_REGEX)
+# Version numbers at the end of interpreter names, like in ``python3.6``.
+_VERSION_REGEX = re.compile(r'[\d.]+$')
+# The options of ``env`` which take an argument.
+_ENV_OPTIONS_WITH_ARGUMENT = {'-u', '-C', '-P', '--unset', '--chdir'}
 
-def is_glob_exp(line):
-    """
-    Determines whether the string is a gitignore glob expression.
 
-    :param line:
-        Given string.
-    :return:
-        True if the string is a glob expression. False otherwise.
-    """
-    results = unescaped_search_for('[*!?\[\]]', line, use_regex=True)
-    return sum(1 for x in results) != 0
+FileLanguages = namedtuple('FileLanguages',
+                           ['ext', 'languages', 'hashbang_language'])
 
 
-def parse_gitignore_line(line):
+@lru_cache(maxsize=1)
+def get_language_names():
     """
-    Parses the line from ``.gitignore`` and returns a list of globs.
+    :return:
+        A dict with the lowercase names of the languages known to
+        ``coala_utils.Extensions.exts`` as keys and the names as they are
+        spelled there as values.
+    """
+    names = {}
+    for languages in exts.values():
+        for lang in languages:
+            names.setdefault(lang.lower(), lang)
+    return names
+
 
-    :param line: A line from the project's ``.gitignore`` file.
-    :return:     A list of glob expressions translated to the
-                 syntax used in coala globbing.
+class LanguageClassifier:
     """
-    if line.isspace() or line.startswith('#'):
-        return []
-
-    cur = len(line) - 1
-
-    # Strips whitespace from the end if it is not escaped
-    while cur >= 0 and line[cur].isspace() and line[cur - 1] != '\\':
-        cur -= 1
-    line = line[:cur + 1]
-
-    if line.startswith('/'):
-        if not is_glob_exp(line[1:]):
-            # /build should map to ./build/** and ./build
-            yield os.path.join(line[1:], '**')
-            yield line[1:]
-        else:
-            # /*.c should map to ./*.c
-            yield line[1:]
-    else:
-        if not is_glob_exp(line):
-            # Ignore any directory or file with the same name
-            yield os.path.join('**', line, '**')
-            yield os.path.join('**', line)
-            yield line
-            yield os.path.join(line, '**')
-        else:
-            # *.c should map to ./**/*.c
-            yield os.path.join('**', line)
-            yield line
-
-
-def get_gitignore_glob(project_dir, gitignore_dir_list, filename='.gitignore'):
+    Classifies files by language, from their extension or for unknown
+    extensions from their hashbang line. Every file is only classified
+    once, so one classifier is shared by everything in a quickstart run
+    that needs the languages of the project files.
     """
-    Generates a list of glob expressions equivalent to the
-    contents of the user's project's ``.gitignore`` file.
-
-    :param project_dir:
-        The user's project directory.
-    :param gitignore_dir_list:
-        List of paths to the directories of the project
-        in which a .gitignore file is present.
-    :return:
-        A list generator of glob expressions generated from the
-        ``.gitignore`` file.
-    """
-    for dir_name in gitignore_dir_list:
-        gitignore = os.path.join(dir_name, filename)
-        with open(gitignore) as file:
-            for line in file:
-                for glob in parse_gitignore_line(line):
-                    yield os.path.join(dir_name, glob)
+
+    def __init__(self):
+        self._files = {}
+
+    def classify(self, file_path):
+        """
+        :param file_path:
+            The path of the file.
+        :return:
+            A ``FileLanguages`` tuple of the extension of the file, the
+            languages of the extension, and the lowercase name of the
+            language found in the hashbang line of the file, which is only
+            read for unknown extensions. Languages which aren't known are
+            left out.
+        """
+        info = self._files.get(file_path)
+        if info is None:
+            ext = os.path.splitext(file_path)[1]
+            if ext in exts:
+                info = FileLanguages(ext, tuple(exts[ext]), None)
+            else:
+                info = FileLanguages(
+                    ext, (), self._read_hashbang_language(file_path))
+            self._files[file_path] = info
+        return info
+
+    @staticmethod
+    def _read_hashbang_language(file_path):
+        try:
+            with open(file_path, 'r') as data:
+                hashbang = data.readline()
+        except (OSError, UnicodeDecodeError):
+            return None
+        language = get_language_from_hashbang(hashbang)
+        if language is not None and language.lower() in get_language_names():
+            return language.lower()
+        return None
 
 
-def split_by_language(project_files):
+def split_by_language(project_files, classifier=None):
     """
     Splits the given files based on language. This ignores unknown extensions.
 
     :param project_files: A list of file paths.
+    :param classifier:    The ``LanguageClassifier`` of the run, a new one
+                          is used if not given.
     :return:              A dict with language name as keys and a list of
                           files coming under that language as values.
     """
+    if classifier is None:
+        classifier = LanguageClassifier()
     lang_files = defaultdict(lambda: set())
     for file in project_files:
-        name, ext = os.path.splitext(file)
-        if ext in exts:
-            for lang in exts[ext]:
-                lang_files[lang.lower()].add(file)
-                lang_files['all'].add(file)
-        else:  # pragma: nocover
-            with open(file, 'r') as data:
-                hashbang = data.readline()
-                if(re.match(HASHBANG_REGEX, hashbang)):
-                    language = get_language_from_hashbang(hashbang).lower()
-                    for ext in exts:
-                        for lang in exts[ext]:
-                            if language == lang.lower():
-                                lang_files[lang.lower()].add(file)
-                                lang_files['all'].add(file)
+        info = classifier.classify(file)
+        for lang in info.languages:
+            lang_files[lang.lower()].add(file)
+            lang_files['all'].add(file)
+        if info.hashbang_language is not None:
+            lang_files[info.hashbang_language].add(file)
+            lang_files['all'].add(file)
     return lang_files
 
 
-def get_extensions(project_files):
+def get_extensions(project_files, classifier=None):
     """
     Generates the extensions available in the given project files.
 
     :param project_files: A list of file paths.
+    :param classifier:    The ``LanguageClassifier`` of the run, a new one
+                          is used if not given.
     :return:              The set of extensions used in the project_files
                           for which bears exist.
     """
+    if classifier is None:
+        classifier = LanguageClassifier()
     extset = defaultdict(lambda: set())
     for file in project_files:
-        ext = os.path.splitext(file)[1]
-        if ext in exts:
-            for lang in exts[ext]:
-                extset[lang.lower()].add(ext)
+        info = classifier.classify(file)
+        for lang in info.languages:
+            extset[lang.lower()].add(info.ext)
 
     return extset
 
@@ -180,15 +176,38 @@ def search_for_orig(decorated, orig_name):
 
 
 def get_language_from_hashbang(hashbang):
-    if(re.match('(^#!(.*))', hashbang)):
-        hashbang_contents = hashbang.split(' ')
-        try:
-            # For eg: #!bin/bash python3
-            return hashbang_contents[1]
-        except IndexError:
-            # For eg: #!bin/bash
-            hashbang_element = hashbang_contents[0].split('/')
-            return (hashbang_element[len(hashbang_element)-1])
+    """
+    Finds the interpreter named in a hashbang line. For ``env`` this is the
+    command it runs, and version numbers at the end of the name are left
+    out, e.g. ``#!/usr/bin/env -S python3 -u`` gives ``python``.
+
+    :param hashbang:
+        The first line of a file.
+    :return:
+        The name of the interpreter, or None if the line isn't a hashbang
+        line or doesn't name one.
+    """
+    match = _HASHBANG_REGEX.match(hashbang)
+    if match is None:
+        return None
+    words = match.group(2).split()
+    if not words:
+        return None
+    interpreter = words[0]
+    if interpreter.rsplit('/', 1)[-1] == 'env':
+        interpreter = None
+        words = iter(words[1:])
+        for word in words:
+            word = word.strip('\'"')
+            if word in _ENV_OPTIONS_WITH_ARGUMENT:
+                next(words, None)
+            elif word and not word.startswith('-') and '=' not in word:
+                interpreter = word
+                break
+        if interpreter is None:
+            return None
+    interpreter = interpreter.rsplit('/', 1)[-1]
+    return _VERSION_REGEX.sub('', interpreter) or interpreter
 
 
 def concatenate(dict1, dict2):
@@ -239,73 +258,6 @@ def peek(iterable):
     return first, itertools.chain([first], iterable)
 
 
-def contained_in(smaller, bigger):
-    """
-    Takes in two SourceRange objects and checks whether
-    the first one lies inside the other one.
-    :param smaller:
-        The SourceRange object that needs to be checked whether
-        it is inside the other one.
-    :param bigger:
-        The SourceRange object that needs to be checked whether
-        it contains the other one.
-    :return:
-        True if smaller is inside the bigger else false.
-    """
-    smaller_file = smaller.start.file
-    bigger_file = bigger.start.file
-
-    smaller_start_line = smaller.start.line
-    smaller_start_column = smaller.start.column
-    smaller_end_line = smaller.end.line
-    smaller_end_column = smaller.end.column
-
-    bigger_start_line = bigger.start.line
-    bigger_start_column = bigger.start.column
-    bigger_end_line = bigger.end.line
-    bigger_end_column = bigger.end.column
-
-    if None in [smaller_start_line, smaller_start_column,
-                smaller_end_line, smaller_end_column,
-                bigger_start_line, bigger_start_column,
-                bigger_end_line, bigger_end_column]:
-        return False
-
-    if not smaller_file == bigger_file:
-        return False
-
-    if smaller_start_line < bigger_start_line:
-        return False
-
-    if smaller_end_line > bigger_end_line:
-        return False
-
-    if smaller_start_line > bigger_start_line and (
-            smaller_end_line < bigger_end_line):
-        return True
-
-    same_start_line = (smaller_start_line == bigger_start_line)
-
-    same_end_line = (smaller_end_line == bigger_end_line)
-
-    if same_start_line and same_end_line:
-        if smaller_start_column < bigger_start_column:
-            return False
-        if smaller_end_column > bigger_end_column:
-            return False
-        return True
-
-    if same_start_line:
-        if smaller_start_column < bigger_start_column:
-            return False
-        return True
-
-    assert same_end_line
-    if smaller_end_column > bigger_end_column:
-        return False
-    return True
-
-
 def get_yaml_contents(project_data):
     """
     Reads a YAML file and returns the data.
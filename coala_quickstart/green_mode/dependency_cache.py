@@ -0,0 +1,80 @@
+class DependencyCache:
+    """
+    Stores whether a dependency bear was green on a file with a given
+    projection of the setting values, so that each dependency runs at most
+    once per file and distinct arguments during a green mode run.
+    """
+
+    def __init__(self):
+        self._results = {}
+        # The keys of the dependency runs which are scheduled but have no
+        # result yet.
+        self._pending = set()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(dep, filename, setting_names, values):
+        """
+        :param dep:
+            The dependency bear class.
+        :param filename:
+            The name of the file the dependency runs on.
+        :param setting_names:
+            The names of the settings passed to the dependency.
+        :param values:
+            The values to the settings in the same order as
+            `setting_names`.
+        :return:
+            The key of the dependency run in the cache.
+        """
+        arguments = tuple(sorted(zip(setting_names, values),
+                                 key=lambda item: item[0]))
+        try:
+            hash(arguments)
+        except TypeError:
+            # Settings taking lists as values.
+            arguments = repr(arguments)
+        return dep, filename, arguments
+
+    def lookup(self, key):
+        """
+        Looks up a dependency run and counts the hit or the miss.
+
+        :param key:
+            The key as returned by ``get_key()``.
+        :return:
+            True if the key is in the cache or its run is scheduled with
+            ``reserve()``, False otherwise.
+        """
+        if key in self._results or key in self._pending:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def reserve(self, key):
+        """
+        Marks a dependency run as scheduled, so that later lookups of it
+        count as hits before its result is added.
+
+        :param key:
+            The key as returned by ``get_key()``.
+        """
+        self._pending.add(key)
+
+    def add(self, key, result):
+        """
+        :param key:
+            The key as returned by ``get_key()``.
+        :param result:
+            True if the dependency was green, False otherwise.
+        """
+        self._pending.discard(key)
+        self._results[key] = result
+
+    def __getitem__(self, key):
+        return self._results[key]
+
+    def __contains__(self, key):
+        return key in self._results
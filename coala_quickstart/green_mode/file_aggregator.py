@@ -1,6 +1,9 @@
 import os
+from collections import OrderedDict
 
+from coala_quickstart.generation.ProjectIndex import scan_project
 from coala_quickstart.green_mode.find_globs import (
+    SectionFileCounts,
     find_globs_from_files,
     )
 
@@ -8,46 +11,42 @@ from coala_quickstart.green_mode.find_globs import (
 class Node:
     """
     Tree data-structure that has each directory as a node,
-    each subdirectory as children and files as leaves.
+    each subdirectory as children and files as leaves. The
+    children are kept in a dict by their names.
     """
 
-    def __init__(self, name, parent, children=[]):
+    __slots__ = ('name', 'parent', 'children')
+
+    def __init__(self, name, parent, children=()):
         self.name = name
         self.parent = parent
-        self.children = children
+        self.children = {}
+        for child in children:
+            self.add_children(child)
 
     def add_children(self, children):
-        self.children.append(children)
+        self.children[children.name] = children
 
-    def search_name(self, name):
-        if name == self.name:  # pragma: no cover
-            return self
-        for child in self.children:
-            if child.name == name:
-                return child
-        for child in self.children:
-            found_node = child.search_name(name)
-            if found_node is not None:  # pragma: no cover
-                return found_node
-        return None
+    def get_child(self, name):
+        return self.children.get(name)
 
     def get_files(self, pre_path):
-        for child in self.children:
+        for child in self.children.values():
             name = pre_path + os.sep + child.name
             # FIXME: What happens in case of empty directories?
-            if child.children == []:
+            if not child.children:
                 yield name
             else:
                 yield from child.get_files(name)
 
     def get_files_cd(self, pre_path):
-        for child in self.children:
+        for child in self.children.values():
             name = pre_path + os.sep + child.name
-            if child.children == []:
+            if not child.children:
                 yield name
 
 
-def aggregate_files(files, project_dir):
+def aggregate_files(files, project_dir, project_index=None):
     """
     Aggregates the files field into ignore field and globs.
     :param files:
@@ -55,11 +54,15 @@ def aggregate_files(files, project_dir):
         section.
     :param project_dir:
         The project directory.
+    :param project_index:
+        The ``ProjectIndex`` of the project, the project directory is
+        scanned if not given.
     :return:
         The changed files list with globs in it and the ignored
         files list.
     """
-    root = Node('project_dir', None, [])
+    root = Node('project_dir', None)
+    leaf_files = {}
     for file in files:
         file_ = file.replace(project_dir, '')[1:]
         names = file_.split(os.sep)
@@ -67,15 +70,18 @@ def aggregate_files(files, project_dir):
         for name in names:
             if not name:
                 continue
-            node = root_node.search_name(name)
+            node = root_node.get_child(name)
             if node is None:
-                new_node = Node(name, root_node, [])
-                root_node.add_children(new_node)
-                root_node = new_node
-            else:
-                root_node = node
+                node = Node(name, root_node)
+                root_node.add_children(node)
+            root_node = node
+        leaf_files.setdefault(root_node, []).append(file)
 
+    if project_index is None:
+        project_index = scan_project(project_dir)
+    file_counts = SectionFileCounts(project_index, files, leaf_files)
     dummy = Node('dummy', None, [root])
     files, ignore_list = find_globs_from_files(
-        dummy, '', project_dir, files, [], [])
-    return files, ignore_list
+        dummy, '', project_dir, OrderedDict.fromkeys(files), [], [],
+        file_counts)
+    return list(files), ignore_list
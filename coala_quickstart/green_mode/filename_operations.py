@@ -1,5 +1,4 @@
 import os
-from copy import deepcopy
 
 from coala_quickstart.generation.Utilities import (
     append_to_contents,
@@ -9,37 +8,33 @@ from coala_quickstart.green_mode.green_mode import (
     )
 
 
-class Node:
-    def __init__(self, character, parent=None):
-        self.count = 1
-        self.character = character
-        self.children = {}
-        self.parent = parent
-
-    def insert(self, string, idx):
-        if idx >= len(string):
-            return
-        code = ord(string[idx])  # ASCII code
-        ch = string[idx]
-        if ch in self.children:
-            self.children[ch].count += 1
-        else:
-            self.children[ch] = Node(string[idx], self)
-        self.children[ch].insert(string, idx + 1)
-
-
 class Trie:
     """
     Creates a Trie data structure for storing names of files.
+
+    Prefix discovery only ever follows the edges of the trie along which
+    no name branches off, starting from the first character. So the trie
+    is kept compressed down to that: for each first character, the number
+    of names starting with it and the longest prefix all of them share.
+    Inserting a name takes time linear in its length, and no object is
+    allocated per character.
     """
 
     def __init__(self):
-        self.root = Node('')
+        # First character -> [number of names, their common prefix]
+        self.edges = {}
 
     def insert(self, string):
-        self.root.insert(string, 0)
+        if not string:
+            return
+        edge = self.edges.get(string[0])
+        if edge is None:
+            self.edges[string[0]] = [1, string]
+            return
+        edge[0] += 1
+        if not string.startswith(edge[1]):
+            edge[1] = os.path.commonprefix((edge[1], string))
 
-    # Just a wrapper function.
     def get_prefixes(self, min_length, min_files):
         """
         Discovers prefix from the Trie. Prefix shorter than the
@@ -47,44 +42,29 @@ class Trie:
         min_files are not stored. Returns the prefixes in sorted
         order.
         """
-        self.prefixes = {}
-        self._discover_prefixes(self.root, [], min_length, 0, min_files)
-        return sorted(self.prefixes.items(), key=lambda x: (x[1], x[0]),
+        prefixes = {}
+        if min_length <= 0:
+            prefixes[''] = 1
+        for count, prefix in self.edges.values():
+            if count < min_files or len(prefix) < min_length:
+                continue
+            # A longer prefix replaces the prefixes found before which are
+            # contained in it.
+            for found in [found for found in prefixes if found in prefix]:
+                del prefixes[found]
+            prefixes[prefix] = count
+        return sorted(prefixes.items(), key=lambda x: (x[1], x[0]),
                       reverse=True)
 
-    def _discover_prefixes(self, node, prefix, min_length, len, min_files):
-        """
-        Performs a DFA search on the trie. Discovers the prefixes in the trie
-        and stores them in the self.prefixes dictionary.
-        """
-        if node.count < min_files and node.character != '':
-            return
-        if len >= min_length:
-            current_prefix = ''.join(prefix) + node.character
-            to_delete = []
-            for i in self.prefixes:
-                if i in current_prefix:
-                    to_delete.append(i)
-            for i in to_delete:
-                self.prefixes.pop(i)
-            self.prefixes[''.join(prefix) + node.character] = node.count
-        orig_prefix = deepcopy(prefix)
-        for ch, ch_node in node.children.items():
-            prefix.append(node.character)
-            if (not ch_node.count < node.count) or orig_prefix == []:
-                self._discover_prefixes(ch_node, prefix, min_length, len + 1,
-                                        min_files)
-            prefix.pop()
-
 
 def get_files_list(contents):
     """
     Generates a list which contains only files from
     the entire project from the directory and file
-    structure written to '.project_data.yaml'.
+    structure written to '.project_data.json'.
     :param contents:
         The python object containing the file and
-        directory structure written to '.project_data.yaml'.
+        directory structure written to '.project_data.json'.
     :return:
         The list of all the files in the project.
     """
@@ -105,7 +85,7 @@ def check_filename_prefix_postfix(contents, min_length_of_prefix=6,
     having certain prefix or postfix.
     :param contents:
         The python object containing the file and
-        directory structure written to '.project_data.yaml'.
+        directory structure written to '.project_data.json'.
     :param min_length_of_prefix:
         The minimum length of prefix for it green_mode to
         consider as a valid prefix.
@@ -114,7 +94,7 @@ def check_filename_prefix_postfix(contents, min_length_of_prefix=6,
         for green_mode to consider it as a valid prefix.
     :return:
         Update contents value with the results found out
-        from the file/directory structure in .project_data.yaml.
+        from the file/directory structure in .project_data.json.
     """
     file_names_list = get_files_list(contents['dir_structure'])
     file_names_list = [os.path.splitext(os.path.basename(x))[
@@ -1,11 +1,213 @@
 import os
-from fnmatch import fnmatch
+import re
+from collections import Counter
+from fnmatch import translate
+from functools import lru_cache
 
 MAX_IGNORE_FILES = 7
 
 
+class FileCounts:
+    """
+    The number of files of a directory, both directly inside it and in
+    its whole subtree, in total and per filename extension. The extensions
+    are kept in the order they were first counted.
+    """
+
+    __slots__ = ('all', 'all_ext', 'top', 'top_ext')
+
+    def __init__(self):
+        self.all = 0
+        self.all_ext = Counter()
+        self.top = 0
+        self.top_ext = Counter()
+
+    def add_file(self, ext):
+        """
+        Counts a file directly inside the directory.
+        """
+        self.all += 1
+        self.all_ext[ext] += 1
+        self.top += 1
+        self.top_ext[ext] += 1
+
+    def add_subdirectory(self, counts):
+        """
+        Counts the files of a subdirectory.
+
+        :param counts:
+            The ``FileCounts`` of the subdirectory.
+        """
+        self.all += counts.all
+        self.all_ext.update(counts.all_ext)
+
+
+@lru_cache(maxsize=1)
+def count_project_files(project_index):
+    """
+    Counts the files of each directory of a project bottom-up, in a
+    single pass over the directories.
+
+    :param project_index:
+        The ``ProjectIndex`` of the project.
+    :return:
+        A dict with directory paths as keys and their ``FileCounts`` as
+        values.
+    """
+    counts = {}
+    # Subdirectories are indexed after their parents, so they are counted
+    # first when going backwards.
+    for path in reversed(project_index.dirs):
+        entry = project_index.dirs[path]
+        dir_counts = FileCounts()
+        for name in entry.files:
+            dir_counts.add_file(os.path.splitext(name)[1])
+        for name in entry.dirs:
+            dir_counts.add_subdirectory(counts[os.path.join(path, name)])
+        counts[path] = dir_counts
+    return counts
+
+
+class SectionFileCounts:
+    """
+    The file counts of the project and of the files of a section, used to
+    decide in constant time per directory whether a glob matches a
+    substantial amount of files.
+    """
+
+    def __init__(self, project_index, section_files, leaf_files=None):
+        """
+        :param project_index:
+            The ``ProjectIndex`` of the project.
+        :param section_files:
+            The files of the section.
+        :param leaf_files:
+            A dict with the leaf Nodes of the tree of the section files as
+            keys and the lists of the section files they were built from as
+            values.
+        """
+        self.project_index = project_index
+        self.section_files = set(section_files)
+        self.leaf_files = {} if leaf_files is None else leaf_files
+        # The globs found so far, in the order they were found.
+        self.globs = []
+        self._project_counts = count_project_files(project_index)
+        self._section_counts = {}
+
+    def get_project_counts(self, dir_name):
+        """
+        :return:
+            The ``FileCounts`` of all the files of the project in the
+            directory.
+        """
+        return self._project_counts.get(os.path.abspath(dir_name),
+                                        FileCounts())
+
+    def get_section_counts(self, node, dir_name):
+        """
+        :param node:
+            The Node of the directory in the tree of the section files.
+        :param dir_name:
+            The path of the directory.
+        :return:
+            The ``FileCounts`` of the files of the section in the
+            directory, and the ``FileCounts`` of those of them which are
+            present in the project.
+        """
+        if node not in self._section_counts:
+            section_counts = FileCounts()
+            common_counts = FileCounts()
+            for child in node.children.values():
+                name = dir_name + os.sep + child.name
+                if not child.children:
+                    ext = os.path.splitext(name)[1]
+                    section_counts.add_file(ext)
+                    if name in self.project_index.files:
+                        common_counts.add_file(ext)
+                else:
+                    child_section, child_common = self.get_section_counts(
+                        child, name)
+                    section_counts.add_subdirectory(child_section)
+                    common_counts.add_subdirectory(child_common)
+            self._section_counts[node] = section_counts, common_counts
+        return self._section_counts[node]
+
+    def get_section_files(self, node):
+        """
+        :param node:
+            A Node of the tree of the section files.
+        :return:
+            The section files in the subtree of the Node.
+        """
+        nodes = [node]
+        while nodes:
+            node = nodes.pop()
+            yield from self.leaf_files.get(node, ())
+            nodes.extend(reversed(list(node.children.values())))
+
+    def replace_with_glob(self, files, node, glob):
+        """
+        Replaces the files and the globs matched by a new glob with the
+        glob itself. Only the section files in the subtree of the directory
+        of the glob and the globs found before are matched against it.
+
+        :param files:
+            An OrderedDict with the files and globs of the section as keys,
+            which is changed in place.
+        :param node:
+            The Node of the directory of the glob.
+        :param glob:
+            The glob to add.
+        """
+        match = re.compile(translate(glob)).match
+        # Every file the glob matches ends with what follows its last '*',
+        # which is much cheaper to check.
+        suffix = glob.rsplit('*', 1)[1]
+        for file in self.get_section_files(node):
+            if file in files and file.endswith(suffix) and match(file):
+                del files[file]
+        for found_glob in self.globs:
+            if found_glob in files and match(found_glob):
+                del files[found_glob]
+        files[glob] = None
+        self.globs = [found_glob for found_glob in self.globs
+                      if found_glob in files]
+        self.globs.append(glob)
+
+    def get_files_not_in_section(self, dir_name, recursive, ext=None):
+        """
+        :param dir_name:
+            The path of the directory.
+        :param recursive:
+            Whether to include the files of the subdirectories.
+        :param ext:
+            Only include files with this extension if given.
+        :return:
+            The list of the files of the project in the directory which
+            are not part of the section.
+        """
+        files = []
+        for dirpath, dirnames, filenames in self.project_index.walk(
+                dir_name):
+            files += [os.path.join(dirpath, name) for name in filenames
+                      if (ext is None or os.path.splitext(name)[1] == ext)
+                      and os.path.join(dirpath, name)
+                      not in self.section_files]
+            if not recursive:
+                break
+        return files
+
+
+def _is_substantial(matched, not_matched, total):
+    # The number MAX_IGNORE_FILES is chosen as a plausible guess for
+    # when the number of files in the ignore
+    # section exceed the limit.
+    return total > 0 and (float(matched / total) >= 0.9 or
+                          not_matched <= MAX_IGNORE_FILES)
+
+
 def find_globs_from_files(node, initials, project_dir, files, ignore_list,
-                          already_found_ext=[]):
+                          already_found_ext, file_counts):
     """
     Finds the globs from the files present in the section, looking first
     for the glob '**', then the glob '**' with different filename extensions
@@ -18,8 +220,8 @@ def find_globs_from_files(node, initials, project_dir, files, ignore_list,
     :param project_dir:
         The name of the project directory.
     :param files:
-        The files list for the section which is appended/changed on each
-        recursion of this method.
+        An OrderedDict with the files and globs for the section as keys,
+        which is changed on each recursion of this method.
     :param ignore_list:
         The list of files to ignore for the current section which is
         constructed along as the recursion algorithm proceeds.
@@ -27,49 +229,33 @@ def find_globs_from_files(node, initials, project_dir, files, ignore_list,
         The list of extensions already covered inside the glob '**' with
         the extension to be passed along the the children nodes to skip the
         checks.
+    :param file_counts:
+        The ``SectionFileCounts`` of the project and the section.
     :return:
-        List of appended files and list of files to ignore for the current
-        section.
+        The OrderedDict of files and globs and list of files to ignore for
+        the current section.
     """
-
-    global MAX_IGNORE_FILES
-
-    for child in node.children:
-        if not child.children == []:
+    for child in node.children.values():
+        if child.children:
             if child.name == 'project_dir' and node.name == 'dummy':
                 child_name = project_dir
             else:
                 child_name = child.name
             dir_name = initials + os.sep + child_name
             dir_name = dir_name.replace(os.sep + os.sep, os.sep)
-            list_of_files = list()
-            for (dirpath, dirnames, filenames) in os.walk(dir_name):
-                list_of_files += [os.path.join(dirpath, file)
-                                  for file in filenames]
-            files_in_section = list(child.get_files(dir_name))
-            number_of_common_files = 0
-            files_not_common = []
-            for file in list_of_files:
-                if file in files_in_section:
-                    number_of_common_files += 1
-                else:
-                    files_not_common.append(file)
-            # The number MAX_IGNORE_FILES is chosen as a plausible guess for
-            # when the number of files in the ignore
-            # section exceed the limit.
-            ratio = float(number_of_common_files/len(list_of_files))
-            if list_of_files != [] and (ratio >= 0.9 or len(
-                    files_not_common) <= MAX_IGNORE_FILES):
+            project_counts = file_counts.get_project_counts(dir_name)
+            section_counts, common_counts = file_counts.get_section_counts(
+                child, dir_name)
+
+            if _is_substantial(common_counts.all,
+                               project_counts.all - common_counts.all,
+                               project_counts.all):
                 # Means a glob '**' can be matched agains substantial amount
                 # of files.
-                glob = dir_name + os.sep + '**'
-                new_files = []
-                for file in files:
-                    if not fnmatch(file, glob):
-                        new_files.append(file)
-                new_files.append(glob)
-                files = new_files
-                ignore_list += files_not_common
+                file_counts.replace_with_glob(
+                    files, child, dir_name + os.sep + '**')
+                ignore_list += file_counts.get_files_not_in_section(
+                    dir_name, recursive=True)
                 # Since the glob '**' is found to be valid irresepective
                 # of the extension,
                 # all the files/leaves in the corresponding subtree are
@@ -78,133 +264,52 @@ def find_globs_from_files(node, initials, project_dir, files, ignore_list,
             else:
                 # Check for the glob '**' but with each kind of file extension
                 # in each subfolder.
-
-                # Collecting files both from the tree and from the directories.
-                files_in_section_ext_dict = {}
-                for file in files_in_section:
-                    ext = os.path.splitext(file)[1]
-                    if ext in files_in_section_ext_dict:
-                        files_in_section_ext_dict[ext].append(file)
-                    else:
-                        files_in_section_ext_dict[ext] = [file]
-
-                list_of_files_ext_dict = {}
-                for file in list_of_files:
-                    ext = os.path.splitext(file)[1]
-                    if ext in list_of_files_ext_dict:
-                        list_of_files_ext_dict[ext].append(file)
-                    else:
-                        list_of_files_ext_dict[ext] = [file]
-
-                for ext in files_in_section_ext_dict:
+                for ext in section_counts.all_ext:
                     # Loop for al extensions
                     if ext in already_found_ext:
                         continue
-                    val_in_sec = files_in_section_ext_dict[ext]
-                    val_in_files = list_of_files_ext_dict[ext]
-                    not_common_ext_files = []
-                    num_ext_common_files = 0
-                    for file in val_in_files:
-                        if file in val_in_sec:
-                            num_ext_common_files += 1
-                        else:
-                            not_common_ext_files.append(file)
-
-                    if val_in_files != [] and (
-                        float(len(val_in_sec)/len(
-                            val_in_files)) >= 0.9 or len(
-                            not_common_ext_files) <= MAX_IGNORE_FILES):
+                    in_project = project_counts.all_ext[ext]
+                    if _is_substantial(
+                            section_counts.all_ext[ext],
+                            in_project - common_counts.all_ext[ext],
+                            in_project):
                         already_found_ext.append(ext)
-                        glob_ext = dir_name + os.sep + '**' + ext
-                        new_files_ext = []
-                        for file in files:
-                            if not fnmatch(file, glob_ext):
-                                new_files_ext.append(file)
-                        new_files_ext.append(glob_ext)
-                        files = new_files_ext
-                        ignore_list += not_common_ext_files
+                        file_counts.replace_with_glob(
+                            files, child, dir_name + os.sep + '**' + ext)
+                        ignore_list += file_counts.get_files_not_in_section(
+                            dir_name, recursive=True, ext=ext)
 
             # At this point it is confirmed that the glob '**' can't be matched
             # against a substantial amount of files with or without extensions.
             # So checking for the glob '*'.
-            list_of_files_cd = list()
-            for (dirpath, dirnames, filenames) in os.walk(dir_name):
-                list_of_files_cd += [os.path.join(dirpath, file)
-                                     for file in filenames]
-                break
-
-            files_in_section_cd = list(child.get_files_cd(dir_name))
-            number_of_common_files_cd = 0
-            files_not_common_cd = []
-            for file in list_of_files_cd:
-                if file in files_in_section_cd:
-                    number_of_common_files_cd += 1
-                else:
-                    files_not_common_cd.append(file)
-            if list_of_files_cd != [] and (
-                    float(number_of_common_files_cd/len(
-                        list_of_files_cd)) >= 0.9 or len(
-                        files_not_common_cd) <= MAX_IGNORE_FILES):
-                glob_cd = dir_name + os.sep + '*'
-                new_files_cd = []
-                for file in files:
-                    if (not fnmatch(file, glob_cd)):
-                        new_files_cd.append(file)
-                new_files_cd.append(glob_cd)
-                files = new_files_cd
-                ignore_list += files_not_common_cd
+            if _is_substantial(common_counts.top,
+                               project_counts.top - common_counts.top,
+                               project_counts.top):
+                file_counts.replace_with_glob(
+                    files, child, dir_name + os.sep + '*')
+                ignore_list += file_counts.get_files_not_in_section(
+                    dir_name, recursive=False)
             else:
                 # No sunstantial amount of files could be matched against
                 # the glob '*' either so checking for the glob '*' per
                 # extension.
-
-                # Collecting files from the tree and the ones present in
-                # the directory.
-                files_in_section_ext_dict_cd = {}
-                for file in files_in_section_cd:
-                    ext_cd = os.path.splitext(file)[1]
-                    if ext_cd in files_in_section_ext_dict_cd:
-                        files_in_section_ext_dict_cd[ext_cd].append(file)
-                    else:
-                        files_in_section_ext_dict_cd[ext_cd] = [file]
-
-                list_of_files_ext_dict_cd = {}
-                for file in list_of_files_cd:
-                    ext = os.path.splitext(file)[1]
-                    if ext in list_of_files_ext_dict_cd:
-                        list_of_files_ext_dict_cd[ext].append(file)
-                    else:
-                        list_of_files_ext_dict_cd[ext] = [file]
-
-                for ext in files_in_section_ext_dict_cd:
+                for ext in section_counts.top_ext:
                     # Looping through al extensions and checking the files
                     # against the glob '*.{ext}' and checking the ratio
                     # of files covered.
                     if ext in already_found_ext:
                         continue
-                    val_in_sec_cd = files_in_section_ext_dict_cd[ext]
-                    val_in_files_cd = list_of_files_ext_dict_cd[ext]
-                    not_common_ext_files_cd = []
-                    num_ext_common_files_cd = 0
-                    for file in val_in_files_cd:
-                        if file in val_in_sec_cd:
-                            num_ext_common_files_cd += 1
-                        else:
-                            not_common_ext_files_cd.append(file)
-                    if val_in_files_cd != [] and (
-                            float(len(val_in_sec_cd)/len(
-                                val_in_files_cd)) >= 0.9 or len(
-                                not_common_ext_files_cd) <= MAX_IGNORE_FILES):
-                        glob_ext_cd = dir_name + os.sep + '*' + ext
-                        new_files_ext_cd = []
-                        for file in files:
-                            if not fnmatch(file, glob_ext_cd):
-                                new_files_ext_cd.append(file)
-                        new_files_ext_cd.append(glob_ext_cd)
-                        files = new_files_ext_cd
-                        ignore_list += not_common_ext_files_cd
+                    in_project = project_counts.top_ext[ext]
+                    if _is_substantial(
+                            section_counts.top_ext[ext],
+                            in_project - common_counts.top_ext[ext],
+                            in_project):
+                        file_counts.replace_with_glob(
+                            files, child, dir_name + os.sep + '*' + ext)
+                        ignore_list += file_counts.get_files_not_in_section(
+                            dir_name, recursive=False, ext=ext)
 
             files, ignore_list = find_globs_from_files(
                 child, dir_name, project_dir, files, ignore_list,
-                already_found_ext)
+                already_found_ext, file_counts)
     return files, ignore_list
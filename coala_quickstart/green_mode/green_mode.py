@@ -1,12 +1,14 @@
 import fnmatch
 import itertools
+import math
 import operator
 import os
+import re
 from copy import deepcopy
-from pathlib import Path
+from functools import lru_cache
 
 from coala_quickstart.generation.Utilities import (
-    contained_in,
+    LanguageClassifier,
     get_all_args,
     get_extensions,
     get_yaml_contents,
@@ -16,12 +18,32 @@ from coala_quickstart.generation.Utilities import (
 from coala_quickstart.generation.SettingsClass import (
     SettingTypes,
     )
+from coala_quickstart.generation.ProjectIndex import (
+    scan_project,
+    )
+from coala_quickstart.green_mode.dependency_cache import (
+    DependencyCache,
+    )
+from coala_quickstart.green_mode.ignore_range_index import (
+    IgnoreRangeIndex,
+    )
+from coala_quickstart.green_mode.lazy_file_dict import (
+    DEFAULT_MAX_SIZE,
+    LazyFileDict,
+    )
 from coala_quickstart.green_mode.file_aggregator import (
     aggregate_files,
     )
+from coala_quickstart.green_mode.project_data import (
+    get_file_signature,
+    )
 from coala_quickstart.green_mode.Setting import (
     find_max_min_of_setting,
     )
+from coala_quickstart.green_mode.trial_executor import (
+    TrialExecutor,
+    get_shared_data,
+    )
 from coala_quickstart.generation.Settings import (
     generate_ignore_field,
     )
@@ -34,16 +56,34 @@ from coala_utils.string_processing.Core import (
 from coalib.bears.GlobalBear import GlobalBear
 from coalib.output.ConfWriter import ConfWriter
 from coalib.processes.Processing import (
-    get_file_dict,
     yield_ignore_ranges,
     )
+from coalib.results.SourceRange import SourceRange
 from coalib.settings.Section import Section
 
 
 settings_key = 'green_mode_infinite_value_settings'
 
 
-def initialize_project_data(dir, ignore_globs):
+def compile_ignore_globs(ignore_globs):
+    """
+    Compiles globs into a single regular expression, so that a path is
+    matched against all of them at once.
+    :param ignore_globs:
+        The globs, with the semantics of ``fnmatch.fnmatch``.
+    :return:
+        A function which takes a path and returns whether it matches any
+        of the globs.
+    """
+    if not ignore_globs:
+        return lambda path: False
+    regex = re.compile('|'.join(fnmatch.translate(os.path.normcase(glob))
+                                for glob in ignore_globs))
+    return lambda path: regex.match(os.path.normcase(path)) is not None
+
+
+def initialize_project_data(dir, ignore_globs, project_index=None,
+                            is_ignored=None):
     """
     Generates the values for the key 'dir_structure'
     for PROJECT_DATA which is directories as
@@ -54,30 +94,31 @@ def initialize_project_data(dir, ignore_globs):
         and files.
     :param ignore_globs:
         The globs of files to ignore from writing to the
-        'PROJECT_DATA'.
+        'PROJECT_DATA'. Ignored directories are not descended into.
+    :param project_index:
+        The ``ProjectIndex`` containing the directory. The directory
+        is scanned if it is not given.
+    :param is_ignored:
+        The ignore globs compiled with ``compile_ignore_globs()``, they
+        are compiled from ``ignore_globs`` if not given.
     :return:
         The python object that was written as YAML data
         to PROJECT_DATA.
     """
-    files_dirs = os.listdir(dir)
-    # files_dirs holds names of both files and dirs.
-    dir_name = dir[dir.rfind(os.sep)+1:]
-    final_data = []
-
-    for i in files_dirs:
-        to_continue = False
-        for glob in ignore_globs:
-            if fnmatch.fnmatch(dir+i, glob):
-                to_continue = True
-        if to_continue is True:
+    if project_index is None:
+        project_index = scan_project(dir)
+    if is_ignored is None:
+        is_ignored = compile_ignore_globs(ignore_globs)
+    directory = project_index.dirs[os.path.abspath(dir)]
+
+    final_data = [i for i in directory.files if not is_ignored(dir+i)]
+    for i in directory.dirs:
+        if is_ignored(dir+i):
             continue
-        if os.path.isfile(dir+i):
-            final_data.append(i)
-        else:
-            look_into_dir = dir+i+os.sep
-            data = initialize_project_data(look_into_dir,
-                                           ignore_globs)
-            final_data.append({i: data})
+        look_into_dir = dir+i+os.sep
+        data = initialize_project_data(look_into_dir, ignore_globs,
+                                       project_index, is_ignored)
+        final_data.append({i: data})
     return final_data
 
 
@@ -107,7 +148,25 @@ def generate_complete_filename_list(contents, project_dir):
     return file_names_list
 
 
-def run_quickstartbear(contents, project_dir):
+def get_file_ignore_ranges(filename, file):
+    """
+    Finds the ignore ranges of a file in a form which can be stored in
+    'PROJECT_DATA'.
+    :param filename:
+        The name of the file.
+    :param file:
+        The lines of the file.
+    :return:
+        A list of tuples of the bears to ignore and the start line, start
+        column, end line and end column of the range to ignore them in.
+    """
+    return [(bears, (source_range.start.line, source_range.start.column,
+                     source_range.end.line, source_range.end.column))
+            for bears, source_range in yield_ignore_ranges({filename: file})]
+
+
+def run_quickstartbear(contents, project_dir, file_cache=None,
+                       project_index=None, max_file_dict_size=None):
     """
     Runs the QuickstartBear which pareses the file_dict
     to get the exact value of some settings which can attain
@@ -119,13 +178,24 @@ def run_quickstartbear(contents, project_dir):
     :param project_dir:
         The project directory from which to get the files for the
         QuickstartBear to run.
+    :param file_cache:
+        The per-file cache loaded from 'PROJECT_DATA'. The QuickstartBear
+        is only run and the ignore ranges are only searched for on the
+        files whose stat signature differs from the cached one, and the
+        cache is updated in place.
+    :param project_index:
+        The ``ProjectIndex`` of the project to take the stat signatures
+        of the files from.
+    :param max_file_dict_size:
+        The maximum number of characters of file contents the file dict
+        keeps in memory, defaults to `lazy_file_dict.DEFAULT_MAX_SIZE`.
     :return:
         - An updated contents value after guessing values of certain
           settings.
-        - Collection of SourceRange objects indicating the parts of
-          code to ignore.
+        - IgnoreRangeIndex of the parts of code to ignore.
         - The complete file dict contains file names as keys and file
-          contents as values to those keys.
+          contents as values to those keys. It is a LazyFileDict which
+          reads the files on demand.
         - The complete file name list from the project directory and sub
           directories.
     """
@@ -134,15 +204,36 @@ def run_quickstartbear(contents, project_dir):
 
     complete_filename_list = generate_complete_filename_list(
         contents['dir_structure'], project_dir)
-    complete_file_dict = get_file_dict(complete_filename_list,
-                                       allow_raw_files=True)
-    ignore_ranges = list(yield_ignore_ranges(complete_file_dict))
+    complete_file_dict = LazyFileDict(
+        complete_filename_list,
+        DEFAULT_MAX_SIZE if max_file_dict_size is None else max_file_dict_size)
+    file_ignore_ranges = []
     find_max = ['max_lines_per_file', 'max_line_length']
     find_min = ['min_lines_per_file']
+    previous_cache = {}
+    if file_cache is not None:
+        previous_cache = dict(file_cache)
+        # Forget about the files which are not part of the project anymore.
+        file_cache.clear()
     for key in complete_file_dict:
-        return_val = quickstartbear_obj.execute(
-            filename=key, file=complete_file_dict[key])
-        return_val = return_val[0]
+        signature = None if file_cache is None else get_file_signature(
+            key, project_index)
+        cached = previous_cache.get(key)
+        if cached is not None and cached['signature'] == signature:
+            return_val = cached['quickstart']
+            ranges = cached['ignore_ranges']
+        else:
+            return_val = quickstartbear_obj.execute(
+                filename=key, file=complete_file_dict[key])
+            return_val = return_val[0]
+            ranges = get_file_ignore_ranges(key, complete_file_dict[key])
+        if file_cache is not None:
+            file_cache[key] = {'signature': signature,
+                               'quickstart': return_val,
+                               'ignore_ranges': ranges}
+        file_ignore_ranges.extend(
+            (bears, SourceRange.from_values(key, *bounds))
+            for bears, bounds in ranges)
         # eg. return_val = {'setting_name': value, ...}
         if return_val is not None:
             for setting in find_max:
@@ -155,8 +246,7 @@ def run_quickstartbear(contents, project_dir):
                     setting, return_val[setting], contents,
                     operator.lt)
 
-    bear_settings = get_yaml_contents(str(
-        Path(__file__).parent / 'bear_settings.yaml'))['type2']
+    bear_settings = load_bear_settings(get_bear_settings_path())[0]['type2']
     full_dict = {}
 
     for small_dict in bear_settings.values():
@@ -176,8 +266,46 @@ def run_quickstartbear(contents, project_dir):
         if 'current_val' in locals() and current_val < default_val:
             contents[settings_key][insert_index][setting_name] = default_val
 
-    return (contents, ignore_ranges, complete_file_dict,
-            complete_filename_list)
+    return (contents, IgnoreRangeIndex(file_ignore_ranges),
+            complete_file_dict, complete_filename_list)
+
+
+@lru_cache(maxsize=None)
+def load_bear_settings(path):
+    """
+    Parses a `bear_settings.yaml` file and indexes the settings by bear.
+    The file is only parsed once per path.
+    :param path:
+        The path of `bear_settings.yaml`.
+    :return:
+        - The contents of the file, with the types of settings as keys
+          and dicts of bear names to settings as values.
+        - A dict with bear names as keys and dicts of setting names to
+          tuples of the type of the setting and its values as values.
+    """
+    contents = get_yaml_contents(path)
+    table = {}
+    for type_setting, bears in contents.items():
+        for bear_name, settings in (bears or {}).items():
+            bear_table = table.setdefault(bear_name, {})
+            for setting, values in (settings or {}).items():
+                # The first occurence of a setting in the file wins.
+                bear_table.setdefault(setting, (type_setting, values))
+    return contents, table
+
+
+def get_bear_settings_path(dir=None):
+    """
+    :param dir:
+        The directory where to look for `bear_settings.yaml`, defaults
+        to the `green_mode` directory.
+    :return:
+        The absolute path of `bear_settings.yaml`.
+    """
+    __location__ = os.path.realpath(
+        os.path.join(os.getcwd(), os.path.dirname(__file__))) if (
+        dir is None) else dir
+    return os.path.realpath(os.path.join(__location__, 'bear_settings.yaml'))
 
 
 def get_setting_type(setting, bear, dir=None):
@@ -189,7 +317,7 @@ def get_setting_type(setting, bear, dir=None):
     :param setting:
         The setting name.
     :param bear:
-        The bear class to which the setting belongs.
+        The bear class to which the setting belongs, or its name.
     :param dir:
         The directory where to look for `bear_settings.yaml`, defaults
         to the `green_mode` directory.
@@ -200,17 +328,9 @@ def get_setting_type(setting, bear, dir=None):
           the project or the default value in case of unguessable
           settings.
     """
-    __location__ = os.path.realpath(
-        os.path.join(os.getcwd(), os.path.dirname(__file__))) if (
-        dir is None) else dir
-    bear_settings = get_yaml_contents(os.path.join(
-        __location__, 'bear_settings.yaml'))
-    for type_setting in bear_settings:
-        for bear_names in bear_settings[type_setting]:
-            if bear_names in str(bear):
-                if setting in bear_settings[type_setting][bear_names]:
-                    return (type_setting,
-                            bear_settings[type_setting][bear_names][setting])
+    _, table = load_bear_settings(get_bear_settings_path(dir))
+    bear_name = bear if isinstance(bear, str) else bear.__name__
+    return table.get(bear_name, {}).get(setting)
 
 
 def get_kwargs(settings, bear, contents, dir=None):
@@ -259,115 +379,284 @@ def get_kwargs(settings, bear, contents, dir=None):
 
 
 def check_bear_results(ret_val, ignore_ranges):
+    """
+    Checks whether the results of a bear are all ignored, i.e. whether the
+    bear is green.
+    :param ret_val:
+        The list of results yielded by the bear.
+    :param ignore_ranges:
+        An IgnoreRangeIndex, or a collection of tuples of bears and
+        SourceRange objects as yielded by `yield_ignore_ranges`.
+    :return:
+        True if every code range affected by each of the results lies
+        inside an ignore range, False otherwise.
+    """
     if len(ret_val) == 0:
         return True
     elif len(ignore_ranges) == 0:
         return False
-    # Check whether all the results lie in an ignore_ranges object
-    for result in ret_val:
-        for ignores in ignore_ranges:
-            for range_object in result.affected_code:
-                if not contained_in(range_object, ignores[1]):
-                    return False
-    return True
+    if not isinstance(ignore_ranges, IgnoreRangeIndex):
+        ignore_ranges = IgnoreRangeIndex(ignore_ranges)
+    return all(ignore_ranges.is_ignored(result) for result in ret_val)
 
 
-def local_bear_test(bear, file_dict, file_names, lang, kwargs,
-                    ignore_ranges):
-    lang_files = split_by_language(file_names)
-    lang_files = {k.lower(): v for k, v in lang_files.items()}
+def run_dependency_trial(dep, filename, setting_names, values):
+    """
+    Runs a dependency of a local bear on a file. The contents of the file
+    and the ignore ranges are taken from the data shared by the
+    ``TrialExecutor``.
+    :param dep:
+        The dependency bear class.
+    :param filename:
+        The name of the file to run the bear on.
+    :param setting_names:
+        The names of the settings of the dependency.
+    :param values:
+        The values to the settings in the same order as `setting_names`.
+    :return:
+        True if the dependency produces no results outside of the ignore
+        ranges, False otherwise.
+    """
+    shared_data = get_shared_data()
+    arguments = dict(zip(setting_names, values))
+    arguments['filename'] = filename
+    arguments['file'] = shared_data['file_dict'][filename]
+    dep_args = get_all_args(dep.run)
+    arguments = {arg_: arguments[arg_] for arg_ in arguments
+                 if arg_ in dep_args}
+
+    section = Section('dep-bear')
+    bear_obj = dep(section, None)
+    ret_val = bear_obj.run(**arguments)
+    ret_val = [] if not ret_val else list(ret_val)
+    return check_bear_results(ret_val, shared_data['ignore_ranges'])
+
+
+def run_local_trial(bear, setting_names, values):
+    """
+    Runs a local bear with one combination of setting values. The
+    contents of the file and the ignore ranges are taken from the data
+    shared by the ``TrialExecutor``.
+    :param bear:
+        The local bear class.
+    :param setting_names:
+        The names of the arguments of the `run` method of the bear,
+        including `filename` but not `file`.
+    :param values:
+        The values to the arguments in the same order as `setting_names`.
+    :return:
+        True if the bear produces no results outside of the ignore ranges,
+        False otherwise.
+    """
+    shared_data = get_shared_data()
+    arguments = dict(zip(setting_names, values))
+    arguments['file'] = shared_data['file_dict'][arguments['filename']]
 
-    import multiprocessing as mp
-    pool = mp.Pool(processes=mp.cpu_count()-1)
+    section = Section('test-section-local-bear')
+    bear_obj = bear(section, None)
+    ret_val = bear_obj.run(**arguments)
+    ret_val = [] if not ret_val else list(ret_val)
+    return check_bear_results(ret_val, shared_data['ignore_ranges'])
 
-    file_results = []
 
-    for file in lang_files[lang.lower()]:
-        kwargs['filename'] = [file]
-        kwargs['file'] = [file_dict[file]]
-
-        results = []
-        values = []
-
-        for vals in itertools.product(*kwargs.values()):
-
-            flag = 0
-            for dep in bear.BEAR_DEPS:
-                section = Section('dep-bear')
-                bear_obj = dep(section, None)
-                arguments = dict(zip(kwargs, vals))
-                dep_args = get_all_args(dep.run)
-                new_arguments = {}
-                for arg_ in arguments.keys():
-                    if arg_ in dep_args.keys():  # pragma: no cover
-                        new_arguments[arg_] = arguments[arg_]
-                arguments = new_arguments
-                ret_val = bear_obj.run(**arguments)
-                ret_val = [] if not ret_val else list(ret_val)
-                dep_res = check_bear_results(ret_val, ignore_ranges)
-                if not dep_res:
-                    flag = 1
-            if flag == 1:
-                continue
+def run_global_trial(bear, setting_names, values):
+    """
+    Runs a global bear with one combination of setting values. The file
+    dict and the ignore ranges are taken from the data shared by the
+    ``TrialExecutor``.
+    :param bear:
+        The global bear class.
+    :param setting_names:
+        The names of the arguments of the `run` method of the bear.
+    :param values:
+        The values to the arguments in the same order as `setting_names`.
+    :return:
+        True if the bear produces no results outside of the ignore ranges,
+        False otherwise.
+    """
+    shared_data = get_shared_data()
+    file_dict = shared_data['file_dict']
+    section = Section('test-section-global-bear')
+    bear_obj = bear(section=section, message_queue=None,
+                    file_dict=file_dict)
+    bear_obj.file_dict = file_dict
+    ret_val = bear_obj.run(**dict(zip(setting_names, values)))
+    ret_val = list(ret_val)
+    return check_bear_results(ret_val, shared_data['ignore_ranges'])
+
+
+def find_dependency_failures(bear, files, setting_names, combinations,
+                             executor, dependency_cache=None):
+    """
+    Runs the dependencies of a local bear on the files for the given
+    combinations of setting values. A dependency only receives the
+    settings it takes, so it is run once for each distinct projection of
+    a combination onto its settings, and a failing dependency eliminates
+    every combination with the same projection without running the bear.
+    :param bear:
+        The local bear class.
+    :param files:
+        The names of the files.
+    :param setting_names:
+        The names of the settings of the bear, without `filename` and
+        `file`.
+    :param combinations:
+        A dict of the indices of the combinations of setting values
+        as keys and the combinations as values.
+    :param executor:
+        The ``TrialExecutor`` running the dependencies.
+    :param dependency_cache:
+        The ``DependencyCache`` with the results of the dependencies run
+        before. Only the runs missing from it are done.
+    :return:
+        A set of tuples of the file name and the index of the combination
+        for which a dependency is not green.
+    """
+    if dependency_cache is None:
+        dependency_cache = DependencyCache()
+
+    projections = []
+    for dep in bear.BEAR_DEPS:
+        dep_args = get_all_args(dep.run)
+        positions = [index for index, name in enumerate(setting_names)
+                     if name in dep_args]
+        projections.append((dep, tuple(setting_names[index]
+                                       for index in positions), positions))
+
+    keys = {}
+    trials = {}
+    for file in files:
+        for dep, dep_names, positions in projections:
+            for combination, vals in combinations.items():
+                dep_vals = tuple(vals[index] for index in positions)
+                key = DependencyCache.get_key(dep, file, dep_names, dep_vals)
+                keys[file, combination, dep] = key
+                if not dependency_cache.lookup(key):
+                    dependency_cache.reserve(key)
+                    trials[key] = (dep, file, dep_names, dep_vals)
+
+    trial_keys = list(trials)
+    results = executor.map(run_dependency_trial,
+                           [trials[key] for key in trial_keys])
+    for key, result in zip(trial_keys, results):
+        dependency_cache.add(key, result is True)
+
+    return {(file, combination)
+            for (file, combination, _), key in keys.items()
+            if not dependency_cache[key]}
 
-            print_val = dict(zip(kwargs, vals))
-            print_val.pop('file', None)
-            values.append(vals)
-            section = Section('test-section-local-bear')
-            bear_obj = bear(section, None)
-            ret_val = bear_obj.run(**dict(zip(kwargs, vals)))
-            ret_val = [] if not ret_val else list(ret_val)
-            # FIXME: Multiprocessing not working on windows.
-            if os.name == 'nt':  # pragma posix: no cover
-                results.append(check_bear_results(ret_val, ignore_ranges))
-            else:  # pragma nt: no cover
-                results.append(pool.apply(check_bear_results,
-                                          args=(ret_val, ignore_ranges)))
-
-        for index, result in enumerate(results):
+
+def local_bear_test(bear, file_dict, file_names, lang, kwargs,
+                    ignore_ranges, executor=None, min_coverage=0,
+                    dependency_cache=None, classifier=None):
+    """
+    Finds the combinations of setting values for which a local bear is
+    green on each of the files of a language.
+
+    The files are processed in rounds. After each round the combinations
+    which can no longer be green on `min_coverage` of the files are not
+    run on the remaining files and are left out of the results.
+    :param min_coverage:
+        The minimum fraction of the files of the language a combination
+        of setting values has to be green on.
+    :param dependency_cache:
+        The ``DependencyCache`` shared by the bears of a green mode run.
+    :param classifier:
+        The ``LanguageClassifier`` shared by the bears of a green mode run.
+    :return:
+        A dict with the bear as key and a list of the green combinations
+        of setting values, including the file name, as value.
+    """
+    lang_files = split_by_language(file_names, classifier)
+    lang_files = {k.lower(): v for k, v in lang_files.items()}
+    files = list(lang_files[lang.lower()])
+
+    if executor is None:
+        executor = TrialExecutor(jobs=1)
+    executor.share(file_dict=file_dict, ignore_ranges=ignore_ranges)
+
+    # Only the file names are sent along with the trials, the workers
+    # look up the contents in the shared file_dict.
+    file_kwargs = dict(kwargs)
+    file_kwargs.pop('file', None)
+    file_kwargs.pop('filename', None)
+    setting_names = tuple(file_kwargs)
+    combinations = list(itertools.product(*file_kwargs.values()))
+
+    # The number of files a combination can fail on and still reach the
+    # coverage.
+    max_failures = len(files) - math.ceil(min_coverage * len(files))
+    failures = [0] * len(combinations)
+    green = set()
+    round_size = executor.jobs * 4 if min_coverage > 0 else len(files)
+
+    for start in range(0, len(files), max(round_size, 1)):
+        round_files = files[start:start + round_size]
+        alive = {index: vals for index, vals in enumerate(combinations)
+                 if failures[index] <= max_failures}
+        # The combinations which can no longer reach the coverage are not
+        # run on the files of this round.
+        executor.skip((len(combinations) - len(alive)) * len(round_files))
+        dep_failures = find_dependency_failures(
+            bear, round_files, setting_names, alive, executor,
+            dependency_cache)
+
+        trials = []
+        for file in round_files:
+            for index, vals in alive.items():
+                if (file, index) in dep_failures:
+                    failures[index] += 1
+                    executor.skip(1)
+                else:
+                    trials.append((file, index))
+
+        results = executor.map(
+            run_local_trial,
+            [(bear, setting_names + ('filename',),
+              combinations[index] + (file,))
+             for file, index in trials])
+        for (file, index), result in zip(trials, results):
             if result is True:
+                green.add((file, index))
+            else:
+                failures[index] += 1
+
+    file_results = []
+    for file in files:
+        for index, vals in enumerate(combinations):
+            if (file, index) in green and failures[index] <= max_failures:
                 # A set of bear setting values is found to be green
                 # for a particular file
-                arguments = dict(zip(kwargs, values[index]))
-                arguments.pop('file')
+                arguments = dict(zip(setting_names, vals))
+                arguments['filename'] = file
                 file_results.append(arguments)
 
     return {bear: file_results}
 
 
-def global_bear_test(bear, file_dict, kwargs, ignore_ranges):
-    import multiprocessing as mp
-    pool = mp.Pool(processes=mp.cpu_count()-1)
+def global_bear_test(bear, file_dict, kwargs, ignore_ranges, executor=None):
+    if executor is None:
+        executor = TrialExecutor(jobs=1)
+    executor.share(file_dict=file_dict, ignore_ranges=ignore_ranges)
 
-    results = []
-    values = []
-    file_results = []
+    setting_names = tuple(kwargs)
+    trials = [(bear, setting_names, vals)
+              for vals in itertools.product(*kwargs.values())]
 
-    for vals in itertools.product(*kwargs.values()):
-        values.append(vals)
-        section = Section('test-section-global-bear')
-        bear_obj = bear(section=section, message_queue=None,
-                        file_dict=file_dict)
-        bear_obj.file_dict = file_dict
-        ret_val = bear_obj.run(**dict(zip(kwargs, vals)))
-        ret_val = list(ret_val)
-        if os.name == 'nt':  # pragma posix: no cover
-            results.append(check_bear_results(ret_val, ignore_ranges))
-        else:  # pragma nt: no cover
-            results.append(pool.apply(check_bear_results,
-                                      args=(ret_val, ignore_ranges)))
-
-    for index, result in enumerate(results):
+    file_results = []
+    for (_, _, vals), result in zip(
+            trials, executor.map(run_global_trial, trials)):
         if result is True:
             # A set of bear setting values is found to be green for this bear
-            arguments = dict(zip(kwargs, values[index]))
-            file_results.append(arguments)
+            file_results.append(dict(zip(setting_names, vals)))
 
     return {bear: file_results}
 
 
 def run_test_on_each_bear(bear, file_dict, file_names, lang, kwargs,
-                          ignore_ranges, type_of_setting, printer=None):
+                          ignore_ranges, type_of_setting, printer=None,
+                          executor=None, min_coverage=0,
+                          dependency_cache=None, classifier=None):
     if type_of_setting == 'non-op':
         printer.print('Finding suitable values to necessary '
                       'settings for ' + bear.__name__ +
@@ -380,16 +669,18 @@ def run_test_on_each_bear(bear, file_dict, file_names, lang, kwargs,
                       )
     if issubclass(bear, GlobalBear):
         file_results = global_bear_test(bear, file_dict, kwargs,
-                                        ignore_ranges)
+                                        ignore_ranges, executor)
     else:
         file_results = local_bear_test(
-            bear, file_dict, file_names, lang, kwargs, ignore_ranges)
+            bear, file_dict, file_names, lang, kwargs, ignore_ranges,
+            executor, min_coverage, dependency_cache, classifier)
     return file_results
 
 
 def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
                   contents, file_names, op_args_limit, value_to_op_args_limit,
-                  printer=None):
+                  printer=None, executor=None, min_coverage=0,
+                  classifier=None):
     """
     Tests the bears with the generated file dict and list of files
     along with the values recieved for each and every type of setting
@@ -406,7 +697,8 @@ def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
         A dict of file names as keys and file contents as values to those
         keys.
     :param ignore_ranges:
-        Collection of SourceRange objects.
+        The IgnoreRangeIndex of the project, or the tuples of bears and
+        SourceRange objects to build it from.
     :param contents:
         The python object to be written to 'PROJECT_DATA' which
         contains the file and directory structure of the project and values
@@ -419,6 +711,17 @@ def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
     :param value_to_op_args_limit:
         The maximum number of values to run the bear again and again for
         a optioanl setting.
+    :param executor:
+        The ``TrialExecutor`` running the trials of the bears. A new one
+        with the default number of jobs is used and shut down afterwards
+        if none is given.
+    :param min_coverage:
+        The minimum fraction of the files of a language a combination of
+        setting values has to be green on for a local bear. Combinations
+        are dropped as soon as they can no longer reach it.
+    :param classifier:
+        The ``LanguageClassifier`` of the run, a new one is used if not
+        given.
     :return:
         Two Result data structures, one when the bears are run only with
         non-optional settings and the other including the optional settings.
@@ -427,6 +730,21 @@ def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
         arguments. The file name can be deduced from the arguments itself.
         The file contents have been chopped off from the arguments.
     """
+    if executor is None:
+        with TrialExecutor() as executor:
+            return bear_test_fun(
+                bears, bear_settings_obj, file_dict, ignore_ranges,
+                contents, file_names, op_args_limit, value_to_op_args_limit,
+                printer, executor, min_coverage, classifier)
+
+    if not isinstance(ignore_ranges, IgnoreRangeIndex):
+        ignore_ranges = IgnoreRangeIndex(ignore_ranges)
+
+    # The file_dict and the ignore ranges are the same for all the bears,
+    # so are the results of their dependencies.
+    dependency_cache = DependencyCache()
+    if classifier is None:
+        classifier = LanguageClassifier()
     final_non_op_results = []
     final_unified_results = []
     for lang in bears:
@@ -440,7 +758,8 @@ def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
             op_kwargs = get_kwargs(op_set, bear, contents)
             non_op_file_results = run_test_on_each_bear(
                 bear, file_dict, file_names, lang, non_op_kwargs,
-                ignore_ranges, 'non-op', printer)
+                ignore_ranges, 'non-op', printer, executor, min_coverage,
+                dependency_cache, classifier)
             if len(op_kwargs) < op_args_limit and not(
                     True in [len(value) > value_to_op_args_limit
                              for key, value in op_kwargs.items()]):
@@ -449,12 +768,23 @@ def bear_test_fun(bears, bear_settings_obj, file_dict, ignore_ranges,
                 unified_file_results = run_test_on_each_bear(
                     bear, file_dict, file_names, lang,
                     unified_kwargs, ignore_ranges, 'unified',
-                    printer)
+                    printer, executor, min_coverage, dependency_cache,
+                    classifier)
             else:
                 unified_file_results = None
             final_non_op_results.append(non_op_file_results)
             final_unified_results.append(unified_file_results)
 
+    if executor.trials_skipped:
+        printer.print('Skipped {} of {} bear runs which could not find '
+                      'green values.'.format(
+                          executor.trials_skipped,
+                          executor.trials_skipped + executor.trials_run))
+    if dependency_cache.hits:
+        printer.print('Reused {} of {} results of dependency bears.'.format(
+            dependency_cache.hits,
+            dependency_cache.hits + dependency_cache.misses))
+
     return final_non_op_results, final_unified_results
 
 
@@ -555,7 +885,8 @@ def write_sections(self, sections):
 
 
 def generate_green_mode_sections(data, project_dir, project_files,
-                                 ignore_globs, printer=None, suffix=''):
+                                 ignore_globs, printer=None, suffix='',
+                                 project_index=None, classifier=None):
     """
     Generates the section objects for the green_mode.
     :param data:
@@ -571,10 +902,20 @@ def generate_green_mode_sections(data, project_dir, project_files,
         The ConsolePrinter object.
     :param suffix:
         A suffix that can be added to the `.coafile.green`.
+    :param project_index:
+        The ``ProjectIndex`` of the project, the project directory is
+        scanned if not given.
+    :param classifier:
+        The ``LanguageClassifier`` of the run, a new one is used if not
+        given.
     """
+    if project_index is None:
+        project_index = scan_project(project_dir)
+    if classifier is None:
+        classifier = LanguageClassifier()
     all_sections = {'all': [], }
-    lang_files = split_by_language(project_files)
-    extset = get_extensions(project_files)
+    lang_files = split_by_language(project_files, classifier)
+    extset = get_extensions(project_files, classifier)
     ignored_files = generate_ignore_field(project_dir, lang_files.keys(),
                                           extset, ignore_globs)
     if ignored_files:
@@ -595,7 +936,7 @@ def generate_green_mode_sections(data, project_dir, project_files,
                     if key_ == 'filename':
                         file_list_sec = dict_[key_]
                         file_list_sec, ignore_list = aggregate_files(
-                            file_list_sec, project_dir)
+                            file_list_sec, project_dir, project_index)
                         dict_[key_] = file_list_sec
                         section['ignore'] = ', '.join(
                             escape(x, '\\') for x in ignore_list)
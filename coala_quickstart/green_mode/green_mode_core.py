@@ -1,8 +1,7 @@
 import os
 
 from coala_quickstart.generation.Utilities import (
-    get_yaml_contents,
-    dump_yaml_to_file,
+    LanguageClassifier,
     )
 from coala_quickstart.green_mode.green_mode import (
     bear_test_fun,
@@ -14,24 +13,31 @@ from coala_quickstart.green_mode.green_mode import (
 from coala_quickstart.green_mode.filename_operations import (
     check_filename_prefix_postfix,
     )
-
-PROJECT_DATA = '.project_data.yaml'
+from coala_quickstart.green_mode.trial_executor import (
+    TrialExecutor,
+    )
+from coala_quickstart.green_mode.project_data import (
+    PROJECT_DATA,
+    dump_project_data,
+    load_file_cache,
+    )
 
 
 def green_mode(project_dir: str, ignore_globs, bears, bear_settings_obj,
                op_args_limit, value_to_op_args_limit, project_files,
-               printer=None):
+               printer=None, project_index=None, jobs=None,
+               min_coverage=0, max_file_dict_size=None, classifier=None):
     """
     Runs the green mode of coala-quickstart.
 
-    Generates '.project_data.yaml' which contains the files and directory
-    structure of the project, runs the QuickstartBear which guesses some values
-    of settings the can take an infinite set of values by parsing the
-    file_dict and appends to `.project_data.yaml`. Runs some further linting
-    options based on file names etc. Calls the methods which test out whether
-    a setting value is green for a bear i.e. does not point out any error in
-    the code base and further generates sections and writes the green config
-    file for the project.
+    Collects the files and directory structure of the project, runs the
+    QuickstartBear which guesses some values of settings the can take an
+    infinite set of values by parsing the file_dict and adds them to the
+    project data, which is persisted to `.project_data.json`. Runs some
+    further linting options based on file names etc. Calls the methods which
+    test out whether a setting value is green for a bear i.e. does not point
+    out any error in the code base and further generates sections and writes
+    the green config file for the project.
     :param project_dir:
         The project directory.
     :param ignore_globs:
@@ -49,37 +55,55 @@ def green_mode(project_dir: str, ignore_globs, bears, bear_settings_obj,
     :param value_to_op_args_limit:
         The maximum number of values to run the bear again and again for
         a optional setting.
+    :param project_index:
+        The ``ProjectIndex`` of the project directory.
+    :param jobs:
+        The number of worker processes used to test the bears, defaults
+        to one less than the number of CPUs.
+    :param min_coverage:
+        The minimum fraction of the files of a language the setting values
+        of a local bear have to be green on. Setting values are not tried
+        on the remaining files once they can't reach it.
+    :param max_file_dict_size:
+        The maximum number of characters of file contents kept in memory
+        by each process, defaults to `lazy_file_dict.DEFAULT_MAX_SIZE`.
+    :param classifier:
+        The ``LanguageClassifier`` of the run, a new one is used if not
+        given.
     """
     from coala_quickstart.green_mode.filename_operations import (
         check_filename_prefix_postfix)
+    if classifier is None:
+        classifier = LanguageClassifier()
     ignore_globs.append(os.path.join(project_dir, '.git', '**'))
     project_data = project_dir + os.sep + PROJECT_DATA
+    ignore_globs.append(project_data)
 
-    # Currently as a temporary measure, recreating the file at each run from
-    # scratch, as there is no mechanism created uptil now to reuse this data.
-    if os.path.isfile(project_data):
-        os.remove(project_data)
+    # Reuse the stat signatures and QuickstartBear results of the previous
+    # run, so that only the files changed since are analysed again.
+    file_cache = load_file_cache(project_data)
 
-    if not os.path.isfile(project_data):
-        new_data = initialize_project_data(project_dir + os.sep, ignore_globs)
-        data_to_dump = {'dir_structure': new_data}
-        dump_yaml_to_file(project_data, data_to_dump)
+    new_data = initialize_project_data(project_dir + os.sep, ignore_globs,
+                                       project_index)
+    project_data_contents = {'dir_structure': new_data}
 
     # Operations before the running of QuickstartBear are done over here.
     # Eg. do operations on filenames over here.
-    project_data_contents = get_yaml_contents(project_data)
     project_data_contents = check_filename_prefix_postfix(
         project_data_contents)
 
     # Run QuickstartBear
     (project_data_contents, ignore_ranges, file_dict,
      file_names) = run_quickstartbear(
-        project_data_contents, project_dir)
+        project_data_contents, project_dir, file_cache, project_index,
+        max_file_dict_size)
 
-    final_non_op_results, final_unified_results = bear_test_fun(
-        bears, bear_settings_obj, file_dict,
-        ignore_ranges, project_data_contents, file_names,
-        op_args_limit, value_to_op_args_limit, printer)
+    with TrialExecutor(jobs) as executor:
+        final_non_op_results, final_unified_results = bear_test_fun(
+            bears, bear_settings_obj, file_dict,
+            ignore_ranges, project_data_contents, file_names,
+            op_args_limit, value_to_op_args_limit, printer, executor,
+            min_coverage, classifier)
 
     # Call to create `.coafile` goes over here.
     settings_non_op = generate_data_struct_for_sections(
@@ -95,11 +119,8 @@ def green_mode(project_dir: str, ignore_globs, bears, bear_settings_obj,
             settings_unified[bear] = settings_non_op[bear]
 
     generate_green_mode_sections(
-        settings_unified, project_dir, project_files, ignore_globs, printer)
-
-    # Final Dump.
-    dump_yaml_to_file(project_data, project_data_contents)
+        settings_unified, project_dir, project_files, ignore_globs, printer,
+        project_index=project_index, classifier=classifier)
 
-    # Delete .project_data.yaml for now as there is currently no mechanism
-    # added to reuse this data.
-    os.remove(project_data)
+    # Final Dump, kept around to be reused by the next run.
+    dump_project_data(project_data, project_data_contents, file_cache)
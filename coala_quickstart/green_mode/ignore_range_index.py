@@ -0,0 +1,88 @@
+from bisect import bisect_right
+from collections import defaultdict
+
+
+def _get_bounds(source_range):
+    """
+    :return:
+        The start and the end of a SourceRange as (line, column) tuples,
+        or None if any of them is unknown.
+    """
+    bounds = ((source_range.start.line, source_range.start.column),
+              (source_range.end.line, source_range.end.column))
+    if None in bounds[0] or None in bounds[1]:
+        return None
+    return bounds
+
+
+class IgnoreRangeIndex:
+    """
+    The ignore ranges of a project indexed by file, so that checking
+    whether a SourceRange lies inside one of them only looks at the ranges
+    of its own file, with a binary search.
+    """
+
+    def __init__(self, ignore_ranges=()):
+        """
+        :param ignore_ranges:
+            An iterable of tuples of the bears to ignore and the
+            SourceRange to ignore them in, as yielded by
+            ``coalib.processes.Processing.yield_ignore_ranges``.
+        """
+        ranges = defaultdict(list)
+        self._count = 0
+        for _, source_range in ignore_ranges:
+            self._count += 1
+            bounds = _get_bounds(source_range)
+            # Ranges with unknown bounds can't contain anything.
+            if bounds is not None:
+                ranges[source_range.start.file].append(bounds)
+
+        # For each file the starts of the ranges in ascending order, and
+        # the furthest end among the ranges up to and including each one.
+        self._starts = {}
+        self._max_ends = {}
+        for filename, bounds in ranges.items():
+            bounds.sort()
+            self._starts[filename] = [start for start, _ in bounds]
+            max_ends = []
+            for _, end in bounds:
+                max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+            self._max_ends[filename] = max_ends
+
+    def __len__(self):
+        return self._count
+
+    def contains(self, source_range):
+        """
+        Checks whether a SourceRange lies inside one of the ignore ranges.
+
+        :param source_range:
+            The SourceRange to check.
+        :return:
+            True if one of the ignore ranges of the file contains the
+            complete SourceRange, False otherwise.
+        """
+        bounds = _get_bounds(source_range)
+        starts = self._starts.get(source_range.start.file)
+        if bounds is None or starts is None:
+            return False
+        start, end = bounds
+        # Only the ranges starting before the SourceRange can contain it,
+        # and one of them does if the furthest end among them is after it.
+        index = bisect_right(starts, start)
+        return index > 0 and self._max_ends[
+            source_range.start.file][index - 1] >= end
+
+    def is_ignored(self, result):
+        """
+        :param result:
+            A result yielded by a bear.
+        :return:
+            True if every code range affected by the result lies inside an
+            ignore range, False otherwise or if the result doesn't affect
+            any code.
+        """
+        affected_code = getattr(result, 'affected_code', ())
+        return bool(affected_code) and all(
+            self.contains(source_range) for source_range in affected_code)
@@ -0,0 +1,82 @@
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from coala_utils.FileUtils import detect_encoding
+
+# The default maximum number of characters of file contents kept in memory
+# by each process.
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+class LazyFileDict(Mapping):
+    """
+    A file dict, i.e. a mapping of file names to tuples of the lines of the
+    files, which only reads a file when its contents are accessed. The
+    contents of the most recently used files are kept in memory up to a
+    maximum size, the least recently used ones are dropped and read again
+    when needed.
+
+    Like ``get_file_dict`` with ``allow_raw_files`` set, the contents of
+    files which can't be decoded are None. Files which can't be read at
+    all are treated the same way, as they are only accessed after the
+    dict is built.
+    """
+
+    def __init__(self, filenames, max_size=DEFAULT_MAX_SIZE):
+        """
+        :param filenames:
+            The names of the files. Names which aren't files are left out.
+        :param max_size:
+            The maximum number of characters of file contents kept in
+            memory. The contents of a single file are always kept, no
+            matter its size.
+        """
+        self._filenames = [filename for filename in OrderedDict.fromkeys(
+            filenames) if os.path.isfile(filename)]
+        self._filename_set = set(self._filenames)
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._size = 0
+
+    def __getitem__(self, filename):
+        if filename not in self._filename_set:
+            raise KeyError(filename)
+        if filename in self._cache:
+            self._cache.move_to_end(filename)
+            return self._cache[filename][0]
+
+        contents = self._read(filename)
+        size = 0 if contents is None else sum(map(len, contents))
+        self._cache[filename] = (contents, size)
+        self._size += size
+        while self._size > self.max_size and len(self._cache) > 1:
+            _, (_, dropped_size) = self._cache.popitem(last=False)
+            self._size -= dropped_size
+        return contents
+
+    @staticmethod
+    def _read(filename):
+        try:
+            with open(filename, 'r',
+                      encoding=detect_encoding(filename)) as _file:
+                return tuple(_file.readlines())
+        except (UnicodeDecodeError, OSError):
+            return None
+
+    def __iter__(self):
+        return iter(self._filenames)
+
+    def __len__(self):
+        return len(self._filenames)
+
+    def __contains__(self, filename):
+        return filename in self._filename_set
+
+    def __getstate__(self):
+        # The contents are read again by the receiving process instead of
+        # being sent along.
+        state = dict(self.__dict__)
+        state['_cache'] = OrderedDict()
+        state['_size'] = 0
+        return state
@@ -0,0 +1,90 @@
+import json
+import os
+
+PROJECT_DATA = '.project_data.json'
+
+# Bump this whenever the layout of PROJECT_DATA or the values computed by
+# the QuickstartBear change, so that stale caches are discarded.
+PROJECT_DATA_VERSION = 3
+
+file_cache_key = 'file_cache'
+
+
+def get_file_signature(filename, project_index=None):
+    """
+    Generates the stat signature of a file, which changes whenever the
+    file is modified or replaced.
+    :param filename:
+        The complete path of the file.
+    :param project_index:
+        The ``ProjectIndex`` of the project. The file is only stat'ed
+        when it is not present in the index.
+    :return:
+        A list of the size, modification time and inode of the file.
+    """
+    entry = None if project_index is None else (
+        project_index.files.get(filename))
+    if entry is None:
+        stat = os.stat(filename)
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+    return [entry.size, entry.mtime, entry.inode]
+
+
+def load_project_data(project_data):
+    """
+    Reads the contents of PROJECT_DATA persisted by a previous run of
+    green mode.
+    :param project_data:
+        The path of PROJECT_DATA.
+    :return:
+        The python object stored in PROJECT_DATA, or None if the file is
+        missing, unreadable or was written with a different
+        PROJECT_DATA_VERSION.
+    """
+    try:
+        with open(project_data, 'r') as stream:
+            contents = json.load(stream)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(contents, dict) or (
+            contents.get('version') != PROJECT_DATA_VERSION):
+        return None
+    return contents
+
+
+def load_file_cache(project_data):
+    """
+    Loads the per-file cache persisted to PROJECT_DATA by a previous run
+    of green mode.
+    :param project_data:
+        The path of PROJECT_DATA.
+    :return:
+        A dict with file names as keys and dicts holding the stat
+        signature and the QuickstartBear results of the file as values.
+        The dict is empty if there is no usable cache.
+    """
+    contents = load_project_data(project_data)
+    if contents is None:
+        return {}
+    return contents.get(file_cache_key) or {}
+
+
+def dump_project_data(project_data, contents, file_cache):
+    """
+    Persists the contents of PROJECT_DATA along with the per-file cache
+    to be reused by the next run of green mode. The data is only ever
+    serialized here, the stages of green mode pass it around in memory.
+    :param project_data:
+        The path of PROJECT_DATA.
+    :param contents:
+        The python object containing the file and directory structure
+        of the project and the values of settings guessed by green mode.
+    :param file_cache:
+        The per-file cache as returned by ``load_file_cache()`` and
+        updated by ``run_quickstartbear()``.
+    """
+    data_to_dump = dict(contents)
+    data_to_dump['version'] = PROJECT_DATA_VERSION
+    data_to_dump[file_cache_key] = file_cache
+    with open(project_data, 'w') as outfile:
+        json.dump(data_to_dump, outfile, separators=(',', ':'))
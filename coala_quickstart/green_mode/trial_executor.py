@@ -0,0 +1,173 @@
+import multiprocessing as mp
+import os
+
+
+# The data shared with the trials run by this process, see
+# ``TrialExecutor.share()``.
+_shared_data = {}
+
+
+def get_shared_data():
+    """
+    :return:
+        A dict with the data shared by ``TrialExecutor.share()`` with the
+        trials run by the current process.
+    """
+    return _shared_data
+
+
+def _set_shared_data(data):
+    global _shared_data
+    _shared_data = data
+
+
+def get_default_jobs():
+    """
+    :return:
+        The default number of worker processes, which leaves one CPU for
+        the main process but never goes below a single job.
+    """
+    return max(mp.cpu_count() - 1, 1)
+
+
+def _run_indexed(task):
+    index, func, args = task
+    return index, func(*args)
+
+
+class TrialExecutor:
+    """
+    Runs the trials of green mode, i.e. the runs of a bear with one
+    combination of setting values, on a pool of worker processes which
+    is shared by all the bears tested in a green mode run.
+
+    The pool is only started when the first trials are submitted and has
+    to be shut down with ``close()``, or by using the executor as a
+    context manager. Data needed by all the trials, like the contents of
+    the files, is sent to every worker process once when it starts
+    instead of along with each trial.
+    """
+
+    def __init__(self, jobs=None):
+        """
+        :param jobs:
+            The number of worker processes, defaults to
+            ``get_default_jobs()``. With a single job the trials are run
+            in the calling process.
+        """
+        self.jobs = get_default_jobs() if jobs is None else max(jobs, 1)
+        self._pool = None
+        self._shared_data = {}
+        # The number of trials run through ``map()`` and the number of
+        # trials recorded with ``skip()``.
+        self.trials_run = 0
+        self.trials_skipped = 0
+
+    @property
+    def parallel(self):
+        # FIXME: Multiprocessing not working on windows.
+        return self.jobs > 1 and os.name != 'nt'
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = mp.Pool(processes=self.jobs,
+                                 initializer=_set_shared_data,
+                                 initargs=(self._shared_data,))
+        return self._pool
+
+    def share(self, **data):
+        """
+        Makes data available to the trials through ``get_shared_data()``.
+        Running worker processes are replaced if the data is not the same
+        as the data shared before.
+
+        :param data:
+            The objects to share, by the key they are retrieved with.
+        """
+        if data.keys() == self._shared_data.keys() and all(
+                self._shared_data[key] is value
+                for key, value in data.items()):
+            return
+        self.close()
+        self._shared_data = data
+
+    def imap_unordered(self, func, trials, chunksize=1):
+        """
+        Runs ``func`` for each of the trials, concurrently if the executor
+        has more than one job.
+
+        :param func:
+            A module level function, so that it can be sent to the worker
+            processes.
+        :param trials:
+            An iterable of tuples with the positional arguments of
+            ``func`` for each trial.
+        :param chunksize:
+            The number of trials sent to a worker process at once.
+        :return:
+            An iterator yielding tuples of the index of the trial in
+            ``trials`` and the value returned by ``func`` for it, in the
+            order the trials finish.
+        """
+        tasks = ((index, func, args) for index, args in enumerate(trials))
+        if not self.parallel:
+            _set_shared_data(self._shared_data)
+            return map(_run_indexed, tasks)
+        return self._get_pool().imap_unordered(_run_indexed, tasks,
+                                               chunksize)
+
+    def map(self, func, trials, chunksize=None):
+        """
+        Same as ``imap_unordered()``, but waits for all the trials to
+        finish.
+
+        :param chunksize:
+            The number of trials sent to a worker process at once, by
+            default the trials are split into four chunks per job.
+        :return:
+            A list of the values returned by ``func``, in the order of
+            ``trials``.
+        """
+        trials = list(trials)
+        self.trials_run += len(trials)
+        if chunksize is None:
+            chunksize = max(len(trials) // (self.jobs * 4), 1)
+        results = dict(self.imap_unordered(func, trials, chunksize))
+        return [results[index] for index in range(len(results))]
+
+    def skip(self, count):
+        """
+        Records trials which were found to be unnecessary and not run.
+
+        :param count:
+            The number of skipped trials.
+        """
+        self.trials_skipped += count
+
+    def close(self):
+        """
+        Waits for the submitted trials and shuts down the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def terminate(self):
+        """
+        Shuts down the worker processes without waiting for the submitted
+        trials.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
@@ -1,6 +1,6 @@
 import os
 
-from coalib.parsing.Globbing import glob, fnmatch
+from coalib.parsing.Globbing import glob, glob_escape, fnmatch
 from coala_quickstart.info_extraction.Info import Info
 
 
@@ -16,14 +16,19 @@ class InfoExtractor:
 
     def __init__(self,
                  target_globs,
-                 project_directory):
+                 project_directory,
+                 project_index=None):
         """
         :param target_globs:      list of file globs to extract information
                                   from.
         :param project_directory: Absolute path to project directory in which
                                   the target files will be searched.
+        :param project_index:     The ``ProjectIndex`` of the project
+                                  directory, to search the target files in
+                                  instead of the filesystem.
         """
-        target_files = self.retrieve_files(target_globs, project_directory)
+        target_files = self.retrieve_files(
+            target_globs, project_directory, project_index)
         for fname in target_files:
             if not fnmatch(fname, self.supported_file_globs):
                 raise ValueError('The taraget file {} does not match the '
@@ -97,20 +102,32 @@ class InfoExtractor:
         raise NotImplementedError
 
     @staticmethod
-    def retrieve_files(file_globs, directory):
+    def retrieve_files(file_globs, directory, project_index=None):
         """
         Returns matched filenames acoording to the list of file globs and
         supported files of the extractor.
+
+        :param file_globs:    list of file globs relative to the directory.
+        :param directory:     Absolute path to the directory to search in.
+        :param project_index: The ``ProjectIndex`` of the directory, to look
+                              up the files in instead of globbing the
+                              filesystem.
+        :return:              The paths of the matched files relative to the
+                              directory.
         """
+        directory = os.path.abspath(directory)
+        # The globs are made absolute instead of changing the working
+        # directory, so that extractors can run in parallel threads.
+        absolute_globs = [os.path.join(glob_escape(directory), g)
+                          for g in file_globs]
         matches = []
 
-        cwd = os.getcwd()
-        os.chdir(directory)
-
-        for g in file_globs:
-            matches += glob(g)
-
-        matched_files = [f for f in matches if not os.path.isdir(f)]
-        os.chdir(cwd)
+        if (project_index is not None and
+                project_index.project_dir == directory):
+            for g in absolute_globs:
+                matches += [f for f in project_index.files if fnmatch(f, g)]
+        else:
+            for g in absolute_globs:
+                matches += [f for f in glob(g) if not os.path.isdir(f)]
 
-        return matched_files
+        return [os.path.relpath(f, directory) for f in matches]
@@ -50,3 +50,45 @@ def bear_test_module():
     with unittest.mock.patch('pkg_resources.iter_entry_points',
                              return_value=[EntryPoint()]) as mocked:
         yield
+
+
+def isolate_cache(test_case, module, name, identifier):
+    """
+    Makes a test use its own file in the user data directory of coala for
+    a cache, which is deleted after the test.
+
+    :param test_case:  the ``unittest.TestCase`` running the test.
+    :param module:     the module defining the identifier of the cache.
+    :param name:       the name of the variable holding the identifier.
+    :param identifier: the identifier of the cache file used instead.
+    """
+    from coalib.misc.CachingUtilities import delete_files
+
+    patcher = unittest.mock.patch.object(module, name, identifier)
+    patcher.start()
+    test_case.addCleanup(delete_files, None, [identifier])
+    test_case.addCleanup(patcher.stop)
+
+
+def generate_project_index(project_dir, fnames):
+    """
+    Builds a ``ProjectIndex`` of files which don't have to exist.
+
+    :param project_dir: path to the project directory.
+    :param fnames:      list of the absolute paths of the files of the
+                        project. Their directories are indexed as well.
+    """
+    from coala_quickstart.generation.ProjectIndex import ProjectIndex
+
+    index = ProjectIndex(project_dir)
+    index.add_directory(index.project_dir)
+    for fname in fnames:
+        parent = os.path.dirname(fname)
+        missing = []
+        while parent not in index.dirs and parent != os.path.dirname(parent):
+            missing.append(parent)
+            parent = os.path.dirname(parent)
+        for path in reversed(missing):
+            index.add_directory(path)
+        index.add_file(fname)
+    return index
@@ -0,0 +1,92 @@
+import sys
+import unittest
+from copy import deepcopy
+
+from coala_quickstart.coala_quickstart import _get_arg_parser
+from coala_quickstart.generation import BearMetadata
+from coala_quickstart.generation.BearMetadata import (
+    LazyBear, collect_bears_metadata, get_bear_metadata, get_lazy_bears,
+    import_bears, load_bears)
+from tests.TestUtilities import bear_test_module, isolate_cache
+from tests.test_bears.AllKindsOfSettingsBaseBear import (
+    AllKindsOfSettingsBaseBear)
+from tests.test_bears.AllKindsOfSettingsDependentBear import (
+    AllKindsOfSettingsDependentBear)
+from tests.test_bears.NonOptionalSettingBear import NonOptionalSettingBear
+
+
+class TestBearMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self.arg_parser = _get_arg_parser()
+        self.old_argv = deepcopy(sys.argv)
+        del sys.argv[1:]
+        isolate_cache(self, BearMetadata, 'BEAR_METADATA_CACHE',
+                      'coala_quickstart_test_bear_metadata')
+
+    def tearDown(self):
+        sys.argv = self.old_argv
+
+    def test_get_bear_metadata(self):
+        metadata = get_bear_metadata(NonOptionalSettingBear)
+
+        self.assertEqual(metadata.name, 'NonOptionalSettingBear')
+        self.assertTrue(metadata.file.endswith('NonOptionalSettingBear.py'))
+        self.assertEqual(metadata.languages, ('All',))
+        self.assertEqual(metadata.requirements, (('npm', 'some_linter', '2'),))
+        self.assertEqual(
+            [(name, annotation) for name, _, annotation
+             in metadata.non_optional_settings],
+            [('non_optional_setting', bool), ('another_setting', int)])
+        self.assertEqual(metadata.executable, 'some_linter')
+        # Linter bears check their executable in check_prerequisites().
+        self.assertFalse(metadata.default_prerequisite_check)
+        self.assertTrue(get_bear_metadata(
+            AllKindsOfSettingsBaseBear).default_prerequisite_check)
+
+    def test_collect_bears_metadata(self):
+        with bear_test_module():
+            bears_metadata, bears = collect_bears_metadata(
+                arg_parser=self.arg_parser)
+            names = [metadata.name for metadata in bears_metadata]
+            self.assertIn('SmellCapabilityBear', names)
+            self.assertEqual(sorted(bears), sorted(names))
+
+            # The bears aren't imported again when the metadata is cached.
+            cached_metadata, cached_bears = collect_bears_metadata(
+                arg_parser=self.arg_parser)
+            self.assertEqual(cached_metadata, bears_metadata)
+            self.assertEqual(cached_bears, {})
+
+            smell_metadata = [metadata for metadata in cached_metadata
+                              if metadata.name == 'SmellCapabilityBear']
+            imported = import_bears(smell_metadata)
+            self.assertEqual(list(imported), ['SmellCapabilityBear'])
+            self.assertIs(imported['SmellCapabilityBear'],
+                          bears['SmellCapabilityBear'])
+
+    def test_lazy_bears(self):
+        bears_metadata = [get_bear_metadata(bear) for bear in [
+            AllKindsOfSettingsBaseBear, AllKindsOfSettingsDependentBear,
+            NonOptionalSettingBear]]
+        lazy_bears = get_lazy_bears(bears_metadata, {
+            'NonOptionalSettingBear': NonOptionalSettingBear})
+
+        lazy_bear = lazy_bears['AllKindsOfSettingsDependentBear']
+        self.assertEqual(lazy_bear.__name__, 'AllKindsOfSettingsDependentBear')
+        self.assertEqual(LazyBear.__name__, 'LazyBear')
+        self.assertEqual(lazy_bear.BEAR_DEPS,
+                         {lazy_bears['AllKindsOfSettingsBaseBear']})
+        self.assertEqual(
+            lazy_bear.get_non_optional_settings(),
+            AllKindsOfSettingsDependentBear.get_non_optional_settings())
+        self.assertEqual(lazy_bears['NonOptionalSettingBear'].REQUIREMENTS,
+                         {('npm', 'some_linter', '2')})
+
+        loaded = load_bears({'All': set(lazy_bears.values())})
+        self.assertEqual(
+            {bear.__name__ for bear in loaded['All']},
+            {'AllKindsOfSettingsBaseBear', 'AllKindsOfSettingsDependentBear',
+             'NonOptionalSettingBear'})
+        self.assertIn(NonOptionalSettingBear, loaded['All'])
+        self.assertNotIn(lazy_bear, loaded['All'])
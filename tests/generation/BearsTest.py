@@ -8,7 +8,13 @@ from pyprint.ConsolePrinter import ConsolePrinter
 from coala_utils.ContextManagers import (
     retrieve_stdout, simulate_console_inputs)
 from coala_quickstart.generation.Bears import (
-    filter_relevant_bears, print_relevant_bears)
+    CapabilityIndex,
+    filter_relevant_bears,
+    generate_capabilties_map,
+    get_bears_by_language,
+    print_relevant_bears,
+    remove_bears_with_conflicting_capabilties,
+    )
 from coala_quickstart.coala_quickstart import main
 from coala_quickstart.coala_quickstart import _get_arg_parser
 from coala_quickstart.Constants import (
@@ -16,8 +22,12 @@ from coala_quickstart.Constants import (
     GREEN_MODE_INCOMPATIBLE_BEAR_LIST,
     IMPORTANT_BEAR_LIST,
     )
+from coala_quickstart.generation import BearMetadata, Requirements
+from coala_quickstart.generation.BearMetadata import RequirementMetadata
 from coala_quickstart.generation.InfoCollector import collect_info
-from tests.TestUtilities import bear_test_module, generate_files
+from coalib.bears.Bear import Bear
+from tests.TestUtilities import (
+    bear_test_module, generate_files, isolate_cache)
 
 
 editorconfig = """
@@ -119,6 +129,10 @@ class TestBears(unittest.TestCase):
         self.log_printer = None
         self.old_argv = deepcopy(sys.argv)
         del sys.argv[1:]
+        isolate_cache(self, BearMetadata, 'BEAR_METADATA_CACHE',
+                      'coala_quickstart_test_bear_metadata')
+        isolate_cache(self, Requirements, 'INSTALLED_PACKAGES_CACHE',
+                      'coala_quickstart_test_installed_packages')
 
     def tearDown(self):
         sys.argv = self.old_argv
@@ -322,6 +336,75 @@ class TestBears(unittest.TestCase):
                     res_bears = [b.name for b in res[lang]]
                     self.assertIn(bear, res_bears)
 
+    def test_get_bears_by_language(self):
+        with bear_test_module():
+            res = get_bears_by_language(['JavaScript', 'All'],
+                                        self.log_printer,
+                                        self.arg_parser)
+            js_bears = {bear.name for bear in res['JavaScript']}
+            all_bears = {bear.name for bear in res['All']}
+
+            self.assertIn('SmellCapabilityBear', all_bears)
+            self.assertNotIn('SomeLinterBear', all_bears)
+            self.assertNotIn('TestLocalBear', all_bears)
+            self.assertEqual(js_bears, all_bears | {'SomeLinterBear'})
+
+    def test_remove_bears_with_conflicting_capabilities(self):
+        def make_bear(name, can_detect, can_fix, installed):
+            return type(name, (Bear,), {
+                'name': name,
+                'CAN_DETECT': set(can_detect),
+                'CAN_FIX': set(can_fix),
+                'REQUIREMENTS': {RequirementMetadata(
+                    'pip', 'coala' if installed else 'really_bad_package',
+                    None)},
+            })
+
+        bear_a = make_bear('ABear', ['Smell'], ['Formatting'], False)
+        bear_b = make_bear('BBear', [], ['Formatting'], True)
+        bear_c = make_bear('CBear', ['Smell', 'Syntax'], [], False)
+        bear_d = make_bear('DBear', ['Syntax'], [], False)
+        bears = [bear_d, bear_c, bear_b, bear_a]
+
+        index = CapabilityIndex(bears)
+        self.assertEqual(index.bears, [bear_a, bear_b, bear_c, bear_d])
+        self.assertEqual(index.get_bears(index.fix['Formatting']),
+                         [bear_a, bear_b])
+        self.assertEqual(
+            generate_capabilties_map({'All': bears})['Smell']['All'],
+            {'DETECT': [bear_a, bear_c]})
+        index = CapabilityIndex(bears, {'Syntax'})
+        self.assertEqual(index.detect, {'Syntax': 0b1100})
+        self.assertEqual(index.fix, {})
+
+        # 'Formatting' is the first capability. ABear is the first bear
+        # fixing it and BBear the first installed one.
+        self.assertEqual(
+            remove_bears_with_conflicting_capabilties({'All': bears}),
+            {'All': {bear_a, bear_b}})
+        self.assertEqual(
+            remove_bears_with_conflicting_capabilties(
+                {'All': list(reversed(bears))}),
+            {'All': {bear_a, bear_b}})
+
+        # Only the first bear is selected if none of them is installed.
+        self.assertEqual(
+            remove_bears_with_conflicting_capabilties(
+                {'All': [bear_c, bear_d]}),
+            {'All': {bear_c}})
+
+        # Ties are broken randomly with a seed, the same way every time.
+        results = [remove_bears_with_conflicting_capabilties(
+                       {'All': bears}, seed)['All']
+                   for seed in range(10)]
+        self.assertEqual({frozenset(result) for result in results},
+                         {frozenset({bear_a, bear_b}), frozenset({bear_b})})
+        self.assertEqual(
+            results,
+            [remove_bears_with_conflicting_capabilties(
+                {'All': bears}, seed)['All']
+             for seed in range(10)])
+
     def test_print_relevant_bears(self):
         with retrieve_stdout() as custom_stdout:
             print_relevant_bears(self.printer, filter_relevant_bears(
@@ -5,8 +5,9 @@ from pyprint.ConsolePrinter import ConsolePrinter
 from coala_utils.ContextManagers import (
     simulate_console_inputs, suppress_stdout, retrieve_stdout)
 from coala_utils.FilePathCompleter import FilePathCompleter
-from coala_quickstart.generation.FileGlobs import get_project_files
-from coala_quickstart.generation.Utilities import get_gitignore_glob
+from coala_quickstart.generation.FileGlobs import (
+    get_gitignore_project_files, get_project_files)
+from coala_quickstart.generation.ProjectIndex import scan_project
 from coalib.collecting.Collectors import collect_files
 from coala_quickstart.Strings import GLOB_HELP
 
@@ -116,10 +117,7 @@ __pycache__
         files += [os.path.join("another_folder", ".gitignore")]
         files += [os.path.join("data", "sample", ".gitignore")]
 
-        gitignore_dir_list = [os.getcwd(),
-                              os.path.join(os.getcwd(), "another_folder"),
-                              os.path.join(os.getcwd(), "data", "sample")]
-        globs = list(get_gitignore_glob(os.getcwd(), gitignore_dir_list))
+        _, globs = get_gitignore_project_files(scan_project(os.getcwd()))
         returned_files = collect_files(
             [os.path.join(os.getcwd(), "**")],
             self.log_printer,
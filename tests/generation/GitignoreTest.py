@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from coala_quickstart.generation.Gitignore import (
+    Gitignore,
+    GitignoreMatcher,
+    compile_gitignore_rule,
+    parse_gitignore_pattern,
+    translate_gitignore_rule,
+    )
+from coala_quickstart.generation.ProjectIndex import scan_project
+from coalib.parsing.Globbing import fnmatch
+
+
+class GitignoreTest(unittest.TestCase):
+
+    def test_parse_gitignore_pattern(self):
+        self.assertIsNone(parse_gitignore_pattern('# comment\n'))
+        self.assertIsNone(parse_gitignore_pattern('   \n'))
+        rule = parse_gitignore_pattern('!build/  \n')
+        self.assertEqual(rule.pattern, 'build')
+        self.assertTrue(rule.negated)
+        self.assertTrue(rule.dir_only)
+        self.assertFalse(rule.anchored)
+        rule = parse_gitignore_pattern('/doc/*.txt')
+        self.assertEqual(rule.pattern, 'doc/*.txt')
+        self.assertTrue(rule.anchored)
+        self.assertEqual(parse_gitignore_pattern('\\#file\\ ').pattern,
+                         '#file\\ ')
+
+    def test_match(self):
+        gitignore = Gitignore('/p', ['*.log', '!keep.log', 'build/',
+                                     '/tests', 'doc/**/*.txt', 'a?[!x].c'])
+        self.assertEqual(gitignore.match('a.log'), 0)
+        self.assertEqual(gitignore.match('src/a.log'), 0)
+        self.assertEqual(gitignore.match('src/keep.log'), 1)
+        self.assertEqual(gitignore.match('src/build', True), 2)
+        self.assertIsNone(gitignore.match('src/build'))
+        self.assertEqual(gitignore.match('tests', True), 3)
+        self.assertIsNone(gitignore.match('src/tests', True))
+        self.assertEqual(gitignore.match('doc/a.txt'), 4)
+        self.assertEqual(gitignore.match('doc/x/y/a.txt'), 4)
+        self.assertIsNone(gitignore.match('src/doc/a.txt'))
+        self.assertEqual(gitignore.match('abc.c'), 5)
+        self.assertIsNone(gitignore.match('abx.c'))
+        self.assertIsNone(gitignore.match('ab/.c'))
+
+    def test_translate_gitignore_rule(self):
+        def translate(line):
+            return translate_gitignore_rule(
+                parse_gitignore_pattern(line)).replace(os.sep, '/')
+
+        self.assertEqual(translate('*.log'), '(|**/)*.log(|/**)')
+        self.assertEqual(translate('/build/'), 'build/**')
+        self.assertEqual(translate('a/**/b'), 'a/(|**/)b(|/**)')
+        self.assertEqual(translate('docs/**'), 'docs/**(|/**)')
+        self.assertEqual(translate('f(1)[ab].c'),
+                         '(|**/)f[(]1[)][ab].c(|/**)')
+
+        # The compiled rules match the same paths as the globs.
+        paths = ['a.log', 'x/a.log', 'x/a.log/y', 'build', 'build/',
+                 'x/build/y', 'a/b', 'a/x/y/b', 'docs/z', 'fa.c']
+        for line in ['*.log', '/build/', 'a/**/b', 'docs/**', 'f?.c']:
+            rule = parse_gitignore_pattern(line)
+            glob = translate_gitignore_rule(rule)
+            regex = compile_gitignore_rule(rule)
+            for path in paths:
+                self.assertEqual(
+                    bool(regex.match(path)),
+                    fnmatch(path.replace('/', os.sep), glob),
+                    (line, path))
+
+    def test_matcher(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            files = {'.gitignore':
+                     '*.log\nbuild\n!keep.log\n/root.c\ndist/\n',
+                     'a.log': '', 'keep.log': '', 'root.c': '',
+                     os.path.join('build', 'x.c'): '',
+                     os.path.join('src', 'a.c'): '',
+                     os.path.join('src', 'root.c'): '',
+                     os.path.join('src', 'b.log'): '',
+                     os.path.join('lib', 'c.log'): '',
+                     os.path.join('src', '.gitignore'):
+                         '!b.log\n*.c\na.c\n',
+                     os.path.join('src', 'build', 'y.c'): ''}
+            for name, contents in files.items():
+                path = os.path.join(project_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w') as file:
+                    file.write(contents)
+
+            matcher = GitignoreMatcher(scan_project(project_dir))
+            kept = []
+            for dirpath, dirnames, filenames in matcher.walk():
+                self.assertNotIn('build', dirnames)
+                kept += [os.path.relpath(os.path.join(dirpath, name),
+                                         project_dir) for name in filenames]
+
+            self.assertCountEqual(
+                kept, ['.gitignore', 'keep.log',
+                       os.path.join('src', '.gitignore'),
+                       os.path.join('src', 'b.log')])
+            # keep.log and src/b.log are re-included, so the glob of
+            # '*.log' is only used in lib and a.log gets a glob of its own.
+            # 'dist/' matches nothing and the files 'a.c' matches are
+            # matched by '*.c' as well.
+            self.assertEqual(
+                matcher.get_ignore_globs(),
+                [os.path.join(project_dir, glob.replace('/', os.sep))
+                 for glob in ['a.log', 'lib/(|**/)*.log(|/**)',
+                              '(|**/)build(|/**)', 'root.c(|/**)',
+                              'src/(|**/)*.c(|/**)']])
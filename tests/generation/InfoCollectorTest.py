@@ -1,6 +1,8 @@
 import os
 import unittest
+from unittest.mock import patch
 
+from coala_quickstart.generation import InfoCollector
 from coala_quickstart.generation.InfoCollector import (
     collect_info)
 from tests.TestUtilities import generate_files
@@ -98,3 +100,33 @@ class InfoCollectorTest(unittest.TestCase):
                 isources = [os.path.normcase(i) for i in isources]
                 for info in collected_info[iname]:
                     self.assertIn(info.source, isources)
+
+    def test_collected_info_executors(self):
+
+        files_to_create = ["package.json", ".editorconfig", "Gemfile"]
+        target_file_contents = [package_json, editorconfig, gemfile]
+
+        with generate_files(
+                files_to_create,
+                target_file_contents,
+                self.test_dir) as gen_files:
+
+            timings = {}
+            thread_info = self.uut(self.test_dir, 'thread', timings)
+            process_info = self.uut(self.test_dir, 'process')
+
+            self.assertEqual(set(timings), {'EditorconfigInfoExtractor',
+                                            'PackageJSONInfoExtractor',
+                                            'GemfileInfoExtractor',
+                                            'GruntfileInfoExtractor'})
+            self.assertEqual(list(thread_info), list(process_info))
+            for iname in thread_info:
+                self.assertEqual(
+                    [info.source for info in thread_info[iname]],
+                    [info.source for info in process_info[iname]])
+
+            with self.assertRaisesRegex(ValueError, 'Unknown executor'):
+                self.uut(self.test_dir, 'fiber')
+
+            with patch.object(InfoCollector, 'INFO_EXTRACTORS', []):
+                self.assertEqual(self.uut(self.test_dir), {})
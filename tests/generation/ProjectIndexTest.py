@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from coala_quickstart.generation.ProjectIndex import (
+    ProjectIndex,
+    scan_project,
+    )
+from coala_quickstart.green_mode.project_data import PROJECT_DATA
+from tests.TestUtilities import generate_files
+
+
+class ProjectIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.project_dir = self.tmp_dir.name
+        for directory in ('src', os.path.join('src', 'lib'), '.git'):
+            os.makedirs(os.path.join(self.project_dir, directory))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_scan_project(self):
+        fnames = ['setup.py', os.path.join('src', 'main.c'),
+                  os.path.join('src', 'lib', 'util.h'),
+                  os.path.join('.git', 'HEAD')]
+        with generate_files(fnames, ['abc', '', '', ''], self.project_dir):
+            index = scan_project(self.project_dir)
+
+            self.assertCountEqual(
+                index.files,
+                [os.path.join(self.project_dir, f) for f in fnames[:3]])
+            self.assertCountEqual(
+                index.dirs,
+                [self.project_dir,
+                 os.path.join(self.project_dir, 'src'),
+                 os.path.join(self.project_dir, 'src', 'lib')])
+
+            setup_py = os.path.join(self.project_dir, 'setup.py')
+            entry = index.files[setup_py]
+            self.assertEqual(entry.size, 3)
+            self.assertEqual(entry.ext, '.py')
+            self.assertEqual(entry.mtime, os.stat(setup_py).st_mtime_ns)
+
+            src = index.dirs[os.path.join(self.project_dir, 'src')]
+            self.assertEqual(src.files, ['main.c'])
+            self.assertEqual(src.dirs, ['lib'])
+
+    def test_scan_project_skip_dirs(self):
+        fnames = [os.path.join('.git', 'HEAD')]
+        with generate_files(fnames, [''], self.project_dir):
+            index = scan_project(self.project_dir, skip_dirs=())
+            self.assertIn(os.path.join(self.project_dir, '.git'), index.dirs)
+            self.assertIn(os.path.join(self.project_dir, '.git', 'HEAD'),
+                          index.files)
+
+    def test_scan_project_skip_files(self):
+        fnames = [PROJECT_DATA, os.path.join('src', PROJECT_DATA)]
+        with generate_files(fnames, ['{}', '{}'], self.project_dir):
+            index = scan_project(self.project_dir)
+            self.assertEqual(
+                list(index.files),
+                [os.path.join(self.project_dir, 'src', PROJECT_DATA)])
+
+    def test_walk(self):
+        index = ProjectIndex('project')
+        root = index.project_dir
+        index.add_directory(root)
+        index.add_directory(os.path.join(root, 'a'))
+        index.add_directory(os.path.join(root, 'a', 'b'))
+        index.add_directory(os.path.join(root, 'c'))
+        index.add_file(os.path.join(root, 'x.py'))
+        index.add_file(os.path.join(root, 'a', 'b', 'y.py'))
+
+        self.assertEqual(list(index.walk()),
+                         [(root, ['a', 'c'], ['x.py']),
+                          (os.path.join(root, 'a'), ['b'], []),
+                          (os.path.join(root, 'a', 'b'), [], ['y.py']),
+                          (os.path.join(root, 'c'), [], [])])
+
+        walked = []
+        for dirpath, dirnames, filenames in index.walk():
+            walked.append(dirpath)
+            if 'a' in dirnames:
+                dirnames.remove('a')
+        self.assertEqual(walked, [root, os.path.join(root, 'c')])
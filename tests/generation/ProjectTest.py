@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 from pyprint.ConsolePrinter import ConsolePrinter
@@ -10,6 +12,9 @@ from coala_quickstart.generation.Project import (
     get_used_languages,
     print_used_languages,
     )
+from coala_quickstart.generation.FileGlobs import get_project_files
+from coala_quickstart.green_mode.project_data import (
+    PROJECT_DATA, dump_project_data)
 
 
 class TestPopularLanguages(unittest.TestCase):
@@ -35,6 +40,32 @@ class TestPopularLanguages(unittest.TestCase):
             result = get_used_languages(file_list)
             self.assertEqual(sorted(result), sorted(expected_result))
 
+    def test_get_used_languages_hashbang(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            script = os.path.join(tmp_dir, 'script')
+            with open(script, 'w') as file:
+                file.write('#!/usr/bin/env python3\n')
+            result = get_used_languages([script, '/tmp/file.py'])
+        self.assertEqual(result, [('Python', 100)])
+
+    def test_get_used_languages_project_data(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ('main.py', 'util.py'):
+                with open(os.path.join(tmp_dir, name), 'w'):
+                    pass
+
+            def get_languages():
+                project_files, _ = get_project_files(
+                    None, self.printer, tmp_dir, None, True)
+                return get_used_languages(project_files)
+
+            first_run = get_languages()
+            # Green mode caches its data in the project directory, which
+            # must not count as a project file on the next run.
+            dump_project_data(os.path.join(tmp_dir, PROJECT_DATA), {}, {})
+            self.assertEqual(get_languages(), first_run)
+            self.assertEqual(first_run, [('Python', 100)])
+
     def test_print_used_languages(self):
         with retrieve_stdout() as custom_stdout:
             print_used_languages(self.printer, [('Python', 100)])
@@ -0,0 +1,122 @@
+import unittest
+from unittest.mock import patch
+
+from coala_quickstart.generation import Requirements
+from coala_quickstart.generation.BearMetadata import (
+    get_bear_metadata, get_lazy_bears)
+from coala_quickstart.generation.Requirements import (
+    check_bears_prerequisites, get_installed_packages, list_pip_packages,
+    normalize_package_name, parse_version_pin, version_matches)
+from coalib.bears.LocalBear import LocalBear
+from dependency_management.requirements.GemRequirement import GemRequirement
+from dependency_management.requirements.NpmRequirement import NpmRequirement
+from dependency_management.requirements.PipRequirement import PipRequirement
+from tests.test_bears.NonOptionalSettingBear import NonOptionalSettingBear
+from tests.TestUtilities import isolate_cache
+
+
+def make_bear(name, requirements, check_prerequisites=None):
+    attributes = {'REQUIREMENTS': set(requirements)}
+    if check_prerequisites is not None:
+        attributes['check_prerequisites'] = classmethod(check_prerequisites)
+    return type(name, (LocalBear,), attributes)
+
+
+class TestRequirements(unittest.TestCase):
+
+    def setUp(self):
+        isolate_cache(self, Requirements, 'INSTALLED_PACKAGES_CACHE',
+                      'coala_quickstart_test_installed_packages')
+        self.calls = []
+        self.listers_patch = patch.dict(Requirements.PACKAGE_LISTERS, {
+            'npm': lambda: self.calls.append('npm') or {
+                'some-linter': {'2.3.0'}},
+            'gem': lambda: self.calls.append('gem') or {
+                'rubocop': {'0.47.1', '0.49.0'}},
+        })
+        self.listers_patch.start()
+        Requirements._installed_packages.clear()
+
+    def tearDown(self):
+        self.listers_patch.stop()
+        Requirements._installed_packages.clear()
+
+    def test_normalize_package_name(self):
+        self.assertEqual(normalize_package_name('Some_Package[extra] '),
+                         'some-package')
+
+    def test_list_pip_packages(self):
+        self.assertIn('coala', list_pip_packages())
+
+    def test_version_matches(self):
+        self.assertIsNone(parse_version_pin(''))
+        self.assertIsNone(parse_version_pin('2.0.0-alpha'))
+        self.assertEqual(parse_version_pin('>=1.7.3'), ('>=', (1, 7, 3)))
+
+        cases = [('npm', '2.3.0', '2', True),
+                 ('npm', '3.0.0', '2', False),
+                 ('npm', '1.8.0', '>=1.7.3', True),
+                 ('npm', '1.7.2', '>=1.7.3', False),
+                 ('npm', '2.9.0', '^2.1', True),
+                 ('npm', '3.0.0', '^2.1', False),
+                 ('npm', '1.2.9', '~1.2.3', True),
+                 ('npm', '1.3.0', '~1.2.3', False),
+                 ('pip', '1.2', '1.2.0', True),
+                 ('pip', '1.2.3', '1.2', False),
+                 ('gem', 'unknown', '1', False)]
+        for requirement_type, version, pin, expected in cases:
+            self.assertEqual(
+                version_matches(requirement_type, version,
+                                parse_version_pin(pin)),
+                expected, (requirement_type, version, pin))
+
+    def test_get_installed_packages(self):
+        installed = get_installed_packages(['npm', 'gem'])
+        self.assertEqual(installed['npm'], {'some-linter': {'2.3.0'}})
+        self.assertEqual(sorted(self.calls), ['gem', 'npm'])
+
+        # The packages listed during the run are reused.
+        self.assertEqual(get_installed_packages(['npm']),
+                         {'npm': {'some-linter': {'2.3.0'}}})
+        self.assertEqual(len(self.calls), 2)
+
+        # The packages cached on disk are reused until they expire.
+        Requirements._installed_packages.clear()
+        self.assertEqual(get_installed_packages(['npm']),
+                         {'npm': {'some-linter': {'2.3.0'}}})
+        self.assertEqual(len(self.calls), 2)
+        get_installed_packages(['npm'], ttl=0)
+        self.assertEqual(self.calls[2:], ['npm'])
+
+        # The cache on disk isn't touched if disabled.
+        Requirements._installed_packages.clear()
+        get_installed_packages(['gem'], use_cache=False)
+        self.assertEqual(self.calls[3:], ['gem'])
+
+    def test_check_bears_prerequisites(self):
+        installed_bear = make_bear('InstalledBear', [
+            NpmRequirement('some_linter', '2'), GemRequirement('rubocop'),
+            PipRequirement('coala')])
+        wrong_version_bear = make_bear('WrongVersionBear', [
+            GemRequirement('rubocop', '0.48')])
+        missing_bear = make_bear('MissingBear', [
+            PipRequirement('really_bad_package')])
+        custom_check_bear = make_bear(
+            'CustomCheckBear', [PipRequirement('coala')],
+            lambda cls: 'java is not installed.')
+        unknown_version_bear = make_bear('UnknownVersionBear', [
+            NpmRequirement('some_linter', '2.0.0-alpha')])
+        lazy_linter_bear = get_lazy_bears(
+            [get_bear_metadata(NonOptionalSettingBear)])[
+                'NonOptionalSettingBear']
+
+        # Bears overriding check_prerequisites(), like linter bears, and
+        # bears with versions which can't be compared are left out.
+        self.assertEqual(
+            check_bears_prerequisites([
+                installed_bear, wrong_version_bear, missing_bear,
+                custom_check_bear, unknown_version_bear,
+                NonOptionalSettingBear, lazy_linter_bear]),
+            {installed_bear: True, wrong_version_bear: False,
+             missing_bear: False})
+        self.assertEqual(sorted(self.calls), ['gem', 'npm'])
@@ -1,6 +1,8 @@
 import unittest
+from unittest.mock import patch
 
 from pyprint.ConsolePrinter import ConsolePrinter
+from coala_quickstart.generation import SettingsClass
 from coala_quickstart.generation.SettingsClass import (
     collect_bear_settings, BearSettings, SettingTypes)
 from tests.test_bears.AllKindsOfSettingsDependentBear import (
@@ -14,6 +16,7 @@ from tests.test_bears.LinterBearWithCreateArguments import (
 from tests.test_bears.SomeLinterBear import SomeLinterBear
 from tests.test_bears.LinterBearWithParameters import LinterBearWithParameters
 from tests.test_bears.BearA import BearA
+from tests.TestUtilities import isolate_cache
 
 
 class TestSettingsClass(unittest.TestCase):
@@ -21,6 +24,8 @@ class TestSettingsClass(unittest.TestCase):
     def setUp(self):
         self.printer = ConsolePrinter()
         self.log_printer = None
+        isolate_cache(self, SettingsClass, 'BEAR_SETTINGS_CACHE',
+                      'coala_quickstart_test_bear_settings')
 
     def test_collect_bear_settings(self):
         relevant_bears = {'test':
@@ -181,6 +186,39 @@ class TestSettingsClass(unittest.TestCase):
         self.assertCountEqual(obj.settings_bool, ['someoptionalsetting'])
         self.assertCountEqual(obj.settings_others, ['makman2'])
 
+    def test_collect_bear_settings_cached(self):
+        relevant_bears = {'test':
+                          {AllKindsOfSettingsDependentBear,
+                           AllKindsOfSettingsBaseBear, BearA,
+                           LinterBearWithCreateArguments}}
+
+        bear_settings_obj = collect_bear_settings(relevant_bears)
+
+        with patch('coala_quickstart.generation.SettingsClass.BearSettings'
+                   '.__init__') as mocked:
+            cached_settings_obj = collect_bear_settings(relevant_bears)
+            self.assertFalse(mocked.called)
+
+        self.assertEqual(
+            {obj.bear: obj.get_setting_names() for obj in bear_settings_obj},
+            {obj.bear: obj.get_setting_names()
+             for obj in cached_settings_obj})
+
+        # Without the cache the settings are still parsed once per run.
+        uncached_settings_obj = collect_bear_settings(relevant_bears,
+                                                      use_cache=False)
+        for obj in uncached_settings_obj:
+            self.assertIn(obj, bear_settings_obj)
+
+        # The settings cached by another version of quickstart are parsed
+        # again.
+        with patch('coala_quickstart.generation.SettingsClass.__version__',
+                   'other'), patch(
+                'coala_quickstart.generation.SettingsClass.BearSettings'
+                '.from_setting_names') as mocked:
+            collect_bear_settings(relevant_bears)
+            self.assertFalse(mocked.called)
+
     def test_invalid_trigger(self):
         with self.assertRaises(ValueError, msg='Invalid trigger Type'):
             setting = SettingTypes({'a': bool}, None, None,
@@ -10,8 +10,10 @@ from pyprint.ConsolePrinter import ConsolePrinter
 from coalib.output.ConfWriter import ConfWriter
 from coala_quickstart.coala_quickstart import _get_arg_parser
 from coala_quickstart.generation.Settings import write_info, generate_settings
+from coala_quickstart.generation import BearMetadata, Requirements
 from coala_quickstart.generation.Bears import filter_relevant_bears
 from coala_quickstart.generation.Project import get_used_languages
+from tests.TestUtilities import isolate_cache
 
 
 class SettingsTest(unittest.TestCase):
@@ -31,6 +33,10 @@ class SettingsTest(unittest.TestCase):
         self.arg_parser = _get_arg_parser()
         self.old_argv = deepcopy(sys.argv)
         del sys.argv[1:]
+        isolate_cache(self, BearMetadata, 'BEAR_METADATA_CACHE',
+                      'coala_quickstart_test_bear_metadata')
+        isolate_cache(self, Requirements, 'INSTALLED_PACKAGES_CACHE',
+                      'coala_quickstart_test_installed_packages')
 
     def tearDown(self):
         self.writer.close()
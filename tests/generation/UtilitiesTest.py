@@ -1,17 +1,17 @@
 import inspect
 import itertools
+import os
+import tempfile
 import types
 import unittest
 
 from tests.test_bears.AllKindsOfSettingsDependentBear import (
     AllKindsOfSettingsDependentBear)
 from coala_quickstart.generation.Utilities import (
-    contained_in,
     get_default_args, get_all_args,
     search_for_orig, concatenate, peek,
-    get_language_from_hashbang)
-from coalib.results.SourcePosition import SourcePosition
-from coalib.results.SourceRange import SourceRange
+    get_language_from_hashbang, LanguageClassifier, get_extensions,
+    get_language_names, split_by_language)
 
 
 def foo():
@@ -78,6 +78,44 @@ class TestAdditionalFunctions(unittest.TestCase):
                          'python')
         self.assertEqual(get_language_from_hashbang('#!bin/bash'),
                          'bash')
+        self.assertEqual(get_language_from_hashbang('#!/usr/bin/python3.6\n'),
+                         'python')
+        self.assertEqual(
+            get_language_from_hashbang('#!/usr/bin/env -S python3 -u\n'),
+            'python')
+        self.assertEqual(
+            get_language_from_hashbang('#!/usr/bin/env -u HOME LANG=C ruby'),
+            'ruby')
+        self.assertIsNone(get_language_from_hashbang('#!/usr/bin/env'))
+        self.assertIsNone(get_language_from_hashbang('import os'))
+
+    def test_language_classifier(self):
+        self.assertEqual(get_language_names()['python'], 'Python')
+        classifier = LanguageClassifier()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            script = os.path.join(tmp_dir, 'script')
+            with open(script, 'w') as file:
+                file.write('#!/usr/bin/env python3\nimport os\n')
+            info = classifier.classify(script)
+            self.assertEqual(info.ext, '')
+            self.assertEqual(info.languages, ())
+            self.assertEqual(info.hashbang_language, 'python')
+        # The file is only read once.
+        self.assertIs(classifier.classify(script), info)
+
+        info = classifier.classify(os.path.join(tmp_dir, 'a.py'))
+        self.assertEqual(info.ext, '.py')
+        self.assertIn('Python', info.languages)
+        self.assertIsNone(info.hashbang_language)
+        self.assertIsNone(
+            classifier.classify('missing.extension').hashbang_language)
+
+        files = [script, os.path.join(tmp_dir, 'a.py')]
+        lang_files = split_by_language(files, classifier)
+        self.assertEqual(lang_files['python'], set(files))
+        self.assertEqual(lang_files['all'], set(files))
+        self.assertEqual(get_extensions(files, classifier)['python'],
+                         {'.py'})
 
 
 class TestDataStructuresOperationsFunctions(unittest.TestCase):
@@ -120,106 +158,3 @@ class TestDataStructuresOperationsFunctions(unittest.TestCase):
 
         self.assertEqual(ret_val, None)
         self.assertEqual(ret_val_1, None)
-
-
-class TestContainedIn(unittest.TestCase):
-
-    def test_contained_in_1(self):
-        start = SourcePosition('a.py', line=1, column=5)
-        end = SourcePosition('a.py', line=5, column=1)
-        smaller = SourceRange(start, end)
-
-        start = SourcePosition('a.py', line=1, column=5)
-        end = SourcePosition('a.py', line=5, column=2)
-        bigger = SourceRange(start, end)
-        self.assertTrue(contained_in(smaller, bigger))
-
-        start = SourcePosition('a.py', line=1, column=4)
-        end = SourcePosition('a.py', line=5, column=1)
-        bigger = SourceRange(start, end)
-        self.assertTrue(contained_in(smaller, bigger))
-
-        start = SourcePosition('a.py', line=1, column=5)
-        end = SourcePosition('a.py', line=5, column=1)
-        bigger = SourceRange(start, end)
-        self.assertTrue(contained_in(smaller, bigger))
-
-    def test_contained_in_2(self):
-        start = SourcePosition('a.py', line=1, column=5)
-        end = SourcePosition('a.py', line=5, column=1)
-        smaller = SourceRange(start, end)
-
-        start = SourcePosition('a.py', line=1, column=9)
-        end = SourcePosition('a.py', line=5, column=1)
-        bigger = SourceRange(start, end)
-        self.assertFalse(contained_in(smaller, bigger))
-
-        start = SourcePosition('a.py', line=1, column=6)
-        end = SourcePosition('a.py', line=4, column=2)
-        bigger = SourceRange(start, end)
-        self.assertFalse(contained_in(smaller, bigger))
-
-        start = SourcePosition('b.py', line=1, column=5)
-        end = SourcePosition('b.py', line=5, column=1)
-        bigger = SourceRange(start, end)
-        self.assertFalse(contained_in(smaller, bigger))
-
-    def test_contained_in_3(self):
-        start = SourcePosition('a.py', line=1, column=5)
-        end = SourcePosition('a.py', line=5, column=1)
-        smaller = SourceRange(start, end)
-
-        start = SourcePosition('a.py', line=2, column=5)
-        end = SourcePosition('a.py', line=5, column=1)
-        bigger = SourceRange(start, end)
-        self.assertFalse(contained_in(smaller, bigger))
-
-    def test_contained_in_4(self):
-        start = SourcePosition('a.py', line=3, column=5)
-        end = SourcePosition('a.py', line=5, column=1)
-        smaller = SourceRange(start, end)
-
-        start = SourcePosition('a.py', line=1, column=5)
-        end = SourcePosition('a.py', line=6, column=1)
-        bigger = SourceRange(start, end)
-        self.assertTrue(contained_in(smaller, bigger))
-
-        start = SourcePosition('a.py', line=3, column=5)
-        end = SourcePosition('a.py', line=6, column=1)
-        bigger = SourceRange(start, end)
-        self.assertTrue(contained_in(smaller, bigger))
-
-    def test_contained_in_5(self):
-        start = SourcePosition('a.py', line=3, column=5)
-        end = SourcePosition('a.py', line=5, column=1)
-        smaller = SourceRange(start, end)
-
-        start = SourcePosition('a.py', line=2, column=5)
-        end = SourcePosition('a.py', line=5, column=1)
-        bigger = SourceRange(start, end)
-        self.assertTrue(contained_in(smaller, bigger))
-
-        start = SourcePosition('a.py', line=3, column=8)
-        end = SourcePosition('a.py', line=7, column=1)
-        bigger = SourceRange(start, end)
-        self.assertFalse(contained_in(smaller, bigger))
-
-    def test_contained_in_6(self):
-        start = SourcePosition('a.py', line=3, column=5)
-        end = SourcePosition('a.py', line=5, column=7)
-        smaller = SourceRange(start, end)
-
-        start = SourcePosition('a.py', line=3, column=5)
-        end = SourcePosition('a.py', line=5, column=6)
-        bigger = SourceRange(start, end)
-        self.assertFalse(contained_in(smaller, bigger))
-
-        start = SourcePosition('a.py', line=2, column=8)
-        end = SourcePosition('a.py', line=5, column=1)
-        bigger = SourceRange(start, end)
-        self.assertFalse(contained_in(smaller, bigger))
-
-        start = SourcePosition('a.py', line=2, column=None)
-        end = SourcePosition('a.py', line=5, column=1)
-        bigger = SourceRange(start, end)
-        self.assertFalse(contained_in(smaller, bigger))
@@ -0,0 +1,41 @@
+import unittest
+
+from coala_quickstart.green_mode.dependency_cache import DependencyCache
+from tests.test_bears.TestLocalIndepBear import TestLocalIndepBear
+
+
+class TestDependencyCache(unittest.TestCase):
+
+    def test_get_key(self):
+        key = DependencyCache.get_key(TestLocalIndepBear, 'a.py',
+                                      ('y', 'x'), (1, 2))
+        self.assertEqual(key, DependencyCache.get_key(
+            TestLocalIndepBear, 'a.py', ('x', 'y'), (2, 1)))
+        self.assertNotEqual(key, DependencyCache.get_key(
+            TestLocalIndepBear, 'b.py', ('x', 'y'), (2, 1)))
+
+        list_key = DependencyCache.get_key(TestLocalIndepBear, 'a.py',
+                                           ('x',), ([1, 2],))
+        hash(list_key)
+        self.assertEqual(list_key, DependencyCache.get_key(
+            TestLocalIndepBear, 'a.py', ('x',), ([1, 2],)))
+
+    def test_lookup(self):
+        cache = DependencyCache()
+        key = DependencyCache.get_key(TestLocalIndepBear, 'a.py', (), ())
+        self.assertFalse(cache.lookup(key))
+        self.assertNotIn(key, cache)
+        cache.add(key, False)
+        self.assertTrue(cache.lookup(key))
+        self.assertIs(cache[key], False)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_reserve(self):
+        cache = DependencyCache()
+        key = DependencyCache.get_key(TestLocalIndepBear, 'a.py', (), ())
+        cache.reserve(key)
+        self.assertTrue(cache.lookup(key))
+        self.assertNotIn(key, cache)
+        cache.add(key, True)
+        self.assertTrue(cache.lookup(key))
+        self.assertEqual((cache.hits, cache.misses), (2, 0))
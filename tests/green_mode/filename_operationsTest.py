@@ -7,6 +7,7 @@ from coala_quickstart.generation.Utilities import (
     append_to_contents,
     )
 from coala_quickstart.green_mode.filename_operations import (
+    Trie,
     check_filename_prefix_postfix,
     get_files_list,
     )
@@ -151,3 +152,17 @@ class TestFilenameOperations(unittest.TestCase):
                                            ['ing'],
                                            settings_key)
         self.assertEqual(test_contents, ret_val_contents)
+
+    def test_trie(self):
+        trie = Trie()
+        for name in ['abc_x', 'abc_y', 'xabc_d1', 'xabc_d2', 'q']:
+            trie.insert(name)
+        # 'abc_' is contained in 'xabc_d' and replaced by it.
+        self.assertEqual(trie.get_prefixes(3, 2), [('xabc_d', 2)])
+        self.assertEqual(trie.get_prefixes(3, 3), [])
+
+        # Names much longer than the recursion limit.
+        trie = Trie()
+        for i in range(3):
+            trie.insert('a' * 5000 + str(i))
+        self.assertEqual(trie.get_prefixes(3, 3), [('a' * 5000, 3)])
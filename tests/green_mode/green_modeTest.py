@@ -1,3 +1,4 @@
+import json
 import operator
 import os
 import unittest
@@ -7,6 +8,7 @@ from pathlib import Path
 from textwrap import dedent
 from unittest.mock import patch
 
+from coala_quickstart.generation import SettingsClass
 from coala_quickstart.generation.SettingsClass import (
     collect_bear_settings,
     )
@@ -16,6 +18,7 @@ from coala_quickstart.green_mode.Setting import (
 from coala_quickstart.green_mode.green_mode import (
     bear_test_fun,
     check_bear_results,
+    compile_ignore_globs,
     generate_complete_filename_list,
     generate_data_struct_for_sections,
     generate_green_mode_sections,
@@ -26,6 +29,15 @@ from coala_quickstart.green_mode.green_mode import (
     local_bear_test,
     run_quickstartbear,
     )
+from coala_quickstart.green_mode.dependency_cache import (
+    DependencyCache,
+    )
+from coala_quickstart.green_mode.ignore_range_index import (
+    IgnoreRangeIndex,
+    )
+from coala_quickstart.green_mode.trial_executor import (
+    TrialExecutor,
+    )
 from coala_quickstart.generation.Utilities import (
     append_to_contents,
     dump_yaml_to_file,
@@ -46,12 +58,17 @@ from tests.test_bears.AnotherTestLocalDepBear import AnotherTestLocalDepBear
 from tests.test_bears.TestGlobalBear import TestGlobalBear
 from tests.test_bears.TestLocalBear import TestLocalBear
 from tests.test_bears.TestLocalDepBear import TestLocalDepBear
+from tests.TestUtilities import generate_project_index, isolate_cache
 
 settings_key = 'green_mode_infinite_value_settings'
 
 
 class Test_green_mode(unittest.TestCase):
 
+    def setUp(self):
+        isolate_cache(self, SettingsClass, 'BEAR_SETTINGS_CACHE',
+                      'coala_quickstart_test_bear_settings')
+
     def test_get_yaml_contents(self):
         project_data = 'example_.project_data.yaml'
         full_path = str(Path(__file__).parent / project_data)
@@ -134,6 +151,11 @@ class Test_green_mode(unittest.TestCase):
                            'example_.project_data.yaml',
                            'green_modeTest.py',
                            'filename_operationsTest.py',
+                           'project_dataTest.py',
+                           'trial_executorTest.py',
+                           'dependency_cacheTest.py',
+                           'ignore_range_indexTest.py',
+                           'lazy_file_dictTest.py',
                            'bear_settings.yaml',
                            {'test_dir': ['file_aggregatorTest.py',
                                          'test_file.py']}]
@@ -148,6 +170,18 @@ class Test_green_mode(unittest.TestCase):
                                 to_test = j[key]
                     self.assertCountEqual(i[key], to_test)
 
+    def test_compile_ignore_globs(self):
+        is_ignored = compile_ignore_globs(['*pycache*', '**.pyc', 'a?.md',
+                                           os.path.join('src', '[ab].py')])
+        self.assertTrue(is_ignored(os.path.join('src', '__pycache__')))
+        self.assertTrue(is_ignored(os.path.join('src', 'x.pyc')))
+        self.assertTrue(is_ignored('ab.md'))
+        self.assertTrue(is_ignored(os.path.join('src', 'b.py')))
+        self.assertFalse(is_ignored('abc.md'))
+        self.assertFalse(is_ignored(os.path.join('src', 'c.py')))
+        self.assertFalse(is_ignored(os.path.join('src', 'x.pyc.orig')))
+        self.assertFalse(compile_ignore_globs([])('a.py'))
+
     def test_generate_complete_filename_list(self):
         dir_path = str(Path(__file__).parent) + os.sep
         ignore_globs = ['*pycache*', '**.pyc', '**.orig']
@@ -160,6 +194,11 @@ class Test_green_mode(unittest.TestCase):
                            'green_modeTest.py',
                            'test_dir' + os.sep + 'file_aggregatorTest.py',
                            'filename_operationsTest.py',
+                           'project_dataTest.py',
+                           'trial_executorTest.py',
+                           'dependency_cacheTest.py',
+                           'ignore_range_indexTest.py',
+                           'lazy_file_dictTest.py',
                            'test_dir' + os.sep + 'test_file.py']
         test_final_data = [prefix + x for x in test_final_data]
         self.assertCountEqual(final_data, test_final_data)
@@ -221,6 +260,45 @@ class Test_green_mode(unittest.TestCase):
         # which contain the ignore field which is also accounted
         # inside the ignore ranges.
 
+    def test_run_quickstartbear_file_cache(self):
+        dir_path = str(Path(__file__).parent) + os.sep
+        ignore_globs = ['*pycache*', '**.pyc', '**.orig']
+        contents = initialize_project_data(dir_path, ignore_globs)
+        contents = {'dir_structure': contents, settings_key: []}
+        file_cache = {'deleted_file.py': {'signature': [0, 0, 0],
+                                          'quickstart': None}}
+        (final_contents, ignore_ranges, complete_file_dict,
+         complete_filename_list) = run_quickstartbear(
+            deepcopy(contents), dir_path, file_cache)
+        self.assertCountEqual(file_cache, complete_filename_list)
+        # The cache is stored as JSON.
+        file_cache = json.loads(json.dumps(file_cache))
+
+        # Nothing changed, so the QuickstartBear is not run and the files
+        # aren't searched for ignore ranges at all.
+        with patch.object(QuickstartBear, 'execute') as mocked, patch(
+                'coala_quickstart.green_mode.green_mode.yield_ignore_ranges'
+                ) as mocked_ignore_ranges:
+            cached_contents, cached_ignore_ranges = run_quickstartbear(
+                deepcopy(contents), dir_path, file_cache)[:2]
+            self.assertFalse(mocked.called)
+            self.assertFalse(mocked_ignore_ranges.called)
+        self.assertEqual(cached_contents, final_contents)
+        self.assertEqual(len(cached_ignore_ranges), len(ignore_ranges))
+        ignore_file_name = dir_path + 'test_dir' + os.sep + 'test_file.py'
+        ignored = SourceRange.from_values(ignore_file_name, 3, 1, 4, 20)
+        self.assertTrue(ignore_ranges.contains(ignored))
+        self.assertTrue(cached_ignore_ranges.contains(ignored))
+
+        # Only the changed file is run through the QuickstartBear again.
+        changed_file = complete_filename_list[0]
+        file_cache[changed_file]['signature'] = [0, 0, 0]
+        with patch.object(QuickstartBear, 'execute',
+                          return_value=[None]) as mocked:
+            run_quickstartbear(deepcopy(contents), dir_path, file_cache)
+            mocked.assert_called_once_with(
+                filename=changed_file, file=complete_file_dict[changed_file])
+
     def test_run_quickstartbear_with_file_None(self):
         # Mocking the method
         QuickstartBear.execute = lambda *args, **kwargs: [None]
@@ -239,6 +317,14 @@ class Test_green_mode(unittest.TestCase):
             'key', 'GummyBear', __location__)
         self.assertEqual(type_setting, 'typeX')
         self.assertEqual(val, '')
+        self.assertEqual(
+            get_setting_type('no_line', AllKindsOfSettingsBaseBear,
+                             __location__),
+            ('type3', [1, 2]))
+        # Bear names are matched exactly.
+        self.assertIsNone(get_setting_type('key', 'Gummy', __location__))
+        self.assertIsNone(get_setting_type('key', 'GummyBears', __location__))
+        self.assertIsNone(get_setting_type('value', 'GummyBear', __location__))
 
     def test_get_kwargs_1(self):
         relevant_bears = {'test':
@@ -255,7 +341,7 @@ class Test_green_mode(unittest.TestCase):
                     settings_key: [{'some_rubbish_setting': 'some_rubbish',
                                     'max_line_lengths': 60}]}
         kwargs = get_kwargs(non_optional_settings,
-                            [AllKindsOfSettingsBaseBear],
+                            AllKindsOfSettingsBaseBear,
                             contents, __location__)
         test_kwargs = {'use_bear': [True, False],
                        'max_line_lengths': [60],
@@ -277,7 +363,7 @@ class Test_green_mode(unittest.TestCase):
                     settings_key: [{'some_rubbish_setting': 'some_rubbish',
                                     'max_line_lengths': 60}]}
         kwargs = get_kwargs(optional_settings,
-                            [AllKindsOfSettingsBaseBear],
+                            AllKindsOfSettingsBaseBear,
                             contents, __location__)
         test_kwargs = {'use_space': [True, False],
                        'use_tab': [True, False]}
@@ -313,6 +399,30 @@ class Test_green_mode(unittest.TestCase):
         ignore_ranges = [('+=', ignore_object)]
         self.assertFalse(check_bear_results(results, ignore_ranges))
 
+    def test_check_bear_results_4(self):
+        first_range = SourceRange(SourcePosition('a.py', line=3, column=1),
+                                  SourcePosition('a.py', line=5, column=1))
+        second_range = SourceRange(SourcePosition('a.py', line=9, column=1),
+                                   SourcePosition('a.py', line=9, column=7))
+        results = [Result(affected_code=[first_range],
+                          message='green_mode', origin=QuickstartBear),
+                   Result(affected_code=[second_range],
+                          message='green_mode', origin=QuickstartBear)]
+
+        # Each result lies in a different ignore range.
+        ignore_ranges = IgnoreRangeIndex([
+            ([], SourceRange(SourcePosition('a.py', line=1, column=1),
+                             SourcePosition('a.py', line=6, column=1))),
+            ([], SourceRange(SourcePosition('a.py', line=8, column=1),
+                             SourcePosition('a.py', line=10, column=1)))])
+        self.assertTrue(check_bear_results(results, ignore_ranges))
+        self.assertTrue(check_bear_results(results, [
+            ([], SourceRange(SourcePosition('a.py', line=1, column=1),
+                             SourcePosition('a.py', line=10, column=1)))]))
+        self.assertFalse(check_bear_results(results, [
+            ([], SourceRange(SourcePosition('a.py', line=1, column=1),
+                             SourcePosition('a.py', line=6, column=1)))]))
+
     def test_bear_test_fun_1(self):
         from pyprint.ConsolePrinter import ConsolePrinter
         printer = ConsolePrinter()
@@ -419,6 +529,85 @@ class Test_green_mode(unittest.TestCase):
                               test_results[0][AnotherTestLocalDepBear])
         self.assertCountEqual(unified_results, [None])
 
+    def test_bear_test_fun_parallel(self):
+        from pyprint.ConsolePrinter import ConsolePrinter
+        printer = ConsolePrinter()
+        bears = {'Python': [TestLocalBear, TestGlobalBear,
+                            AnotherTestLocalDepBear]}
+        relevant_bears = {'test': set(bears['Python'])}
+        bear_settings_obj = collect_bear_settings(relevant_bears)
+        file_dict = {'A.py': {'a\n', 'b\n'}, 'C.py': {'c\n', 'd\n'}}
+        dir_path = str(Path(__file__).parent) + os.sep
+        contents = initialize_project_data(dir_path, [])
+        file_names = ['A.py', 'C.py']
+        serial_results = bear_test_fun(
+            bears, bear_settings_obj, file_dict, [], contents,
+            file_names, 5, 5, printer, TrialExecutor(jobs=1))
+        with TrialExecutor(jobs=2) as executor:
+            parallel_results = bear_test_fun(
+                bears, bear_settings_obj, file_dict, [], contents,
+                file_names, 5, 5, printer, executor)
+        self.assertEqual(parallel_results, serial_results)
+
+    def test_local_bear_test_min_coverage(self):
+        file_names = ['{}.py'.format(index) for index in range(10)]
+        file_dict = {name: ('a\n',) for name in file_names}
+        kwargs = {'yield_results': [True, False]}
+        executor = TrialExecutor(jobs=1)
+        results = local_bear_test(TestLocalBear, file_dict, file_names,
+                                  'Python', kwargs, [], executor)
+        self.assertCountEqual(results[TestLocalBear],
+                              [{'yield_results': False, 'filename': name}
+                               for name in file_names])
+        self.assertEqual(executor.trials_run, 20)
+        self.assertEqual(executor.trials_skipped, 0)
+        self.assertEqual(kwargs, {'yield_results': [True, False]})
+
+        executor = TrialExecutor(jobs=1)
+        results = local_bear_test(TestLocalBear, file_dict, file_names,
+                                  'Python', kwargs, [], executor, 0.5)
+        self.assertCountEqual(results[TestLocalBear],
+                              [{'yield_results': False, 'filename': name}
+                               for name in file_names])
+        # yield_results=True fails on the first two rounds of four files
+        # and is not run on the last two files.
+        self.assertEqual(executor.trials_run, 18)
+        self.assertEqual(executor.trials_skipped, 2)
+
+    def test_local_bear_test_dependency_failure(self):
+        file_names = ['A.py', 'C.py']
+        file_dict = {'A.py': ('a\n',), 'C.py': ('c\n',)}
+        executor = TrialExecutor(jobs=1)
+        results = local_bear_test(
+            TestLocalDepBear, file_dict, file_names, 'Python',
+            {'yield_results': [True, False]}, [], executor)
+        self.assertEqual(results, {TestLocalDepBear: []})
+        # TestLocalIndepBear ignores yield_results, so it only runs once
+        # per file and neither combination runs TestLocalDepBear.
+        self.assertEqual(executor.trials_run, 2)
+        self.assertEqual(executor.trials_skipped, 4)
+
+    def test_local_bear_test_dependency_cache(self):
+        file_names = ['A.py', 'C.py']
+        file_dict = {'A.py': ('a\n',), 'C.py': ('c\n',)}
+        executor = TrialExecutor(jobs=1)
+        dependency_cache = DependencyCache()
+        for _ in range(2):
+            results = local_bear_test(
+                AnotherTestLocalDepBear, file_dict, file_names, 'Python',
+                {'yield_results': [True, False]}, [], executor,
+                dependency_cache=dependency_cache)
+            self.assertCountEqual(results[AnotherTestLocalDepBear],
+                                  [{'yield_results': value, 'filename': name}
+                                   for value in (True, False)
+                                   for name in file_names])
+        # AnotherTestLocalIndepBear only runs once for each file.
+        self.assertEqual(dependency_cache.misses, 2)
+        self.assertEqual(dependency_cache.hits, 6)
+        self.assertEqual(executor.trials_run, 2 + 4 + 4)
+        # Reused and deduplicated dependency runs aren't skipped runs.
+        self.assertEqual(executor.trials_skipped, 0)
+
     def test_write_coafile(self):
         from pyprint.ConsolePrinter import ConsolePrinter
         printer = ConsolePrinter()
@@ -440,12 +629,14 @@ class Test_green_mode(unittest.TestCase):
         coafile = '.coafile.green'
         full_path = str(Path(__file__).parent.parent.parent)
         full_path_coafile = str(Path(__file__).parent.parent.parent / coafile)
-        with patch('os.walk') as mockwalk:
-            mockwalk.return_val = mockwalk.return_value = [
-                ('', (), ('a.py', 'b.py', 'c.py', 'd.py')), ]
-            generate_green_mode_sections(data_struct, full_path,
-                                         project_files, ['x'],
-                                         printer)
+        project_index = generate_project_index(
+            full_path, [os.path.join(full_path, file)
+                        for file in project_files])
+        ignored = ', '.join(escape(os.path.join(full_path, file), '\\')
+                            for file in project_files)
+        generate_green_mode_sections(data_struct, full_path,
+                                     project_files, ['x'],
+                                     printer, project_index=project_index)
         contents = ""
 
         with open(full_path_coafile) as f:
@@ -457,23 +648,23 @@ class Test_green_mode(unittest.TestCase):
             ignore = x
 
             [all.TestLocalBear1]
-            ignore += a.py, b.py, c.py, d.py
+            ignore += {ignored}
             bears = TestLocalBear
             some_setting = 3
             files = a.py, b.py, {full_path_glob}
 
             [all.TestLocalBear2]
-            ignore += a.py, b.py, c.py, d.py
+            ignore += {ignored}
             files = c.py, {full_path_glob}
             bears = TestLocalBear
             some_setting = 4
 
             [all.TestLocalBear3]
-            ignore += a.py, b.py, c.py, d.py
+            ignore += {ignored}
             files = d.py, {full_path_glob}
             bears = TestLocalBear
             some_other_setting = x""").format(
-                full_path_glob=full_path_glob)
+                full_path_glob=full_path_glob, ignored=ignored)
         # Since the order of settings within a seciton is volatile.
         print('test_contents')
         for line in test_contents.split('\n'):
@@ -482,12 +673,9 @@ class Test_green_mode(unittest.TestCase):
                 self.assertIn(line, [i.strip('\\').replace('\\\\C', 'C')
                                      for i in contents.split('\n')])
 
-        with patch('os.walk') as mockwalk:
-            mockwalk.return_val = mockwalk.return_value = [
-                ('', (), ('a.py', 'b.py', 'c.py', 'd.py')), ]
-            generate_green_mode_sections(data_struct, full_path,
-                                         project_files, [],
-                                         printer)
+        generate_green_mode_sections(data_struct, full_path,
+                                     project_files, [],
+                                     printer, project_index=project_index)
         contents = ""
 
         with open(full_path_coafile) as f:
@@ -498,23 +686,23 @@ class Test_green_mode(unittest.TestCase):
         # is empty.
         test_contents = dedent("""
             [all.TestLocalBear1]
-            ignore = a.py, b.py, c.py, d.py
+            ignore = {ignored}
             files = a.py, b.py, {full_path_glob}
             bears = TestLocalBear
             some_setting = 3
 
             [all.TestLocalBear2]
-            ignore = a.py, b.py, c.py, d.py
+            ignore = {ignored}
             files = c.py, {full_path_glob}
             bears = TestLocalBear
             some_setting = 4
 
             [all.TestLocalBear3]
-            ignore = a.py, b.py, c.py, d.py
+            ignore = {ignored}
             files = d.py, {full_path_glob}
             bears = TestLocalBear
             some_other_setting = x""").format(
-                full_path_glob=full_path_glob)
+                full_path_glob=full_path_glob, ignored=ignored)
         # Since the order of settings within a seciton is volatile.
         for line in test_contents.split('\n'):
             if line == 'ignore = x':
@@ -531,12 +719,9 @@ class Test_green_mode(unittest.TestCase):
                                             [{'some_other_setting': 'x',
                                               'filename': ['d.py']}],
                                             []]}
-        with patch('os.walk') as mockwalk:
-            mockwalk.return_val = mockwalk.return_value = [
-                ('', (), ('a.py', 'b.py', 'c.py', 'd.py')), ]
-            generate_green_mode_sections(test_data_struct, full_path,
-                                         project_files, [],
-                                         printer)
+        generate_green_mode_sections(test_data_struct, full_path,
+                                     project_files, [],
+                                     printer, project_index=project_index)
         contents = ""
 
         with open(full_path_coafile) as f:
@@ -546,23 +731,23 @@ class Test_green_mode(unittest.TestCase):
         # TODO: section name enumerations should not skip integers.
         test_contents = dedent("""
             [all.TestLocalBear1]
-            ignore = a.py, b.py, c.py, d.py
+            ignore = {ignored}
             files = a.py, b.py, {full_path_glob}
             bears = TestLocalBear
             some_setting = 3
 
             [all.TestLocalBear2]
-            ignore = a.py, b.py, c.py, d.py
+            ignore = {ignored}
             files = c.py, {full_path_glob}
             bears = TestLocalBear
             some_setting = 4
 
             [all.TestLocalBear4]
-            ignore = a.py, b.py, c.py, d.py
+            ignore = {ignored}
             files = d.py, {full_path_glob}
             bears = TestLocalBear
             some_other_setting = x""").format(
-                full_path_glob=full_path_glob)
+                full_path_glob=full_path_glob, ignored=ignored)
 
         # Since the order of settings within a seciton is volatile.
         for line in test_contents.split('\n'):
@@ -0,0 +1,55 @@
+import unittest
+
+from coala_quickstart.green_mode.ignore_range_index import IgnoreRangeIndex
+from coala_quickstart.green_mode.QuickstartBear import QuickstartBear
+from coalib.results.Result import Result
+from coalib.results.SourceRange import SourceRange
+
+
+def make_range(file, start_line, start_column, end_line, end_column):
+    return SourceRange.from_values(file, start_line, start_column,
+                                   end_line, end_column)
+
+
+class TestIgnoreRangeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = IgnoreRangeIndex([
+            ([], make_range('a.py', 10, 1, 20, 1)),
+            (['SomeBear'], make_range('a.py', 12, 1, 30, 5)),
+            ([], make_range('a.py', 40, 3, 40, 9)),
+            ([], make_range('b.py', 1, 1, 1, 1)),
+            ([], SourceRange.from_values('a.py', 50, None, 60, None)),
+            ])
+
+    def test_len(self):
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(len(IgnoreRangeIndex()), 0)
+
+    def test_contains(self):
+        self.assertTrue(self.index.contains(make_range('a.py', 10, 1, 20, 1)))
+        self.assertTrue(self.index.contains(make_range('a.py', 15, 1, 25, 1)))
+        self.assertTrue(self.index.contains(make_range('a.py', 40, 3, 40, 9)))
+        self.assertFalse(self.index.contains(make_range('a.py', 9, 1, 11, 1)))
+        self.assertFalse(
+            self.index.contains(make_range('a.py', 25, 1, 30, 6)))
+        self.assertFalse(self.index.contains(make_range('a.py', 40, 2, 40, 5)))
+        self.assertFalse(
+            self.index.contains(make_range('a.py', 55, 1, 56, 1)))
+        self.assertFalse(self.index.contains(make_range('c.py', 10, 1, 11, 1)))
+        self.assertFalse(self.index.contains(
+            SourceRange.from_values('a.py', 15, None, 16, None)))
+
+    def test_is_ignored(self):
+        def make_result(*ranges):
+            return Result(affected_code=ranges, message='green_mode',
+                          origin=QuickstartBear)
+
+        self.assertTrue(self.index.is_ignored(
+            make_result(make_range('a.py', 11, 1, 12, 1),
+                        make_range('b.py', 1, 1, 1, 1))))
+        self.assertFalse(self.index.is_ignored(
+            make_result(make_range('a.py', 11, 1, 12, 1),
+                        make_range('b.py', 1, 1, 2, 1))))
+        self.assertFalse(self.index.is_ignored(make_result()))
+        self.assertFalse(self.index.is_ignored(1))
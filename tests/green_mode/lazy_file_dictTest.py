@@ -0,0 +1,66 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from coala_quickstart.green_mode.lazy_file_dict import LazyFileDict
+from tests.TestUtilities import generate_files
+
+
+class TestLazyFileDict(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_lazy_file_dict(self):
+        with generate_files(['a.py', 'b.py'], ['a\nb\n', 'cde\n'],
+                            self.tmp_dir.name) as (a_py, b_py):
+            missing = os.path.join(self.tmp_dir.name, 'missing.py')
+            file_dict = LazyFileDict([a_py, b_py, missing, a_py])
+
+            self.assertEqual(list(file_dict), [a_py, b_py])
+            self.assertEqual(len(file_dict), 2)
+            self.assertNotIn(missing, file_dict)
+            self.assertEqual(file_dict._size, 0)
+            self.assertEqual(dict(file_dict),
+                             {a_py: ('a\n', 'b\n'), b_py: ('cde\n',)})
+            with self.assertRaises(KeyError):
+                file_dict[missing]
+
+    def test_raw_file(self):
+        raw_file = os.path.join(self.tmp_dir.name, 'raw')
+        with open(raw_file, 'wb') as stream:
+            stream.write(b'\xff\xfe\xfa')
+        self.assertIsNone(LazyFileDict([raw_file])[raw_file])
+
+    def test_max_size(self):
+        with generate_files(['a.py', 'b.py'], ['a\nb\n', 'cde\n'],
+                            self.tmp_dir.name) as (a_py, b_py):
+            file_dict = LazyFileDict([a_py, b_py], max_size=5)
+            self.assertEqual(file_dict[a_py], ('a\n', 'b\n'))
+            self.assertEqual(list(file_dict._cache), [a_py])
+            self.assertEqual(file_dict[b_py], ('cde\n',))
+            self.assertEqual(list(file_dict._cache), [b_py])
+            self.assertEqual(file_dict._size, 4)
+
+            # A file bigger than max_size is still kept.
+            file_dict.max_size = 1
+            self.assertEqual(file_dict[a_py], ('a\n', 'b\n'))
+            self.assertEqual(list(file_dict._cache), [a_py])
+
+            # Dropped contents are read again.
+            with open(b_py, 'w') as stream:
+                stream.write('changed\n')
+            self.assertEqual(file_dict[b_py], ('changed\n',))
+
+    def test_pickle(self):
+        with generate_files(['a.py'], ['a\n'],
+                            self.tmp_dir.name) as (a_py,):
+            file_dict = LazyFileDict([a_py])
+            file_dict[a_py]
+            unpickled = pickle.loads(pickle.dumps(file_dict))
+            self.assertEqual(unpickled._cache, {})
+            self.assertEqual(unpickled[a_py], ('a\n',))
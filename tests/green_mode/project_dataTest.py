@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+
+from coala_quickstart.generation.ProjectIndex import scan_project
+from coala_quickstart.green_mode.project_data import (
+    PROJECT_DATA,
+    PROJECT_DATA_VERSION,
+    dump_project_data,
+    get_file_signature,
+    load_file_cache,
+    load_project_data,
+    )
+from tests.TestUtilities import generate_files
+
+
+class TestProjectData(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.project_data = os.path.join(self.tmp_dir.name, PROJECT_DATA)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_file_signature(self):
+        with generate_files(['a.py'], ['abc'], self.tmp_dir.name) as fpaths:
+            stat = os.stat(fpaths[0])
+            signature = [3, stat.st_mtime_ns, stat.st_ino]
+            self.assertEqual(get_file_signature(fpaths[0]), signature)
+            index = scan_project(self.tmp_dir.name)
+            self.assertEqual(get_file_signature(fpaths[0], index), signature)
+
+    def test_load_file_cache_missing(self):
+        self.assertEqual(load_file_cache(self.project_data), {})
+
+    def test_load_file_cache_version_mismatch(self):
+        with open(self.project_data, 'w') as stream:
+            json.dump({'version': PROJECT_DATA_VERSION + 1,
+                       'file_cache': {'a.py': {}}}, stream)
+        self.assertEqual(load_file_cache(self.project_data), {})
+
+    def test_load_file_cache_corrupt(self):
+        with open(self.project_data, 'w') as stream:
+            stream.write('dir_structure:\n- a.py\n')
+        self.assertEqual(load_file_cache(self.project_data), {})
+
+    def test_dump_and_load_file_cache(self):
+        file_cache = {'a.py': {'signature': [1, 2, 3],
+                               'quickstart': {'max_line_length': 10}}}
+        contents = {'dir_structure': ['a.py']}
+        dump_project_data(self.project_data, contents, file_cache)
+        self.assertEqual(load_file_cache(self.project_data), file_cache)
+        self.assertEqual(
+            load_project_data(self.project_data)['dir_structure'], ['a.py'])
+        self.assertNotIn('version', contents)
@@ -1,12 +1,15 @@
 import os
 import unittest
 
+from collections import OrderedDict
 from copy import deepcopy
 from os.path import join
-from unittest.mock import patch
 
 from coala_quickstart.green_mode.file_aggregator import (
-    aggregate_files)
+    Node, aggregate_files)
+from coala_quickstart.green_mode.find_globs import (
+    SectionFileCounts, count_project_files)
+from tests.TestUtilities import generate_project_index
 
 
 class Test_file_aggregators(unittest.TestCase):
@@ -36,13 +39,11 @@ class Test_file_aggregators(unittest.TestCase):
             new_return_val += (project_dir_ + i,)
         return_val = new_return_val
 
-        with patch('os.walk') as mockwalk:
-            mockwalk.return_value = [
-                ('', (), return_val), ]
-            files_ret, ignore = aggregate_files(deepcopy(files), 'some_dir')
-            self.assertEqual(files_ret, [os.sep + 'some_dir' + os.sep + '**'])
-            self.assertEqual(
-                ignore, [os.sep + join('some_dir', 'src', 'b', 't.py')])
+        index = generate_project_index(project_dir_, return_val)
+        files_ret, ignore = aggregate_files(deepcopy(files), 'some_dir', index)
+        self.assertEqual(files_ret, [os.sep + 'some_dir' + os.sep + '**'])
+        self.assertEqual(
+            ignore, [os.sep + join('some_dir', 'src', 'b', 't.py')])
 
         return_val = (
             'main.py', 'another_main.py', 'some.c',
@@ -62,14 +63,19 @@ class Test_file_aggregators(unittest.TestCase):
             new_return_val += (project_dir_ + i,)
         return_val = new_return_val
 
-        with patch('os.walk') as mockwalk:
-            mockwalk.return_value = [
-                ('', (), return_val), ]
-            files_ret, ignore = aggregate_files(deepcopy(files), 'some_dir')
-            self.assertEqual(files_ret, [os.sep + 'some_dir' + os.sep +
-                                         '**.py'])
-            self.assertEqual(ignore, [os.sep + os.path.join(
-                'some_dir', 'src', 'b', 't.py')])
+        index = generate_project_index(project_dir_, return_val)
+        files_ret, ignore = aggregate_files(deepcopy(files), 'some_dir', index)
+        self.assertEqual(files_ret,
+                         [os.sep + os.path.join('some_dir', '*'),
+                          os.sep + os.path.join('some_dir', 'src', '**')])
+        self.assertCountEqual(
+            list(set(ignore)),
+            [os.sep + os.path.join('some_dir', 'some.c'),
+             os.sep + os.path.join('some_dir', 'src', 'omg.c'),
+             os.sep + os.path.join('some_dir', 'src', 'gsoc.c'),
+             os.sep + os.path.join('some_dir', 'src', 'b', 't.py'),
+             os.sep + os.path.join('some_dir', 'src', 'b', 'x.c'),
+             os.sep + os.path.join('some_dir', 'src', 'b', 'y.c')])
 
         return_val = (
             'main.py', 'another_main.py', 'some.c', 'README.md',
@@ -89,14 +95,20 @@ class Test_file_aggregators(unittest.TestCase):
             new_return_val += (project_dir_ + i,)
         return_val = new_return_val
 
-        with patch('os.walk') as mockwalk:
-            mockwalk.return_value = [
-                ('', (), return_val), ]
-            files_ret, ignore = aggregate_files(deepcopy(files), 'some_dir')
-            self.assertEqual(files_ret, [os.sep + os.path.join(
-                'some_dir', '**.py')])
-            self.assertEqual(ignore, [os.sep + os.path.join(
-                'some_dir', 'src', 'b', 't.py')])
+        index = generate_project_index(project_dir_, return_val)
+        files_ret, ignore = aggregate_files(deepcopy(files), 'some_dir', index)
+        self.assertEqual(files_ret,
+                         [os.sep + os.path.join('some_dir', '*'),
+                          os.sep + os.path.join('some_dir', 'src', '**')])
+        self.assertCountEqual(
+            list(set(ignore)),
+            [os.sep + os.path.join('some_dir', 'some.c'),
+             os.sep + os.path.join('some_dir', 'README.md'),
+             os.sep + os.path.join('some_dir', 'src', 'omg.c'),
+             os.sep + os.path.join('some_dir', 'src', 'gsoc.c'),
+             os.sep + os.path.join('some_dir', 'src', 'b', 't.py'),
+             os.sep + os.path.join('some_dir', 'src', 'b', 'x.c'),
+             os.sep + os.path.join('some_dir', 'src', 'b', 'y.c')])
 
         return_val = (
             'main.py', 'another_main.py', 'some.c', 'README.md',
@@ -119,89 +131,95 @@ class Test_file_aggregators(unittest.TestCase):
             new_return_val += (project_dir_ + i,)
         return_val = new_return_val
 
-        with patch('os.walk') as mockwalk:
-            mockwalk.side_effect = [
-                [('', (), return_val), ],
-                [('', (), (
-                    os.sep + join('', 'some_dir', 'main.py'), os.sep +
-                    join('', 'some_dir', 'another_main.py'),
-                    os.sep + join('', 'some_dir', 'some.c'),
-                    os.sep + join('', 'some_dir', 'README.md'))), ],
-                [(os.sep + join('', 'some_dir', 'src', ''),
-                  (),
-                  (os.sep + join('', 'some_dir', 'src', 'a.py'),
-                   os.sep + join('', 'some_dir', 'src', 'b.py'),
-                   os.sep + join('', 'some_dir', 'src', 'omg.c'),
-                   os.sep + join('', 'some_dir', 'src', 'gsoc.c'),
-                   os.sep + join('', 'some_dir', 'src', 'x.py'),
-                   os.sep + join('', 'some_dir', 'src', 'y.py'),
-                   os.sep + join('', 'some_dir', 'src', 'temp.py'),
-                   os.sep + join('', 'some_dir', 'src', 'h.py'),
-                   os.sep + join('', 'some_dir', 'src', 'u.py'),
-                   os.sep + join('', 'some_dir', 'src', 'a', 'c.py'),
-                   os.sep + join('', 'some_dir', 'src', 'a', 'd.py'),
-                   os.sep + join('', 'some_dir', 'src', 'a', 'l.py'),
-                   os.sep + join('', 'some_dir', 'src', 'a', 'v.py'),
-                   os.sep + join('', 'some_dir', 'src', 'b', 'x.py'),
-                   os.sep + join('', 'some_dir', 'src', 'b', 't.py'),
-                   os.sep + join('', 'some_dir', 'src', 'b', 'x.c'),
-                   os.sep + join('', 'some_dir', 'src', 'b', 'y.c',)
-                   )),
-                 ],
-                [(os.sep + join('', 'some_dir', 'src', ''),
-                  (),
-                  (os.sep + join('', 'some_dir', 'src', 'a.py'),
-                   os.sep + join('', 'some_dir', 'src', 'b.py'),
-                   os.sep + join('', 'some_dir', 'src', 'omg.c'),
-                   os.sep + join('', 'some_dir', 'src', 'gsoc.c'),
-                   os.sep + join('', 'some_dir', 'src', 'x.py'),
-                   os.sep + join('', 'some_dir', 'src', 'y.py'),
-                   os.sep + join('', 'some_dir', 'src', 'temp.py'),
-                   os.sep + join('', 'some_dir', 'src', 'h.py'),
-                   os.sep + join('', 'some_dir', 'src', 'u.py')
-                   )),
-                 ],
-                [(os.sep + join('', 'some_dir', 'src', 'a', ''),
-                  (),
-                  (os.sep + join('', 'some_dir', 'src', 'a', 'c.py'),
-                   os.sep + join('', 'some_dir', 'src', 'a', 'd.py'),
-                   os.sep + join('', 'some_dir', 'src', 'a', 'l.py'),
-                   os.sep + join('', 'some_dir', 'src', 'a', 'v.py')
-                   )),
-                 ],
-                [(os.sep + join('', 'some_dir', 'test', ''),
-                  (),
-                  (os.sep + join('', 'some_dir', 'test', 'y.py'),
-                   os.sep + join('', 'some_dir', 'test', 's.c'),
-                   os.sep + join('', 'some_dir', 'test', 'badass.c'),
-                   os.sep + join('', 'some_dir', 'test', 'p', 'z.py'),
-                   os.sep + join('', 'some_dir', 'test', 'p', 'zx.c'),
-                   os.sep + join('', 'some_dir', 'test', 'p', 'xz.c',)
-                   ))
-                 ], ]
-            files_ret, ignore = aggregate_files(deepcopy(files), 'some_dir')
-            self.assertEqual(
-                files_ret,
-                [os.sep + os.path.join('some_dir', '*'),
-                 os.sep + os.path.join('some_dir', 'src', '*'),
-                 os.sep + os.path.join('some_dir', 'src', 'a', '**'),
-                 os.sep + os.path.join('some_dir', 'test', '**')]
-            )
-            self.assertCountEqual(
-                list(set(ignore)),
-                [os.sep + os.path.join('some_dir', 'some.c'),
-                 os.sep + os.path.join('some_dir', 'README.md'),
-                 os.sep + os.path.join('some_dir', 'src', 'omg.c'),
-                 os.sep + os.path.join('some_dir', 'src', 'gsoc.c'),
-                 os.sep + os.path.join('some_dir', 'src', 'x.py'),
-                 os.sep + os.path.join('some_dir', 'src', 'y.py'),
-                 os.sep + os.path.join('some_dir', 'src', 'temp.py'),
-                 os.sep + os.path.join('some_dir', 'src', 'h.py'),
-                 os.sep + os.path.join('some_dir', 'src', 'u.py'),
-                 os.sep + os.path.join('some_dir', 'src', 'a', 'l.py'),
-                 os.sep + os.path.join('some_dir', 'src', 'a', 'v.py'),
-                 os.sep + os.path.join('some_dir', 'test', 's.c'),
-                 os.sep + os.path.join('some_dir', 'test', 'badass.c'),
-                 os.sep + os.path.join('some_dir', 'test', 'p', 'zx.c'),
-                 os.sep + os.path.join('some_dir', 'test', 'p', 'xz.c')]
-            )
+        index = generate_project_index(project_dir_, return_val)
+        files_ret, ignore = aggregate_files(deepcopy(files), 'some_dir', index)
+        self.assertEqual(
+            files_ret,
+            [os.sep + os.path.join('some_dir', '*'),
+             os.sep + os.path.join('some_dir', 'src', '*'),
+             os.sep + os.path.join('some_dir', 'src', 'a', '**'),
+             os.sep + os.path.join('some_dir', 'test', '**')]
+        )
+        self.assertCountEqual(
+            list(set(ignore)),
+            [os.sep + os.path.join('some_dir', 'some.c'),
+             os.sep + os.path.join('some_dir', 'README.md'),
+             os.sep + os.path.join('some_dir', 'src', 'omg.c'),
+             os.sep + os.path.join('some_dir', 'src', 'gsoc.c'),
+             os.sep + os.path.join('some_dir', 'src', 'x.py'),
+             os.sep + os.path.join('some_dir', 'src', 'y.py'),
+             os.sep + os.path.join('some_dir', 'src', 'temp.py'),
+             os.sep + os.path.join('some_dir', 'src', 'h.py'),
+             os.sep + os.path.join('some_dir', 'src', 'u.py'),
+             os.sep + os.path.join('some_dir', 'src', 'a', 'l.py'),
+             os.sep + os.path.join('some_dir', 'src', 'a', 'v.py'),
+             os.sep + os.path.join('some_dir', 'test', 's.c'),
+             os.sep + os.path.join('some_dir', 'test', 'badass.c'),
+             os.sep + os.path.join('some_dir', 'test', 'p', 'zx.c'),
+             os.sep + os.path.join('some_dir', 'test', 'p', 'xz.c')]
+        )
+
+    def test_node(self):
+        root = Node('project_dir', None)
+        src = Node('src', root)
+        root.add_children(src)
+        b = Node('b', src, [Node('x.py', None)])
+        src.add_children(b)
+        src.add_children(Node('x.py', src))
+
+        self.assertIs(root.get_child('src'), src)
+        self.assertIsNone(root.get_child('x.py'))
+        self.assertEqual(list(src.children), ['b', 'x.py'])
+        self.assertEqual(list(root.get_files('p')),
+                         [join('p', 'src', 'b', 'x.py'),
+                          join('p', 'src', 'x.py')])
+        self.assertEqual(list(src.get_files_cd('src')),
+                         [join('src', 'x.py')])
+
+    def test_count_project_files(self):
+        project_dir = os.sep + 'some_dir'
+        index = generate_project_index(
+            project_dir,
+            [join(project_dir, 'main.py'), join(project_dir, 'README.md'),
+             join(project_dir, 'src', 'a.py'),
+             join(project_dir, 'src', 'a', 'b.c'),
+             join(project_dir, 'src', 'a', 'c.py')])
+        counts = count_project_files(index)
+
+        self.assertEqual(counts[project_dir].all, 5)
+        self.assertEqual(counts[project_dir].all_ext,
+                         {'.py': 3, '.md': 1, '.c': 1})
+        self.assertEqual(counts[project_dir].top, 2)
+        self.assertEqual(counts[project_dir].top_ext,
+                         {'.py': 1, '.md': 1})
+        src = join(project_dir, 'src')
+        self.assertEqual(counts[src].all, 3)
+        self.assertEqual(counts[src].top, 1)
+        self.assertEqual(counts[join(src, 'a')].all_ext,
+                         {'.c': 1, '.py': 1})
+
+    def test_replace_with_glob(self):
+        project_dir = os.sep + 'some_dir'
+        main = join(project_dir, 'main.py')
+        a = join(project_dir, 'src', 'a.py')
+        b = join(project_dir, 'src', 'b.c')
+        index = generate_project_index(project_dir, [main, a, b])
+        root = Node('project_dir', None)
+        src = Node('src', root)
+        root.add_children(src)
+        leaves = {}
+        for file, parent in ((main, root), (a, src), (b, src)):
+            leaves[file] = Node(os.path.basename(file), parent)
+            parent.add_children(leaves[file])
+        file_counts = SectionFileCounts(
+            index, [main, a, b],
+            {leaf: [file] for file, leaf in leaves.items()})
+        files = OrderedDict.fromkeys([main, a, b])
+
+        file_counts.replace_with_glob(
+            files, src, join(project_dir, 'src', '**.py'))
+        self.assertEqual(list(files),
+                         [main, b, join(project_dir, 'src', '**.py')])
+        file_counts.replace_with_glob(files, root, join(project_dir, '**'))
+        self.assertEqual(list(files), [join(project_dir, '**')])
+        self.assertEqual(file_counts.globs, [join(project_dir, '**')])
@@ -0,0 +1,63 @@
+import operator
+import unittest
+from unittest.mock import patch
+
+from coala_quickstart.green_mode.trial_executor import (
+    TrialExecutor,
+    get_default_jobs,
+    get_shared_data,
+    )
+
+
+def get_shared_value(key):
+    return get_shared_data()[key]
+
+
+class TestTrialExecutor(unittest.TestCase):
+
+    def test_get_default_jobs(self):
+        with patch('multiprocessing.cpu_count', return_value=1):
+            self.assertEqual(get_default_jobs(), 1)
+        with patch('multiprocessing.cpu_count', return_value=4):
+            self.assertEqual(get_default_jobs(), 3)
+
+    def test_serial(self):
+        executor = TrialExecutor(jobs=0)
+        self.assertEqual(executor.jobs, 1)
+        self.assertFalse(executor.parallel)
+        trials = [(2, 3), (4, 5)]
+        self.assertEqual(list(executor.imap_unordered(operator.mul, trials)),
+                         [(0, 6), (1, 20)])
+        self.assertEqual(executor.map(operator.mul, trials), [6, 20])
+        self.assertIsNone(executor._pool)
+
+    def test_parallel(self):
+        with TrialExecutor(jobs=2) as executor:
+            self.assertIsNone(executor._pool)
+            trials = [(index, index) for index in range(20)]
+            self.assertEqual(executor.map(operator.mul, trials),
+                             [index * index for index in range(20)])
+            if executor.parallel:
+                self.assertIsNotNone(executor._pool)
+        self.assertIsNone(executor._pool)
+
+    def test_terminate_on_error(self):
+        with self.assertRaises(ZeroDivisionError):
+            with TrialExecutor(jobs=2) as executor:
+                executor.map(operator.truediv, [(1, 0)])
+        self.assertIsNone(executor._pool)
+
+    def test_share(self):
+        for jobs in (1, 2):
+            with TrialExecutor(jobs=jobs) as executor:
+                executor.share(value=[1, 2])
+                self.assertEqual(
+                    executor.map(get_shared_value, [('value',)] * 3),
+                    [[1, 2]] * 3)
+                pool = executor._pool
+                executor.share(value=executor._shared_data['value'])
+                self.assertIs(executor._pool, pool)
+                executor.share(value=[3])
+                self.assertIsNone(executor._pool)
+                self.assertEqual(
+                    executor.map(get_shared_value, [('value',)]), [[3]])
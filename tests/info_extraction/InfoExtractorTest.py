@@ -3,7 +3,7 @@ import unittest
 
 from coala_quickstart.info_extraction.Info import Info
 from coala_quickstart.info_extraction.InfoExtractor import InfoExtractor
-from tests.TestUtilities import generate_files
+from tests.TestUtilities import generate_files, generate_project_index
 
 
 class InfoExtractorTest(unittest.TestCase):
@@ -267,6 +267,37 @@ class InfoExtractorTest(unittest.TestCase):
 
                 uut.extract_information()
 
+    def test_retrieve_files(self):
+        target_filenames = ['target_file_1', 'target_file_2']
+
+        target_file_contents = ['Some content.', 'Any content']
+
+        with generate_files(
+                target_filenames,
+                target_file_contents,
+                self.current_dir) as gen_files:
+
+            self.assertEqual(
+                sorted(InfoExtractor.retrieve_files(
+                    ['target_file_*'], self.current_dir)),
+                target_filenames)
+            self.assertEqual(os.getcwd(), self.current_dir)
+
+        project_dir = os.path.join(self.current_dir, 'some_dir')
+        project_index = generate_project_index(project_dir, [
+            os.path.join(project_dir, 'Gemfile'),
+            os.path.join(project_dir, 'src', 'Gemfile'),
+            os.path.join(project_dir, 'package.json')])
+
+        self.assertEqual(
+            InfoExtractor.retrieve_files(
+                ['Gemfile', '**.json'], project_dir, project_index),
+            ['Gemfile', 'package.json'])
+        self.assertEqual(
+            InfoExtractor.retrieve_files(
+                ['**Gemfile'], project_dir, project_index),
+            ['Gemfile', os.path.join('src', 'Gemfile')])
+
     def test_spec_references_filed(self):
         uut = self.DummyInfoExtractor
         self.assertEqual(len(uut.spec_references), 2)